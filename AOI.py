@@ -8,6 +8,7 @@ import webbrowser
 import subprocess
 import re
 import math
+import heapq
 import time
 from datetime import datetime
 import threading
@@ -24,7 +25,8 @@ from pathlib import Path
 import sqlite3
 import pickle
 import configparser
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt6.QtWidgets import (
     QApplication,
@@ -56,9 +58,10 @@ from PyQt6.QtWidgets import (
     QGraphicsDropShadowEffect
 )
 from PyQt6.QtCore import (
-    Qt, QSize, QTimer, QThread, pyqtSignal, QPropertyAnimation, 
+    Qt, QObject, QSize, QTimer, QThread, pyqtSignal, QPropertyAnimation, 
     QEasingCurve, QRect, QPoint, QSettings, QStandardPaths,
-    QMimeData, QUrl, QFileSystemWatcher, QProcess, QMutex
+    QMimeData, QUrl, QFileSystemWatcher, QProcess, QMutex,
+    QByteArray, QBuffer, QIODevice
 )
 from PyQt6.QtGui import (
     QPalette, QColor, QIcon, QPixmap, QImage, QFont, QPainter,
@@ -66,23 +69,20 @@ from PyQt6.QtGui import (
     QShortcut, QKeySequence, QDrag, QMovie
 )
 
+import aoi_log
+from aoi_log import debug_print, log
+from aoi_index import CancelToken, Cancelled, FileIndex, IncrementalSearch, default_search_roots
+from aoi_match import match_key
+from aoi_rank import Ranker, rank
+from aoi_shell import KnownFolderResolver, ShellLink, resolve_shortcut
+from aoi_catalog import RegistryCatalog, StartMenuCatalog, WinRegistryReader, start_menu_folders
+from aoi_commands import CommandPipeline, Provider, chars, exact, pattern, prefix
+from aoi_net import CryptoPrices, FetchError, RateTable, ResponseCache
+from aoi_icons import IconStore
 
-# ---------------- Debug switch ----------------
-DEBUG = True  # Enabled for crash analysis
-
-
-def log(*a):
-    if DEBUG:
-        print(*a)
 
-
-def debug_print(*a):
-    """Safe debug function"""
-    if DEBUG:
-        try:
-            print("[DEBUG]", *a)
-        except Exception:
-            pass
+# ---------------- Debug switch ----------------
+DEBUG = aoi_log.DEBUG  # Mirrors aoi_log.DEBUG, which the helpers read
 
 
 # ---------------- Win32 structures & constants ----------------
@@ -200,14 +200,118 @@ ILD_TRANSPARENT = 0x00000001
 
 
 # ---------------- Cache ----------------
-_ICON_CACHE = {}  # key: (path.lower(), small, tag) -> QIcon
+class IconCache:
+    """LRU cache of result icons, bounded by entry count and pixmap bytes
+
+    Keys are (path.lower(), small).  Icons with the same share key (their
+    system image list index, which every .txt or every folder has in
+    common, or the digest of a PNG from the icon store) are stored once
+    and only counted once against the byte budget.  A disabled cache stores nothing and
+    misses every lookup.  GUI thread only.
+    """
+    BYTES_PER_ENTRY = 16 * 1024  # budget per entry: a 32x32 icon at 2x scale, 32-bit
+
+    def __init__(self, max_entries: int = 200, enabled: bool = True):
+        self.entries = OrderedDict()  # key -> (icon, nbytes, shared key or None)
+        self.shared = {}  # (share key, small) -> [icon, users, nbytes]
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.configure(max_entries, enabled)
+
+    def configure(self, max_entries: int, enabled: bool = True):
+        """Apply the cache_size and enable_icon_cache settings"""
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = self.max_entries * self.BYTES_PER_ENTRY
+        self.enabled = bool(enabled)
+        if not self.enabled:
+            self.clear()
+        self._evict()
+
+    def __contains__(self, path: str) -> bool:
+        """Whether the small icon of ``path`` is cached; not counted as a hit or miss"""
+        return self.enabled and (path.lower(), True) in self.entries
+
+    def get(self, path: str, small: bool = True) -> Optional[QIcon]:
+        key = (path.lower(), small)
+        entry = self.entries.get(key) if self.enabled else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, path: str, small: bool, icon: QIcon, nbytes: int = 0, share_key: str = '') -> QIcon:
+        """Store ``icon``; returns the icon to show, the shared one if deduplicated"""
+        if not self.enabled:
+            return icon
+        key = (path.lower(), small)
+        self._remove(key)
+        shared_key = (share_key, small) if share_key else None
+        if shared_key is not None:
+            shared = self.shared.get(shared_key)
+            if shared is None:
+                # Bytes of a shared icon are counted once, by the shared record
+                shared = self.shared[shared_key] = [icon, 0, nbytes]
+                self.nbytes += nbytes
+            shared[1] += 1
+            icon, nbytes = shared[0], 0
+        self.entries[key] = (icon, nbytes, shared_key)
+        self.nbytes += nbytes
+        self._evict()
+        return icon
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        _, nbytes, shared_key = entry
+        self.nbytes -= nbytes
+        if shared_key is not None:
+            shared = self.shared[shared_key]
+            shared[1] -= 1
+            if shared[1] <= 0:
+                del self.shared[shared_key]
+                self.nbytes -= shared[2]
+
+    def _evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+            self._remove(next(iter(self.entries)))
+
+    def clear(self):
+        self.entries.clear()
+        self.shared.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self.entries),
+            'shared': len(self.shared),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_ICON_CACHE = IconCache()  # GUI thread only; configured from the launcher settings
+_PLACEHOLDER_ICONS = {}  # (extension, small) -> QIcon shown until the real icon arrives
+# Item data: file whose icon a command row shows (file rows use their UserRole path)
+ICON_PATH_ROLE = Qt.ItemDataRole.UserRole + 1
+CHROME_PATH = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+POWERSHELL_PATH = "C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe"
 
 
 # ---------------- Helpers ----------------
-def _qicon_from_hicon(hicon: wintypes.HICON) -> QIcon:
-    """Create QIcon from HICON - memory leak prevention"""
+# Extraction produces QImages, which unlike QPixmap/QIcon may be created off
+# the GUI thread; IconLoader runs it in the background.
+def _qimage_from_hicon(hicon: wintypes.HICON) -> QImage:
+    """Create QImage from HICON - memory leak prevention"""
     if not hicon:
-        return QIcon()
+        return QImage()
     try:
         image = QImage.fromHICON(hicon)
         # Always clean up HICON
@@ -215,18 +319,15 @@ def _qicon_from_hicon(hicon: wintypes.HICON) -> QIcon:
             ctypes.windll.user32.DestroyIcon(hicon)
         except Exception:
             pass
-        
-        if image.isNull():
-            return QIcon()
-        return QIcon(QPixmap.fromImage(image))
+        return image
     except Exception as e:
-        debug_print(f"_qicon_from_hicon error: {e}")
+        debug_print(f"_qimage_from_hicon error: {e}")
         # Try to clean up HICON
         try:
             ctypes.windll.user32.DestroyIcon(hicon)
         except Exception:
             pass
-        return QIcon()
+        return QImage()
 
 
 def _parse_icon_location(loc: str):
@@ -245,18 +346,28 @@ def _parse_icon_location(loc: str):
         return None, 0
 
 
-def resolve_lnk(path: str):
+def _shell_link_via_com(path: str) -> Optional[ShellLink]:
     try:
         shell = win32com.client.Dispatch("WScript.Shell")
         sh = shell.CreateShortcut(path)
-        target = sh.TargetPath
         icon_path, icon_index = _parse_icon_location(sh.IconLocation)
-        if not icon_path and target:
-            icon_path, icon_index = target, 0
-        return target, icon_path, icon_index
+        return ShellLink(sh.TargetPath or "", sh.Arguments or "", sh.WorkingDirectory or "",
+                         icon_path or "", icon_index, sh.Description or "")
     except Exception as e:
         log("resolve_lnk error:", e)
+        return None
+
+
+def resolve_lnk(path: str):
+    # Parse the .lnk directly (cached by mtime/size); COM only for files the parser rejects
+    link = resolve_shortcut(path, _shell_link_via_com)
+    if link is None:
         return None, None, 0
+    target = link.target or None
+    icon_path, icon_index = (link.icon_location.strip('"'), link.icon_index) if link.icon_location else (None, 0)
+    if not icon_path and target:
+        icon_path, icon_index = target, 0
+    return target, icon_path, icon_index
 
 
 # ---------------- Explorer system image list ----------------
@@ -283,35 +394,29 @@ def _get_sys_icon_index(path: str) -> int:
     return sfi.iIcon if ok else -1
 
 
-def _icon_from_system_imagelist(path: str, small: bool) -> QIcon:
+def _image_from_system_imagelist(path: str, small: bool) -> QImage:
     try:
-        key = (path.lower(), small, "sys")
-        if key in _ICON_CACHE:
-            return _ICON_CACHE[key]
         idx = _get_sys_icon_index(path)
         if idx < 0:
-            return QIcon()
+            return QImage()
         iml = _get_system_imagelist_handle(small)
         if not iml or not iml.contents:
-            return QIcon()
+            return QImage()
         hicon = wintypes.HICON()
         hr = iml.contents.lpVtbl.contents.GetIcon(iml, idx, ILD_TRANSPARENT, ctypes.byref(hicon))
         if hr != 0 or not hicon:
-            return QIcon()
-        icon = _qicon_from_hicon(hicon)
-        if not icon.isNull():
-            _ICON_CACHE[key] = icon
-        return icon
+            return QImage()
+        return _qimage_from_hicon(hicon)
     except Exception as e:
         log("system imagelist err:", e)
-        return QIcon()
+        return QImage()
 
 
 # ---------------- Low-level extraction ----------------
-def _extract_icon_from_module(module_path: str, index: int | None, small: bool) -> QIcon:
+def _extract_image_from_module(module_path: str, index: int | None, small: bool) -> QImage:
     try:
         if not os.path.exists(module_path):
-            return QIcon()
+            return QImage()
 
         if index is not None:
             Large = (wintypes.HICON * 1)()
@@ -320,7 +425,7 @@ def _extract_icon_from_module(module_path: str, index: int | None, small: bool)
             if got:
                 h = Small[0] if small else Large[0]
                 if h:
-                    ico = _qicon_from_hicon(h)
+                    ico = _qimage_from_hicon(h)
                     if not ico.isNull():
                         return ico
 
@@ -334,8 +439,8 @@ def _extract_icon_from_module(module_path: str, index: int | None, small: bool)
             sfi = SHFILEINFO()
             res = SHGetFileInfo(module_path, 0, ctypes.byref(sfi), ctypes.sizeof(sfi), flags)
             if res and sfi.hIcon:
-                return _qicon_from_hicon(sfi.hIcon)
-            return QIcon()
+                return _qimage_from_hicon(sfi.hIcon)
+            return QImage()
 
         for i in range(min(count, 10)):
             Large = (wintypes.HICON * 1)()
@@ -344,34 +449,34 @@ def _extract_icon_from_module(module_path: str, index: int | None, small: bool)
             if got:
                 h = Small[0] if small else Large[0]
                 if h:
-                    ico = _qicon_from_hicon(h)
+                    ico = _qimage_from_hicon(h)
                     if not ico.isNull():
                         return ico
 
     except Exception as e:
         log("extract module err:", e)
 
-    return QIcon()
+    return QImage()
 
 
-def _icon_from_existing_file(path: str, small: bool) -> QIcon:
+def _image_from_existing_file(path: str, small: bool) -> QImage:
     flags = SHGFI_ICON | (SHGFI_SMALLICON if small else SHGFI_LARGEICON)
     sfi = SHFILEINFO()
     res = SHGetFileInfo(path, 0, ctypes.byref(sfi), ctypes.sizeof(sfi), flags)
     if res and sfi.hIcon:
-        return _qicon_from_hicon(sfi.hIcon)
-    return QIcon()
+        return _qimage_from_hicon(sfi.hIcon)
+    return QImage()
 
 
-def _icon_from_extension(ext: str, small: bool) -> QIcon:
+def _image_from_extension(ext: str, small: bool) -> QImage:
     if not ext.startswith("."):
         ext = "." + ext
     flags = SHGFI_ICON | SHGFI_USEFILEATTR | (SHGFI_SMALLICON if small else SHGFI_LARGEICON)
     sfi = SHFILEINFO()
     res = SHGetFileInfo("dummy" + ext, FILE_ATTRIBUTE_NORMAL, ctypes.byref(sfi), ctypes.sizeof(sfi), flags)
     if res and sfi.hIcon:
-        return _qicon_from_hicon(sfi.hIcon)
-    return QIcon()
+        return _qimage_from_hicon(sfi.hIcon)
+    return QImage()
 
 
 def _registry_default_icon(file_path: str):
@@ -392,214 +497,704 @@ def _registry_default_icon(file_path: str):
 
 
 # ---------------- Public: icon_from_path ----------------
-def icon_from_path(path: str, small: bool = True) -> QIcon:
+def image_from_path(path: str, small: bool = True) -> QImage:
+    """Icon image for ``path``; uncached and safe to call off the GUI thread"""
     try:
-        key = (path.lower(), small, "main")
-        if key in _ICON_CACHE:
-            return _ICON_CACHE[key]
-
         lower = path.lower()
         exists = os.path.exists(path)
 
         if lower.endswith(".lnk"):
             target, icon_p, icon_i = resolve_lnk(path)
-            debug_print(f"icon_from_path - .lnk: {path} -> target: {target}, icon: {icon_p}")
+            debug_print(f"image_from_path - .lnk: {path} -> target: {target}, icon: {icon_p}")
 
             # Try to get icon from the .lnk file itself first
-            ico = _icon_from_system_imagelist(path, small)
+            ico = _image_from_system_imagelist(path, small)
             if not ico.isNull():
-                _ICON_CACHE[key] = ico
                 return ico
 
             # Try icon location from .lnk file
             if icon_p and os.path.exists(icon_p):
-                ico = _extract_icon_from_module(icon_p, icon_i, small)
+                ico = _extract_image_from_module(icon_p, icon_i, small)
                 if not ico.isNull():
-                    _ICON_CACHE[key] = ico
                     return ico
 
             # Try target file icon
             if target and os.path.exists(target):
                 if target.lower().endswith((".exe", ".dll", ".ico")):
-                    ico = _extract_icon_from_module(target, None, small)
+                    ico = _extract_image_from_module(target, None, small)
                     if not ico.isNull():
-                        _ICON_CACHE[key] = ico
                         return ico
 
-                ico = _icon_from_existing_file(target, small)
+                ico = _image_from_existing_file(target, small)
                 if not ico.isNull():
-                    _ICON_CACHE[key] = ico
                     return ico
 
             # Fallback to .lnk extension icon
-            ico = _icon_from_extension(".lnk", small)
+            ico = _image_from_extension(".lnk", small)
             if not ico.isNull():
-                _ICON_CACHE[key] = ico
                 return ico
 
         if lower.endswith((".exe", ".dll", ".ico")):
             if exists:
-                ico = _icon_from_existing_file(path, small)
+                ico = _image_from_existing_file(path, small)
                 if not ico.isNull():
-                    _ICON_CACHE[key] = ico
                     return ico
-            ico = _extract_icon_from_module(path, None, small)
+            ico = _extract_image_from_module(path, None, small)
             if not ico.isNull():
-                _ICON_CACHE[key] = ico
                 return ico
 
             _, ext = os.path.splitext(path)
-            ico = _icon_from_extension(ext, small)
-            _ICON_CACHE[key] = ico
-            return ico
+            return _image_from_extension(ext, small)
 
         if exists:
-            ico = _icon_from_existing_file(path, small)
+            ico = _image_from_existing_file(path, small)
             if not ico.isNull():
-                _ICON_CACHE[key] = ico
                 return ico
 
         reg_p, reg_i = _registry_default_icon(path)
         if reg_p and os.path.exists(reg_p):
-            ico = _extract_icon_from_module(reg_p, reg_i, small)
+            ico = _extract_image_from_module(reg_p, reg_i, small)
             if not ico.isNull():
-                _ICON_CACHE[key] = ico
                 return ico
 
         _, ext = os.path.splitext(path)
-        ico = _icon_from_extension(ext, small)
-        _ICON_CACHE[key] = ico
-        return ico
+        return _image_from_extension(ext, small)
+
+    except Exception as e:
+        debug_print(f"image_from_path error: {e}")
+        return QImage()
+
+
+def _icon_from_image(image: QImage) -> QIcon:
+    return QIcon(QPixmap.fromImage(image)) if not image.isNull() else QIcon()
 
+
+def cached_icon(path: str, small: bool = True) -> Optional[QIcon]:
+    return _ICON_CACHE.get(path, small)
+
+
+def cache_icon(path: str, small: bool, image: QImage, share_key: str = '') -> QIcon:
+    """Store an extracted image as the icon of ``path`` (GUI thread)"""
+    icon = _icon_from_image(image)
+    return _ICON_CACHE.put(path, small, icon, image.sizeInBytes(), share_key)
+
+
+def _png_bytes(image: QImage) -> bytes:
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def icon_from_path(path: str, small: bool = True) -> QIcon:
+    """Cached icon for ``path``, extracted on the calling (GUI) thread if needed"""
+    try:
+        icon = cached_icon(path, small)
+        if icon is not None:
+            return icon
+        return cache_icon(path, small, image_from_path(path, small))
     except Exception as e:
         debug_print(f"icon_from_path error: {e}")
         return QIcon()
 
 
+def placeholder_icon(path: str, small: bool = True) -> QIcon:
+    """Generic icon for the file type of ``path``; no disk access"""
+    ext = os.path.splitext(path)[1].lower()
+    key = (ext, small)
+    icon = _PLACEHOLDER_ICONS.get(key)
+    if icon is None:
+        try:
+            icon = _icon_from_image(_image_from_extension(ext, small)) if ext else QIcon()
+        except Exception as e:
+            debug_print(f"placeholder_icon error: {e}")
+            icon = QIcon()
+        _PLACEHOLDER_ICONS[key] = icon
+    return icon
+
+
+class IconLoader(QObject):
+    """Extracts result icons on one background thread, top rows first
+
+    ``request`` queues a path with the row it is shown in; the lowest row
+    number is extracted next.  ``clear`` drops everything still queued when
+    the rows are replaced, so icons of rows that are gone are not
+    extracted.  Icons already in the on-disk ``store`` for the file's
+    current mtime and size are read from there instead of the shell;
+    freshly extracted ones are added to it.  Images arrive through
+    ``icon_ready`` on the GUI thread, which turns them into QIcons.
+    """
+    icon_ready = pyqtSignal(str, bool, QImage, str)  # path, small, image, share key
+
+    def __init__(self, store: Optional[IconStore] = None, scale: float = 1.0, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.scale = scale  # device pixel ratio the stored icons were extracted at
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aoi-icons")
+        self.lock = threading.Lock()
+        self.queue = []  # heap of (row, sequence, path, small)
+        self.queued = set()  # (path, small) in the heap
+        self.sequence = 0
+        self.draining = False
+        self.closed = False
+        self.executor.submit(self._init_thread)
+
+    @staticmethod
+    def _init_thread():
+        try:
+            # .lnk COM fallback and the shell image list need COM on this thread
+            import pythoncom
+            pythoncom.CoInitialize()
+        except Exception as e:
+            debug_print(f"CoInitialize error: {e}")
+
+    def request(self, path: str, row: int, small: bool = True):
+        with self.lock:
+            if self.closed or (path, small) in self.queued:
+                return
+            self.sequence += 1
+            heapq.heappush(self.queue, (row, self.sequence, path, small))
+            self.queued.add((path, small))
+            if not self.draining:
+                self.draining = True
+                self.executor.submit(self._drain)
+
+    def clear(self):
+        with self.lock:
+            self.queue = []
+            self.queued = set()
+
+    def shutdown(self):
+        with self.lock:
+            self.closed = True
+        self.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _drain(self):
+        while True:
+            with self.lock:
+                if not self.queue or self.closed:
+                    self.draining = False
+                    break
+                _, _, path, small = heapq.heappop(self.queue)
+                self.queued.discard((path, small))
+            try:
+                image, share_key = self.load(path, small)
+                self.icon_ready.emit(path, small, image, share_key)
+            except Exception as e:
+                debug_print(f"Icon loader error: {e}")
+        if self.store is not None:
+            # The hits of this burst go to the store in one write
+            try:
+                self.store.flush_used()
+            except sqlite3.Error as e:
+                debug_print(f"Icon store write error: {e}")
+
+    def load(self, path: str, small: bool) -> Tuple[QImage, str]:
+        """(image, share key) from the icon store, or extracted and stored"""
+        if self.store is not None:
+            try:
+                png = self.store.get(path, small, self.scale)
+            except sqlite3.Error as e:
+                debug_print(f"Icon store read error: {e}")
+                png = None
+            if png:
+                image = QImage.fromData(png, "PNG")
+                if not image.isNull():
+                    return image, "png:" + hashlib.blake2b(png, digest_size=16).hexdigest()
+        image = image_from_path(path, small)
+        if self.store is not None and not image.isNull():
+            try:
+                self.store.put(path, small, self.scale, _png_bytes(image))
+            except sqlite3.Error as e:
+                debug_print(f"Icon store write error: {e}")
+        # Lets the cache keep one copy of icons shared by many files
+        sys_index = _get_sys_icon_index(path)
+        return image, f"sys:{sys_index}" if sys_index >= 0 else ''
+
+
 # ---------------- Search worker ----------------
-class SearchWorker(QThread):
-    results_ready = pyqtSignal(list)
+# Real (possibly OneDrive-redirected) known folders, computed once at startup
+KNOWN_FOLDERS = KnownFolderResolver.from_system()
+
+
+def app_data_dir() -> str:
+    """Per-user directory for launcher databases and caches"""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    path = os.path.join(base or os.path.expanduser("~"), "AoiLauncher")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class IndexCrawler(QThread):
+    """Background crawl that brings the persistent file index up to date"""
+    crawl_finished = pyqtSignal(int)
 
-    def __init__(self, query: str):
+    def __init__(self, file_index: FileIndex):
         super().__init__()
-        self.query = query
+        self.file_index = file_index
+        self.token = CancelToken()
+
+    def cancel(self):
+        self.token.cancel()
 
     def run(self):
-        results = []
         try:
-            # Simple, reliable file search
-            debug_print(f"Starting simple file search for: {self.query}")
-            
-            # Search in common locations
-            search_locations = [
-                os.path.expanduser("~\\Desktop"),
-                os.path.expanduser("~\\Downloads"), 
-                os.path.expanduser("~\\Documents"),
-                os.path.expanduser("~\\OneDrive\\Desktop"),
-                os.path.expanduser("~\\OneDrive\\Downloads"),
-                os.path.expanduser("~\\OneDrive\\Documents"),
-                "C:\\Program Files",
-                "C:\\Program Files (x86)",
-                "C:\\Users\\Public\\Desktop"
-            ]
-            
-            query_lower = self.query.lower()
-            
-            for location in search_locations:
-                if os.path.exists(location):
-                    try:
-                        debug_print(f"Searching in: {location}")
-                        for root, dirs, files in os.walk(location):
-                            # Limit depth for speed
-                            if root.count(os.sep) - location.count(os.sep) > 2:
-                                continue
-                                
-                            for file in files:
-                                if query_lower in file.lower():
-                                    full_path = os.path.join(root, file)
-                                    # Only add executable files, shortcuts, and common file types
-                                    if (file.lower().endswith(('.exe', '.lnk', '.msi', '.bat', '.cmd')) or
-                                        file.lower().startswith(('chrome', 'firefox', 'edge', 'discord', 'steam', 'notepad', 'calc', 'paint', 'word', 'excel', 'powerpoint'))):
-                                        results.append((file, full_path))
-                                        debug_print(f"Found: {file} -> {full_path}")
-                                        
-                                        if len(results) >= 25:  # Limit results
-                                            break
-                            if len(results) >= 25:
-                                break
-                                
-                    except Exception as e:
-                        debug_print(f"Error searching {location}: {e}")
-                        continue
-            
-            # Also search for installed programs in registry
-            if len(results) < 10:
-                try:
-                    registry_results = self.registry_search()
-                    results.extend(registry_results)
-                    debug_print(f"Registry search added {len(registry_results)} results")
-                except Exception as e:
-                    debug_print(f"Registry search error: {e}")
-            
-            # Remove duplicates
-            seen_paths = set()
-            unique_results = []
-            for name, path in results:
+            started = time.perf_counter()
+            rescanned = self.file_index.refresh(default_search_roots(KNOWN_FOLDERS.folders), self.token)
+            debug_print(f"Index refresh finished: {rescanned} directories read in {time.perf_counter() - started:.2f}s")
+            self.crawl_finished.emit(rescanned)
+        except Cancelled:
+            debug_print("Index crawl cancelled")
+        except Exception as e:
+            debug_print(f"Index crawl error: {e}")
+            self.crawl_finished.emit(0)
+
+
+class DirectoryRescanWorker(QThread):
+    """Rescan a batch of changed directories off the UI thread"""
+    rescan_finished = pyqtSignal(list, list)  # added dirs, removed dirs
+
+    def __init__(self, file_index: FileIndex, paths: List[str]):
+        super().__init__()
+        self.file_index = file_index
+        self.paths = paths
+        self.token = CancelToken()
+
+    def cancel(self):
+        self.token.cancel()
+
+    def run(self):
+        added, removed = [], []
+        for path in self.paths:
+            try:
+                new_dirs, gone_dirs = self.file_index.rescan_directory(path, self.token)
+                added.extend(new_dirs)
+                removed.extend(gone_dirs)
+            except Cancelled:
+                return
+            except Exception as e:
+                debug_print(f"Rescan error for {path}: {e}")
+        self.rescan_finished.emit(added, removed)
+
+
+class IndexMaintainer(QObject):
+    """Keep the file index fresh from QFileSystemWatcher change events
+
+    Events are collected for a short window so a burst (e.g. a large unzip
+    into Downloads) turns into a single rescan per changed directory.
+    """
+    COALESCE_MS = 250
+    MAX_WATCHED_DIRS = 4096
+
+    def __init__(self, file_index: FileIndex, parent=None):
+        super().__init__(parent)
+        self.file_index = file_index
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.pending = set()
+        self.worker = None
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def watch_index(self):
+        """Watch every directory currently stored in the index"""
+        try:
+            self.watch(self.file_index.directories())
+        except Exception as e:
+            debug_print(f"Index watch error: {e}")
+
+    def watch(self, paths: List[str]):
+        watched = set(self.watcher.directories())
+        room = self.MAX_WATCHED_DIRS - len(watched)
+        new_paths = [p for p in paths if p not in watched][:max(room, 0)]
+        if new_paths:
+            self.watcher.addPaths(new_paths)
+            debug_print(f"Watching {len(watched) + len(new_paths)} indexed directories")
+
+    def unwatch(self, paths: List[str]):
+        watched = set(self.watcher.directories())
+        old_paths = [p for p in paths if p in watched]
+        if old_paths:
+            self.watcher.removePaths(old_paths)
+
+    def on_directory_changed(self, path: str):
+        self.pending.add(path)
+        # Fixed window: the first event of a burst schedules the flush
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(self.COALESCE_MS)
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.worker and self.worker.isRunning():
+            # Picked up again once the running batch finishes
+            return
+        paths = sorted(self.pending)
+        self.pending.clear()
+        debug_print(f"Rescanning {len(paths)} changed directories")
+        self.worker = DirectoryRescanWorker(self.file_index, paths)
+        self.worker.rescan_finished.connect(self.on_rescan_finished)
+        self.worker.start()
+
+    def on_rescan_finished(self, added: list, removed: list):
+        self.unwatch(removed)
+        self.watch(added)
+        if self.pending and not self.flush_timer.isActive():
+            self.flush_timer.start(self.COALESCE_MS)
+
+    def stop(self):
+        self.flush_timer.stop()
+        self.pending.clear()
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait(500)
+
+
+class SearchService(QObject):
+    """Long-lived search executor that only ever runs the latest query
+
+    Requests go into a single "latest wins" slot drained by one pooled
+    thread, so typing never creates or tears down threads.  Every request
+    gets a generation number; batches are tagged with it so the UI can drop
+    emissions from superseded queries.  ``batch_ready`` fires once per
+    source that produced new results and ``search_done`` once a request has
+    been fully searched.  Each batch is already ranked and carries scores,
+    so the UI can merge batches from different sources by relevance.
+    """
+    batch_ready = pyqtSignal(int, list)  # generation, [(name, path, score), ...]
+    search_done = pyqtSignal(int)
+    start_menu_refreshed = pyqtSignal(list)  # folders the Start Menu catalog walked
+    START_MENU_COALESCE_MS = 1000
+
+    def __init__(self, file_index: FileIndex, parent=None):
+        super().__init__(parent)
+        self.file_index = file_index
+        # Only touched from the executor thread
+        self.file_search = IncrementalSearch(file_index)
+        # Build the in-memory name arena before the first keystroke needs it
+        self.file_search.ensure_arena()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aoi-search")
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.pending = None  # (generation, query, token, ranker, limit) waiting to run
+        self.active_token = None
+        self.draining = False
+        # Installed applications, read once and re-read only when the keys change
+        self.registry_catalog = RegistryCatalog(WinRegistryReader())
+        self.start_menu_catalog = StartMenuCatalog(
+            start_menu_folders(),
+            lambda path: resolve_lnk(path)[0],
+            os.path.join(app_data_dir(), "start_menu_cache.json"),
+        )
+        # Catalogs are (re)built on their own thread, never on a keystroke
+        self.catalog_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aoi-catalog")
+        self.registry_refresh_queued = False  # guarded by self.lock
+        self.start_menu_watcher = QFileSystemWatcher(self)
+        self.start_menu_watcher.directoryChanged.connect(self.on_start_menu_changed)
+        self.start_menu_timer = QTimer(self)
+        self.start_menu_timer.setSingleShot(True)
+        self.start_menu_timer.timeout.connect(self.refresh_start_menu)
+        self.start_menu_refreshed.connect(self.watch_start_menu)
+        self.catalog_executor.submit(self._warm_catalogs)
+
+    def _warm_catalogs(self):
+        try:
+            # resolve_lnk falls back to COM on this (catalog) thread
+            import pythoncom
+            pythoncom.CoInitialize()
+        except Exception as e:
+            debug_print(f"CoInitialize error: {e}")
+        for catalog in (self.start_menu_catalog, self.registry_catalog):
+            try:
+                catalog.refresh()
+            except Exception as e:
+                debug_print(f"{type(catalog).__name__} error: {e}")
+        self.start_menu_refreshed.emit(list(self.start_menu_catalog.directories))
+
+    def _refresh_start_menu(self):
+        try:
+            if self.start_menu_catalog.refresh():
+                debug_print(f"Start Menu catalog: {len(self.start_menu_catalog.entries)} apps")
+        except Exception as e:
+            debug_print(f"StartMenuCatalog error: {e}")
+        self.start_menu_refreshed.emit(list(self.start_menu_catalog.directories))
+
+    def request_registry_refresh(self):
+        """Check the registry catalog for changes on the catalog thread
+
+        Called on every registry search; at most one check is queued and
+        maybe_refresh skips it within REFRESH_INTERVAL of the last one.
+        """
+        with self.lock:
+            if self.registry_refresh_queued:
+                return
+            self.registry_refresh_queued = True
+        try:
+            self.catalog_executor.submit(self._refresh_registry)
+        except RuntimeError:
+            # Shutting down
+            pass
+
+    def _refresh_registry(self):
+        with self.lock:
+            self.registry_refresh_queued = False
+        try:
+            if self.registry_catalog.maybe_refresh():
+                debug_print(f"Registry catalog: {len(self.registry_catalog.entries)} apps")
+        except Exception as e:
+            debug_print(f"RegistryCatalog error: {e}")
+
+    def on_start_menu_changed(self, path: str):
+        # Installers touch many folders at once; one refresh per burst
+        if not self.start_menu_timer.isActive():
+            self.start_menu_timer.start(self.START_MENU_COALESCE_MS)
+
+    def refresh_start_menu(self):
+        self.catalog_executor.submit(self._refresh_start_menu)
+
+    def watch_start_menu(self, directories: list):
+        """Watch the Start Menu folders the last refresh walked"""
+        watched = set(self.start_menu_watcher.directories())
+        wanted = set(directories)
+        if watched - wanted:
+            self.start_menu_watcher.removePaths(sorted(watched - wanted))
+        if wanted - watched:
+            self.start_menu_watcher.addPaths(sorted(wanted - watched))
+
+    def submit(self, query: str, ranker: Optional[Ranker] = None, limit: int = 50) -> int:
+        """Queue a query, replacing any queued one, and return its generation"""
+        with self.lock:
+            self.generation += 1
+            if self.active_token:
+                self.active_token.cancel()
+            self.pending = (self.generation, query, CancelToken(), ranker or Ranker(), limit)
+            if not self.draining:
+                self.draining = True
+                self.executor.submit(self._drain)
+            return self.generation
+
+    def cancel(self):
+        """Drop the queued query and stop the running one"""
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+            if self.active_token:
+                self.active_token.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self.start_menu_timer.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.catalog_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _drain(self):
+        while True:
+            with self.lock:
+                job, self.pending = self.pending, None
+                if job is None:
+                    self.draining = False
+                    return
+                generation, query, token, ranker, limit = job
+                self.active_token = token
+            try:
+                self.run_search(generation, query, token, ranker, limit)
+            except Cancelled:
+                debug_print(f"Search cancelled: {query}")
+            except Exception as e:
+                debug_print(f"Search error: {e}")
+            finally:
+                with self.lock:
+                    if self.active_token is token:
+                        self.active_token = None
+
+    def run_search(self, generation: int, query: str, token: CancelToken,
+                   ranker: Ranker, limit: int):
+        seen_paths = set()
+
+        def emit_batch(results: list):
+            """Emit ranked results not already sent by an earlier source"""
+            token.check()
+            batch = []
+            for name, path, score in results:
                 if path not in seen_paths:
                     seen_paths.add(path)
-                    unique_results.append((name, path))
-            
-            debug_print(f"Total results found: {len(unique_results)}")
-            self.results_ready.emit(unique_results)
-            
+                    batch.append((name, path, score))
+            if batch:
+                self.batch_ready.emit(generation, batch)
+
+        # Start Menu apps first: a small precomputed catalog, no disk access
+        try:
+            emit_batch(rank(query, self.start_menu_catalog.search(query), limit, ranker, 'startmenu', token))
+        except Cancelled:
+            raise
         except Exception as e:
-            debug_print(f"Search error: {e}")
-            self.results_ready.emit([])
-    
-    def registry_search(self):
-        """Search Windows registry for installed programs"""
-        results = []
-        query_lower = self.query.lower()
-        
+            debug_print(f"Start Menu search error: {e}")
+
+        # Index lookup instead of walking the search locations
+        debug_print(f"Starting indexed file search for: {query}")
         try:
-            import winreg
-            
-            # Search in common registry locations
-            registry_locations = [
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"),
-                (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"),
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Classes\Applications"),
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-            ]
-            
-            for hkey, subkey in registry_locations:
-                try:
-                    with winreg.OpenKey(hkey, subkey) as key:
-                        for i in range(winreg.QueryInfoKey(key)[0]):
-                            try:
-                                subkey_name = winreg.EnumKey(key, i)
-                                if query_lower in subkey_name.lower():
-                                    # Try to get the executable path
-                                    try:
-                                        with winreg.OpenKey(key, subkey_name) as subkey_handle:
-                                            try:
-                                                exe_path = winreg.QueryValue(subkey_handle, "")
-                                                if exe_path and os.path.exists(exe_path):
-                                                    results.append((subkey_name, exe_path))
-                                            except:
-                                                pass
-                                    except:
-                                        pass
-                            except:
-                                continue
-                except Exception as e:
-                    debug_print(f"Registry search error for {subkey}: {e}")
-                    continue
-                    
+            emit_batch(self.file_search.search(query, limit, ranker, token))
+        except Cancelled:
+            raise
+        except Exception as e:
+            debug_print(f"Index search error: {e}")
+
+        # Installed programs in registry compete on score, whatever the index found
+        try:
+            registry_results = self.registry_search(query)
+            emit_batch(rank(query, registry_results, limit, ranker, 'registry', token))
+            debug_print(f"Registry search added {len(registry_results)} results")
+        except Cancelled:
+            raise
         except Exception as e:
             debug_print(f"Registry search error: {e}")
-        
-        return results
+
+        debug_print(f"Total results found: {len(seen_paths)}")
+        token.check()
+        self.search_done.emit(generation)
+    
+    def registry_search(self, query: str):
+        """Installed programs from the registry catalog snapshot"""
+        # Changes show up from the next search on; this one never waits for the registry
+        self.request_registry_refresh()
+        return self.registry_catalog.search(query)
+
+
+# ---------------- Idle prefetch ----------------
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+
+def system_idle_seconds() -> float:
+    """Seconds since the last keyboard or mouse input, 0.0 if unknown"""
+    try:
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return 0.0
+        # Both are milliseconds since boot and wrap together after 49.7 days
+        return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+    except Exception:
+        return 0.0
+
+
+class IdlePrefetcher(QObject):
+    """Warms the launcher's caches for the most used apps while it is idle
+
+    Every CHECK_INTERVAL the top ``top_n`` apps by frecency (the same
+    formula the ranker uses) are prefetched when the launcher is hidden and
+    there has been no user input for IDLE_SECONDS: file metadata, the .lnk
+    target through the link cache, and the icon through the icon store and
+    the in-memory icon cache.  One background thread does the work and then
+    sleeps WORK_RATIO times as long as the item took, so it stays within a
+    small share of one core and of the disk.  ``pause`` stops it at the
+    next item as soon as the launcher is shown.
+    """
+    icon_ready = pyqtSignal(str, bool, QImage, str)  # path, small, image, share key
+
+    CHECK_INTERVAL = 30000  # ms between idle checks
+    IDLE_SECONDS = 60  # user input quiet time before prefetching
+    REPEAT_SECONDS = 600  # a full pass is not repeated sooner unless usage changed
+    WORK_RATIO = 4  # sleep per second of work: at most ~20% of one core
+    MIN_SLEEP = 0.05
+
+    def __init__(self, launcher, file_index: FileIndex, icon_loader: IconLoader,
+                 top_n: int = 20, parent=None):
+        super().__init__(parent)
+        self.launcher = launcher
+        self.file_index = file_index
+        self.icon_loader = icon_loader
+        self.top_n = top_n
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aoi-prefetch")
+        self.token = None  # CancelToken of the running pass
+        self.last_pass = None  # (monotonic time, usage snapshot) of the last finished pass
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.maybe_prefetch)
+        self.timer.start(self.CHECK_INTERVAL)
+        self.executor.submit(IconLoader._init_thread)
+
+    def top_apps(self) -> List[Tuple[str, Optional[str]]]:
+        """(usage name, launched path or None) of the most frecent apps"""
+        now = datetime.now()
+        scored = []
+        for name, data in self.launcher.smart_suggestions.usage_data.get("apps", {}).items():
+            try:
+                score = Ranker.frecency_of(int(data.get("count", 0)), data.get("last_used"), now)
+            except (TypeError, ValueError, AttributeError):
+                continue
+            scored.append((score, name, data.get("path")))
+        scored.sort(key=lambda s: s[0], reverse=True)
+        return [(name, path) for _, name, path in scored[:self.top_n]]
+
+    def maybe_prefetch(self):
+        if self.launcher.isVisible() or self.token is not None:
+            return
+        if system_idle_seconds() < self.IDLE_SECONDS:
+            return
+        apps = self.top_apps()
+        if not apps:
+            return
+        if self.last_pass is not None:
+            finished, snapshot = self.last_pass
+            if snapshot == apps and time.monotonic() - finished < self.REPEAT_SECONDS:
+                return
+        # Only icons the memory cache is missing; checked here, on the GUI thread
+        need_icon = {path for _, path in apps if path and path not in _ICON_CACHE}
+        self.token = CancelToken()
+        self.executor.submit(self._run, apps, need_icon, self.token)
+
+    def pause(self):
+        """Stop the running pass; the launcher is being shown"""
+        if self.token is not None:
+            self.token.cancel()
+
+    def shutdown(self):
+        self.timer.stop()
+        self.pause()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _paths(self, name: str, path: Optional[str]) -> List[str]:
+        if path:
+            return [path]
+        # Usage recorded before paths were kept: the indexed files with that name
+        key = match_key(name)
+        return [p for k, _, p in self.file_index.candidates(name, 10) if k == key][:3]
+
+    def _run(self, apps: List[Tuple[str, Optional[str]]], need_icon: set, token: CancelToken):
+        done = 0
+        try:
+            for name, path in apps:
+                for p in self._paths(name, path):
+                    token.check()
+                    start = time.monotonic()
+                    self._prefetch(p, p in need_icon or not path)
+                    done += 1
+                    time.sleep(max(self.MIN_SLEEP, (time.monotonic() - start) * self.WORK_RATIO))
+            self.last_pass = (time.monotonic(), apps)
+        except Cancelled:
+            debug_print(f"Prefetch paused after {done} items")
+        except Exception as e:
+            debug_print(f"Prefetch error: {e}")
+        finally:
+            self.token = None
+        debug_print(f"Prefetched {done} items")
+
+    def _prefetch(self, path: str, icon: bool):
+        try:
+            os.stat(path)
+        except OSError:
+            return
+        if path.lower().endswith('.lnk'):
+            # Fills the link cache used by launch_item and the Start Menu catalog
+            resolve_lnk(path)
+        if icon:
+            image, share_key = self.icon_loader.load(path, True)
+            if not image.isNull():
+                self.icon_ready.emit(path, True, image, share_key)
 
 
 # ---------------- Global Hotkey System ----------------
@@ -908,9 +1503,26 @@ class TextProcessor:
 
 # ---------------- API Integrations ----------------
 class APIIntegrator:
-    def __init__(self):
+    WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+    CURRENCY_URL = "https://api.exchangerate-api.com/v4/latest/{}"
+    CURRENCY_BASE = "USD"  # the one rate table fetched; other pairs use cross-rates
+    COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+    
+    def __init__(self, cache_path: Optional[str] = None):
         self.session = requests.Session()
-        self.session.timeout = 5  # 5 second timeout
+        self.timeout = 5  # seconds per request; Session has no timeout of its own
+        # Responses by normalized request, refreshed in the background once expired
+        self.cache = ResponseCache(cache_path)
+        # Prices of every coin asked about, refreshed together in one request
+        self.crypto_prices = CryptoPrices(
+            lambda ids: self.get_json(self.COINGECKO_URL, {'ids': ','.join(ids), 'vs_currencies': 'usd'}),
+            self.cache)
+    
+    def get_json(self, url: str, params: Optional[Dict] = None):
+        """Decoded JSON body of a successful GET; raises otherwise"""
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
     
     def get_weather(self, city: str) -> Optional[str]:
         """Get weather information"""
@@ -920,55 +1532,51 @@ class APIIntegrator:
             if api_key == "your_api_key_here":
                 return f"Weather for {city}: API key required for OpenWeatherMap"
             
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-            response = self.session.get(url)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data['main']['temp']
-                desc = data['weather'][0]['description']
-                return f"{city}: {temp}°C, {desc}"
-            else:
-                return f"Weather error: {data.get('message', 'Unknown error')}"
+            params = {'q': city, 'appid': api_key, 'units': 'metric'}
+            cached = self.cache.lookup('weather', city, lambda: self.get_json(self.WEATHER_URL, params))
+            temp = cached.value['main']['temp']
+            desc = cached.value['weather'][0]['description']
+            if cached.stale:
+                # Offline or refreshing: say how old the report is
+                return f"{city}: {temp}°C, {desc} (as of {cached.fetched_label()})"
+            return f"{city}: {temp}°C, {desc}"
         except Exception as e:
             return f"Weather error: {e}"
     
-    def convert_currency(self, amount: float, from_curr: str, to_curr: str) -> Optional[str]:
+    def currency_rates(self, wait: bool = True) -> Optional[RateTable]:
+        """The cached rate table; None if there is none yet and ``wait`` is False
+        
+        Expired tables are still used (and refreshed in the background), so
+        conversions keep working offline.
+        """
+        # Using a free API (no key required)
+        url = self.CURRENCY_URL.format(self.CURRENCY_BASE)
+        data = self.cache.get('currency', self.CURRENCY_BASE, lambda: self.get_json(url),
+                              wait=wait, max_stale=float('inf'))
+        return RateTable(data) if data else None
+    
+    def convert_currency(self, amount: float, from_curr: str, to_curr: str,
+                         rates: Optional[RateTable] = None) -> Optional[str]:
         """Convert currency"""
         try:
-            # Using a free API (no key required)
-            url = f"https://api.exchangerate-api.com/v4/latest/{from_curr.upper()}"
-            response = self.session.get(url)
-            data = response.json()
-            
-            if to_curr.upper() in data['rates']:
-                rate = data['rates'][to_curr.upper()]
-                result = amount * rate
-                return f"{amount} {from_curr.upper()} = {result:.2f} {to_curr.upper()}"
-            else:
-                return f"Currency {to_curr} not found"
+            rates = rates or self.currency_rates()
+            for currency in (from_curr, to_curr):
+                if currency not in rates:
+                    return f"Currency {currency} not found"
+            result = rates.convert(amount, from_curr, to_curr)
+            return f"{amount} {from_curr.upper()} = {result:.2f} {to_curr.upper()}"
         except Exception as e:
             return f"Currency error: {e}"
     
     def get_crypto_price(self, symbol: str) -> Optional[str]:
         """Get cryptocurrency price"""
         try:
-            url = f"https://api.coindesk.com/v1/bpi/currentprice/{symbol}.json"
-            response = self.session.get(url)
-            data = response.json()
-            
-            if 'bpi' in data and symbol.upper() in data['bpi']:
-                price = data['bpi'][symbol.upper()]['rate']
-                return f"{symbol.upper()}: {price}"
-            else:
-                # Fallback to CoinGecko
-                url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol}&vs_currencies=usd"
-                response = self.session.get(url)
-                data = response.json()
-                if symbol in data:
-                    price = data[symbol]['usd']
-                    return f"{symbol.upper()}: ${price}"
+            quote = self.crypto_prices.quote(symbol)
+            if quote.value is None:
                 return f"Crypto {symbol} not found"
+            if quote.stale:
+                return f"{symbol.upper()}: ${quote.value} (as of {quote.fetched_label()})"
+            return f"{symbol.upper()}: ${quote.value}"
         except Exception as e:
             return f"Crypto error: {e}"
 
@@ -1545,8 +2153,8 @@ class SmartSuggestions:
         except Exception as e:
             debug_print(f"Usage data save error: {e}")
     
-    def record_usage(self, item_name: str, item_type: str = "app"):
-        """Record usage"""
+    def record_usage(self, item_name: str, item_type: str = "app", path: Optional[str] = None):
+        """Record usage; ``path`` is the launched file, kept for idle prefetching"""
         try:
             now = datetime.now().isoformat()
             
@@ -1558,6 +2166,8 @@ class SmartSuggestions:
             
             self.usage_data[item_type][item_name]["count"] += 1
             self.usage_data[item_type][item_name]["last_used"] = now
+            if path:
+                self.usage_data[item_type][item_name]["path"] = path
             self.usage_data["last_used"][item_name] = now
             
             self.save_usage_data()
@@ -1608,18 +2218,45 @@ class SmartSuggestions:
 
 # ---------------- UI ----------------
 class LauncherUI(QWidget):
+    command_results_ready = pyqtSignal(int, list)  # pipeline generation, [result dict, ...]
+    CURRENCY_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s+(\w{3})\s+to\s+(\w{3})')
+    
     def __init__(self):
         super().__init__()
         
         # Settings - Initialize first so other components can use it
         self.settings = QSettings("AoiLauncher", "Settings")
         self.theme = self.settings.value("theme", "dark")
+        _ICON_CACHE.configure(int(self.settings.value("cache_size", 200)),
+                              self.settings.value("enable_icon_cache", True, type=bool))
         
         self.search_timer = QTimer(singleShot=True)
         self.search_timer.timeout.connect(self.do_search)
-        self.current_worker = None
+        self.search_generation = None  # Generation of the search being shown
+        self.awaiting_first_batch = False  # Next streamed batch replaces the list
+        self.result_paths = set()  # Paths of file rows currently shown
+        self.special_icon_paths = set()  # Icons requested for the command rows shown
+        # Checked once here so command rows never touch the disk
+        self.browser_icon_path = CHROME_PATH if os.path.exists(CHROME_PATH) else "msedge.exe"
+        self.result_scores = []  # Rank scores of the file rows, best first
+        self.result_limit = 50  # max_results of the search being shown
         self.is_closing = False  # Close control
         
+        # Persistent file index, refreshed by a background crawl
+        self.file_index = FileIndex(os.path.join(app_data_dir(), "file_index.db"))
+        self.search_service = SearchService(self.file_index, self)
+        self.search_service.batch_ready.connect(self.merge_results)
+        self.search_service.search_done.connect(self.finish_results)
+        # Result icons are extracted in the background and swapped in as they arrive
+        screen = QApplication.primaryScreen()
+        self.icon_store = IconStore(os.path.join(app_data_dir(), "icon_cache.db"))
+        self.icon_loader = IconLoader(self.icon_store, screen.devicePixelRatio() if screen else 1.0, self)
+        self.icon_loader.icon_ready.connect(self.apply_icon)
+        self.index_maintainer = IndexMaintainer(self.file_index, self)
+        self.index_crawler = IndexCrawler(self.file_index)
+        self.index_crawler.crawl_finished.connect(lambda _: self.index_maintainer.watch_index())
+        self.index_crawler.start()
+        
         # Core features
         self.calculator = Calculator()
         self.web_searcher = WebSearcher()
@@ -1629,13 +2266,21 @@ class LauncherUI(QWidget):
         # Advanced features
         self.clipboard_manager = ClipboardManager()
         self.text_processor = TextProcessor()
-        self.api_integrator = APIIntegrator()
+        self.api_integrator = APIIntegrator(os.path.join(app_data_dir(), "api_cache.json"))
         self.file_operations = FileOperations()
         
         # AI Integration
         self.ai_assistant = AIAssistant()
         self.ai_commands = AICommands(self.ai_assistant)
         
+        # Special commands; network lookups answer asynchronously
+        self.command_results = []  # Special results shown for the current query
+        self.command_pipeline = CommandPipeline(
+            self.command_providers(),
+            Provider('simple_command', self.simple_command_results, triggers=prefix('open ', 'find ', 'search ')),
+        )
+        self.command_results_ready.connect(self.add_command_results)
+        
         # Options window
         self.options_window = None
         
@@ -1646,6 +2291,10 @@ class LauncherUI(QWidget):
         # Animations
         self.fade_animation = None
         
+        # Warms icons and shortcuts of the most used apps while hidden and idle
+        self.idle_prefetcher = IdlePrefetcher(self, self.file_index, self.icon_loader, parent=self)
+        self.idle_prefetcher.icon_ready.connect(self.apply_icon)
+        
         debug_print("LauncherUI starting...")
         
         # Check and setup startup on first run
@@ -1844,6 +2493,9 @@ class LauncherUI(QWidget):
     def show_with_animation(self):
         """Show launcher with fade animation"""
         try:
+            # Background prefetch yields to the user
+            self.idle_prefetcher.pause()
+            
             # Completely reset launcher state before showing
             self.reset_launcher_state()
             
@@ -1877,15 +2529,18 @@ class LauncherUI(QWidget):
         except Exception as e:
             debug_print(f"Show animation error: {e}")
     
+    def cancel_current_search(self):
+        """Cancel the running search without blocking the UI thread"""
+        if self.search_generation is not None:
+            self.search_generation = None
+            self.search_service.cancel()
+    
     def reset_launcher_state(self):
         """Completely reset launcher to initial state"""
         try:
             # Stop any ongoing searches
-            if hasattr(self, 'current_worker') and self.current_worker and self.current_worker.isRunning():
-                self.current_worker.quit()
-                self.current_worker.wait(100)
-                if self.current_worker.isRunning():
-                    self.current_worker.terminate()
+            self.cancel_current_search()
+            self.command_pipeline.cancel()
             
             # Clear search results and ensure they stay hidden
             if hasattr(self, 'result_list'):
@@ -1915,9 +2570,7 @@ class LauncherUI(QWidget):
         """Hide launcher with fade animation"""
         try:
             # Clear any ongoing searches and hide results before hiding
-            if hasattr(self, 'current_worker') and self.current_worker and self.current_worker.isRunning():
-                self.current_worker.quit()
-                self.current_worker.wait(100)
+            self.cancel_current_search()
             
             # Hide results and reset size
             self.result_list.hide()
@@ -2036,11 +2689,8 @@ class LauncherUI(QWidget):
                 self.center_on_screen()
                 
                 # Stop any ongoing searches immediately
-                if hasattr(self, 'current_worker') and self.current_worker and self.current_worker.isRunning():
-                    self.current_worker.quit()
-                    self.current_worker.wait(100)
-                    if self.current_worker.isRunning():
-                        self.current_worker.terminate()
+                self.cancel_current_search()
+                self.command_pipeline.cancel()
                 
                 return
             
@@ -2090,46 +2740,90 @@ class LauncherUI(QWidget):
             return name
         return os.path.splitext(name)[0]
 
+    def add_file_result(self, name: str, path: str, row: Optional[int] = None):
+        """Append one file result row, or insert it at ``row``"""
+        item = QListWidgetItem()
+        item.setText(self.format_display_name(name))
+        item.setData(Qt.ItemDataRole.UserRole, path)
+        # Prevent app crash from icon loading errors
+        try:
+            icon = cached_icon(path, small=True)
+            if icon is None:
+                # File type icon now, the real one from the icon loader
+                icon = placeholder_icon(path, small=True)
+                self.icon_loader.request(path, self.result_list.count() if row is None else row)
+            item.setIcon(icon)
+        except Exception as icon_error:
+            debug_print(f"Icon loading error: {icon_error}")
+            item.setIcon(QIcon())  # Empty icon
+        if row is None:
+            self.result_list.addItem(item)
+        else:
+            self.result_list.insertItem(row, item)
+        self.result_paths.add(path)
+
+    def set_special_icon(self, item: QListWidgetItem, icon_path: str, row: int):
+        """Icon of ``icon_path`` on a command row, loaded off the GUI thread like file icons"""
+        item.setData(ICON_PATH_ROLE, icon_path)
+        icon = cached_icon(icon_path, small=True)
+        if icon is None:
+            icon = placeholder_icon(icon_path, small=True)
+            self.special_icon_paths.add(icon_path)
+            self.icon_loader.request(icon_path, row)
+        item.setIcon(icon)
+
+    def apply_icon(self, path: str, small: bool, image: QImage, share_key: str = ''):
+        """Cache an icon from the icon loader and set it on the rows showing ``path``"""
+        try:
+            icon = cache_icon(path, small, image, share_key)
+            if icon.isNull() or (path not in self.result_paths and path not in self.special_icon_paths):
+                return
+            for i in range(self.result_list.count()):
+                item = self.result_list.item(i)
+                if item.data(Qt.ItemDataRole.UserRole) == path or item.data(ICON_PATH_ROLE) == path:
+                    item.setIcon(icon)
+        except Exception as e:
+            debug_print(f"apply_icon error: {e}")
+
+    def fit_result_list(self):
+        """Show or hide the result list and size the window to it"""
+        if self.result_list.count() > 0:
+            self.result_list.show()
+            # Calculate new height: search bar + results + margins
+            result_height = min(self.result_list.count() * 70, 400)  # Max 400px for results
+            new_height = 100 + result_height + 50  # 100 for search bar, 50 for margins
+            self.resize(650, new_height)
+            self.center_on_screen()  # Recenter after resize
+        else:
+            # No results - hide list and resize to minimal
+            self.result_list.hide()
+            self.resize(650, 100)
+
     def populate_results(self, results: list):
         """Safe result population"""
         try:
             self.result_list.clear()
+            self.icon_loader.clear()
+            self.result_paths = set()
+            self.special_icon_paths = set()
+            self.result_scores = []
             debug_print(f"populate_results - {len(results)} results received")
             
-            for i, (name, path) in enumerate(results):
+            for i, (name, path, score) in enumerate(results[:self.result_limit]):
                 try:
-                    item = QListWidgetItem()
-                    item.setText(self.format_display_name(name))
-                    item.setData(Qt.ItemDataRole.UserRole, path)
-                    # Prevent app crash from icon loading errors
-                    try:
-                        item.setIcon(icon_from_path(path, small=True))
-                    except Exception as icon_error:
-                        debug_print(f"Icon loading error: {icon_error}")
-                        item.setIcon(QIcon())  # Empty icon
-                    self.result_list.addItem(item)
+                    self.add_file_result(name, path)
+                    self.result_scores.append(score)
                     if DEBUG and i < 5:  # Debug first 5 results
                         debug_print(f"populate_results - {i+1}: {name} -> {path}")
                 except Exception as e:
                     debug_print(f"populate_results item error: {e}")
                     continue
             
-            # Show result list and resize window based on results
+            self.fit_result_list()
             if self.result_list.count() > 0:
-                self.result_list.show()
-                # Calculate new height: search bar + results + margins
-                result_height = min(self.result_list.count() * 70, 400)  # Max 400px for results
-                new_height = 100 + result_height + 50  # 100 for search bar, 50 for margins
-                self.resize(650, new_height)
-                self.center_on_screen()  # Recenter after resize
-                
                 # Auto-select first item
                 self.result_list.setCurrentRow(0)
-                debug_print(f"{self.result_list.count()} results found, first item selected, window resized to {new_height}px")
-            else:
-                # No results - hide list and resize to minimal
-                self.result_list.hide()
-                self.resize(650, 100)
+                debug_print(f"{self.result_list.count()} results found, first item selected")
                 
         except Exception as e:
             debug_print(f"populate_results general error: {e}")
@@ -2137,6 +2831,51 @@ class LauncherUI(QWidget):
             self.result_list.hide()
             self.resize(650, 100)
 
+    def merge_results(self, generation: int, batch: list):
+        """Merge a streamed batch of file results, keeping the current selection"""
+        if generation != self.search_generation:
+            return  # Batch from a superseded search
+        if self.awaiting_first_batch:
+            # First batch of a new search replaces the previous query's rows
+            self.awaiting_first_batch = False
+            self.populate_results(batch)
+            return
+        try:
+            for name, path, score in batch:
+                if path in self.result_paths:
+                    continue
+                # result_scores is descending; equal scores keep arrival order
+                row = len(self.result_scores)
+                while row > 0 and self.result_scores[row - 1] < score:
+                    row -= 1
+                if row >= self.result_limit:
+                    continue
+                try:
+                    self.add_file_result(name, path, row)
+                    self.result_scores.insert(row, score)
+                except Exception as e:
+                    debug_print(f"merge_results item error: {e}")
+                    continue
+                # Keep at most max_results rows; the worst one drops off the end
+                while self.result_list.count() > self.result_limit:
+                    dropped = self.result_list.takeItem(self.result_list.count() - 1)
+                    self.result_paths.discard(dropped.data(Qt.ItemDataRole.UserRole))
+                    self.result_scores.pop()
+            self.fit_result_list()
+            if self.result_list.currentRow() < 0 and self.result_list.count() > 0:
+                self.result_list.setCurrentRow(0)
+            debug_print(f"merge_results - {len(batch)} streamed, {self.result_list.count()} shown")
+        except Exception as e:
+            debug_print(f"merge_results general error: {e}")
+
+    def finish_results(self, generation: int):
+        """Search finished: clear stale rows if no source produced anything"""
+        if generation != self.search_generation:
+            return
+        if self.awaiting_first_batch:
+            self.awaiting_first_batch = False
+            self.populate_results([])
+
     def do_search(self):
         """Advanced smart search system"""
         try:
@@ -2153,16 +2892,7 @@ class LauncherUI(QWidget):
                 self.center_on_screen()
                 
                 # Stop any ongoing searches immediately
-                if hasattr(self, 'current_worker') and self.current_worker and self.current_worker.isRunning():
-                    debug_print("Stopping search worker for empty query...")
-                    try:
-                        self.current_worker.results_ready.disconnect()
-                    except Exception:
-                        pass
-                    self.current_worker.quit()
-                    self.current_worker.wait(100)
-                    if self.current_worker.isRunning():
-                        self.current_worker.terminate()
+                self.cancel_current_search()
                 
                 return
             
@@ -2171,63 +2901,103 @@ class LauncherUI(QWidget):
             special_results = self.handle_special_commands(q)
             if special_results:
                 debug_print(f"handle_special_commands returned {len(special_results)} results, populating custom results.")
+                self.cancel_current_search()
                 self.populate_custom_results(special_results)
                 return
             debug_print(f"handle_special_commands returned no results for '{q}', proceeding to normal file search.")
                 
-            # Normal file search
-            # Safely stop old worker
-            if self.current_worker and self.current_worker.isRunning():
-                debug_print("Stopping old worker...")
-                try:
-                    self.current_worker.results_ready.disconnect()
-                except Exception:
-                    pass
-                self.current_worker.quit()
-                self.current_worker.wait(1000)
-                if self.current_worker.isRunning():
-                    self.current_worker.terminate()
-                    
-            self.current_worker = SearchWorker(q)
-            self.current_worker.results_ready.connect(self.populate_results)
-            self.current_worker.start()
-            debug_print("New worker started")
+            # Normal file search - replaces whatever the service was running
+            self.awaiting_first_batch = True
+            self.result_limit = int(self.settings.value("max_results", 50))
+            ranker = Ranker(dict(self.smart_suggestions.usage_data.get("apps", {})))
+            self.search_generation = self.search_service.submit(q, ranker, self.result_limit)
+            debug_print(f"Search {self.search_generation} queued")
         except Exception as e:
             debug_print(f"do_search error: {e}")
             self.result_list.clear()
     
+    def command_providers(self) -> List[Provider]:
+        """Special commands in display order; network lookups are slow providers
+
+        Triggers only pick the candidates; each provider still checks the
+        full query itself.
+        """
+        digits = prefix(*'0123456789')
+        return [
+            Provider('calculation', self.calculation_results, triggers=chars('+-*/()=')),
+            Provider('percentage', self.percentage_results, triggers=digits),
+            Provider('text_processing', self.text_processing_results,
+                     triggers=prefix('encode ', 'decode ', 'hash ', 'text ')),
+            Provider('generator', self.generator_results, triggers=prefix('generate ', 'password', 'uuid')),
+            Provider('weather', self.weather_results, slow=True, deadline=6.0, triggers=prefix('weather ')),
+            Provider('currency', self.currency_results, triggers=digits),
+            Provider('currency_download', self.currency_download_results, slow=True, deadline=6.0,
+                     triggers=digits),
+            Provider('crypto', self.crypto_results, slow=True, deadline=6.0,
+                     triggers=pattern(r' (?:price|crypto)$')),
+            Provider('color', self.color_results, triggers=prefix('#')),
+            Provider('web_search', self.web_search_results,
+                     triggers=prefix(*(f"{engine} " for engine in WebSearcher.SEARCH_ENGINES),
+                                     'http://', 'https://', 'www.')),
+            Provider('system_command', self.system_command_results,
+                     triggers=exact(*self.system_commands.COMMANDS)),
+            Provider('volume', self.volume_results, triggers=prefix('volume')),
+            Provider('options', self.options_results,
+                     triggers=exact('options', 'aoioptions', 'settings', 'preferences')),
+            Provider('startup', self.startup_results, triggers=exact('startup', 'start with windows', 'auto start')),
+            Provider('ai_command', self.ai_command_results, triggers=prefix('ai ')),
+            Provider('ai_query', self.ai_query_results, triggers=prefix('ai:')),
+        ]
+    
     def handle_special_commands(self, query: str) -> Optional[List[Dict]]:
-        """Handle special commands - MEGA ENHANCED"""
-        results = []
-        query_lower = query.lower().strip()
-        
-        # Return None immediately for empty queries - no default suggestions
-        if not query_lower:
-            return None
-        
+        """Handle special commands - MEGA ENHANCED
+
+        Returns the fast providers' results; slow providers (weather, the
+        first currency rate download, crypto) report later through
+        command_results_ready.
+        """
+        results = self.command_pipeline.run(query, self.command_results_ready.emit)
+        self.command_results = list(results)
+        return results if results else None
+    
+    def add_command_results(self, generation: int, results: List[Dict]):
+        """Show results of a slow provider that finished for the current query"""
+        if self.is_closing or not self.command_pipeline.is_current(generation):
+            return
+        debug_print(f"Slow command provider added {len(results)} results")
+        # Special results replace the file search, as when they arrive inline
+        self.cancel_current_search()
+        self.command_results.extend(results)
+        self.populate_custom_results(self.command_results)
+    
+    def calculation_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 1. Mathematical calculations
         if any(char in query for char in '+-*/()='):
             calc_result = self.calculator.evaluate_expression(query)
             if calc_result:
-                results.append({
+                return [{
                     'type': 'calculation',
                     'title': f"{query} = {calc_result}",
                     'subtitle': 'Calculation result (Press Enter to copy)',
                     'action': 'copy',
                     'data': calc_result
-                })
-        
+                }]
+        return None
+    
+    def percentage_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 2. Percentage calculations
         percentage_result = self.calculator.parse_percentage(query)
         if percentage_result:
-            results.append({
+            return [{
                 'type': 'percentage',
                 'title': percentage_result,
                 'subtitle': 'Percentage calculation (Press Enter to copy)',
                 'action': 'copy',
                 'data': percentage_result
-            })
-        
+            }]
+        return None
+    
+    def text_processing_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 3. Text processing commands
         if query_lower.startswith(('encode ', 'decode ', 'hash ', 'text ')):
             parts = query.split(' ', 2)
@@ -2250,15 +3020,18 @@ class LauncherUI(QWidget):
                 
                 if operation in operations:
                     result = self.text_processor.process_text(text, operations[operation])
-                    results.append({
+                    return [{
                         'type': 'text_processing',
                         'title': result,
                         'subtitle': f'Text processing: {operation.replace("_", " ")}',
                         'action': 'copy',
                         'data': result
-                    })
-        
+                    }]
+        return None
+    
+    def generator_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 4. Generators
+        results = []
         if query_lower == 'generate password' or query_lower.startswith('password'):
             password = self.text_processor.generate_password()
             results.append({
@@ -2281,125 +3054,166 @@ class LauncherUI(QWidget):
         
         # 5. Clipboard history - DISABLED
         # Clipboard history feature has been disabled
-        
-        # 6. Weather
+        return results
+    
+    def weather_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
+        # 6. Weather (network, slow provider)
         if query_lower.startswith('weather '):
             city = query[8:].strip()
             if city:
                 weather_info = self.api_integrator.get_weather(city)
                 if weather_info:
-                    results.append({
+                    return [{
                         'type': 'weather',
                         'title': weather_info,
                         'subtitle': f'Weather information for {city}',
                         'action': 'copy',
                         'data': weather_info
-                    })
-        
-        # 7. Currency conversion
-        currency_match = re.match(r'(\d+(?:\.\d+)?)\s+(\w{3})\s+to\s+(\w{3})', query_lower)
+                    }]
+        return None
+    
+    def cached_currency_rates(self) -> Optional[RateTable]:
+        try:
+            return self.api_integrator.currency_rates(wait=False)
+        except FetchError:
+            return None
+    
+    def currency_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
+        # 7. Currency conversion from the cached rate table (in memory)
+        currency_match = self.CURRENCY_PATTERN.match(query_lower)
         if currency_match:
-            amount, from_curr, to_curr = currency_match.groups()
-            currency_result = self.api_integrator.convert_currency(float(amount), from_curr, to_curr)
-            if currency_result:
-                results.append({
-                    'type': 'currency',
-                    'title': currency_result,
-                    'subtitle': 'Currency conversion',
-                    'action': 'copy',
-                    'data': currency_result
-                })
-        
-        # 8. Cryptocurrency prices
+            rates = self.cached_currency_rates()
+            if rates:
+                return self.currency_conversion(currency_match, rates)
+        return None
+    
+    def currency_download_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
+        # 7. No rate table cached yet: download it (network, slow provider)
+        currency_match = self.CURRENCY_PATTERN.match(query_lower)
+        if currency_match and not self.cached_currency_rates():
+            return self.currency_conversion(currency_match)
+        return None
+    
+    def currency_conversion(self, currency_match, rates: Optional[RateTable] = None) -> Optional[List[Dict]]:
+        amount, from_curr, to_curr = currency_match.groups()
+        currency_result = self.api_integrator.convert_currency(float(amount), from_curr, to_curr, rates)
+        if not currency_result:
+            return None
+        rates = rates or self.cached_currency_rates()
+        updated = rates.updated_label() if rates else None
+        return [{
+            'type': 'currency',
+            'title': currency_result,
+            'subtitle': f'Currency conversion (rates updated {updated})' if updated else 'Currency conversion',
+            'action': 'copy',
+            'data': currency_result
+        }]
+    
+    def crypto_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
+        # 8. Cryptocurrency prices (network, slow provider)
         if query_lower.endswith(' price') or query_lower.endswith(' crypto'):
             crypto = query_lower.replace(' price', '').replace(' crypto', '').strip()
             if crypto:
                 crypto_info = self.api_integrator.get_crypto_price(crypto)
                 if crypto_info:
-                    results.append({
+                    return [{
                         'type': 'crypto',
                         'title': crypto_info,
                         'subtitle': f'Cryptocurrency price for {crypto}',
                         'action': 'copy',
                         'data': crypto_info
-                    })
-        
+                    }]
+        return None
+    
+    def color_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 9. Color tools
         if query_lower.startswith('#') and len(query) == 7:
             # Hex color
-            results.append({
+            return [{
                 'type': 'color',
                 'title': f'Color: {query.upper()}',
                 'subtitle': 'Hex color code (Press Enter to copy)',
                 'action': 'copy',
                 'data': query.upper()
-            })
-        
+            }]
+        return None
+    
+    def web_search_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 10. Web searches
         web_result = self.web_searcher.parse_search(query)
         if web_result:
             engine, search_query, url = web_result
-            results.append({
+            return [{
                 'type': 'web_search',
                 'title': f"{engine.title()}: {search_query}" if engine != 'url' else url,
                 'subtitle': f'Search on web: {search_query}' if engine != 'url' else 'Open URL',
                 'action': 'open_url',
                 'data': url
-            })
-        
+            }]
+        return None
+    
+    def system_command_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 11. System commands
         if query_lower in self.system_commands.COMMANDS:
             desc, cmd = self.system_commands.COMMANDS[query_lower]
-            results.append({
+            return [{
                 'type': 'system_command',
                 'title': desc,
                 'subtitle': f'System command: {query_lower}',
                 'action': 'system_command',
                 'data': cmd
-            })
-        
+            }]
+        return None
+    
+    def volume_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 12. Volume control
         volume_result = self.system_commands.parse_volume(query)
         if volume_result:
             desc, cmd = volume_result
-            results.append({
+            return [{
                 'type': 'volume',
                 'title': desc,
                 'subtitle': 'Set volume level',
                 'action': 'system_command',
                 'data': cmd
-            })
-        
+            }]
+        return None
+    
+    def options_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 13. Options Command
         if query_lower in ['options', 'aoioptions', 'settings', 'preferences']:
-            results.append({
+            return [{
                 'type': 'options',
                 'title': 'Open Options Panel',
                 'subtitle': 'Configure launcher settings, hotkeys, and preferences',
                 'action': 'open_options',
                 'data': 'options'
-            })
-        
+            }]
+        return None
+    
+    def startup_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 14. Startup Management Commands
         if query_lower in ['startup', 'start with windows', 'auto start']:
             is_in_startup = self.is_in_startup()
             if is_in_startup:
-                results.append({
+                return [{
                     'type': 'startup_remove',
                     'title': 'Remove from Windows Startup',
                     'subtitle': 'Launcher will not start automatically with Windows',
                     'action': 'remove_startup',
                     'data': 'startup_remove'
-                })
+                }]
             else:
-                results.append({
+                return [{
                     'type': 'startup_add',
                     'title': 'Add to Windows Startup',
                     'subtitle': 'Launcher will start automatically with Windows',
                     'action': 'add_startup',
                     'data': 'startup_add'
-                })
-        
+                }]
+        return None
+    
+    def ai_command_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 15. AI Commands
         if query_lower.startswith('ai '):
             ai_parts = query.split(' ', 2)
@@ -2407,49 +3221,53 @@ class LauncherUI(QWidget):
             if len(ai_parts) >= 2:
                 if ai_parts[1] == 'config':
                     config_result = self.ai_commands.handle_ai_config(ai_parts)
-                    results.append({
+                    return [{
                         'type': 'ai_config',
                         'title': config_result,
                         'subtitle': 'AI Configuration',
                         'action': 'copy',
                         'data': config_result
-                    })
+                    }]
                 
                 elif ai_parts[1] == 'switch' and len(ai_parts) >= 3:
                     switch_result = self.ai_commands.handle_ai_switch(ai_parts[2])
-                    results.append({
+                    return [{
                         'type': 'ai_switch',
                         'title': switch_result,
                         'subtitle': 'AI Service Switch',
                         'action': 'copy',
                         'data': switch_result
-                    })
+                    }]
                 
                 elif ai_parts[1] == 'status':
                     status = f"Current AI: {self.ai_assistant.current_service}"
-                    results.append({
+                    return [{
                         'type': 'ai_status',
                         'title': status,
                         'subtitle': 'AI Service Status',
                         'action': 'copy',
                         'data': status
-                    })
-        
+                    }]
+        return None
+    
+    def ai_query_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 16. AI Query Preparation (ai: prefix)
         if query_lower.startswith('ai:'):
             ai_query = query[3:].strip()
             if ai_query:
-                results.append({
+                return [{
                     'type': 'ai_query_ready',
                     'title': f"Ask AI: {ai_query}",
                     'subtitle': f'Press Enter to get answer from {self.ai_assistant.current_service}',
                     'action': 'ai_query',
                     'data': ai_query
-                })
-        
+                }]
+        return None
+    
+    def simple_command_results(self, query: str, query_lower: str) -> Optional[List[Dict]]:
         # 17. Natural language processing for simple commands (no AI calls)
-        # Only process very specific patterns without calling AI
-        if not results and len(query.split()) == 2:
+        # Only process very specific patterns without calling AI; runs when no other command matched
+        if len(query.split()) == 2:
             words = query_lower.split()
             
             # Simple "open X" patterns
@@ -2457,35 +3275,34 @@ class LauncherUI(QWidget):
                 target = words[1]
                 if target in self.system_commands.COMMANDS:
                     desc, cmd = self.system_commands.COMMANDS[target]
-                    results.append({
+                    return [{
                         'type': 'simple_command',
                         'title': desc,
                         'subtitle': f'Open {target}',
                         'action': 'system_command',
                         'data': cmd
-                    })
+                    }]
                 else:
                     # Simple search suggestion
-                    results.append({
+                    return [{
                         'type': 'simple_search',
                         'title': f"Search for: {target}",
                         'subtitle': 'Simple search suggestion',
                         'action': 'search',
                         'data': target
-                    })
+                    }]
             
             # Simple "find X" patterns  
             elif words[0] in ['find', 'search']:
                 target = words[1]
-                results.append({
+                return [{
                     'type': 'simple_search',
                     'title': f"Search for: {target}",
                     'subtitle': 'Simple search suggestion',
                     'action': 'search',
                     'data': target
-                })
-        
-        return results if results else None
+                }]
+        return None
     
 
     
@@ -2493,6 +3310,9 @@ class LauncherUI(QWidget):
         """Populate custom results"""
         try:
             self.result_list.clear()
+            self.icon_loader.clear()
+            self.result_paths = set()
+            self.special_icon_paths = set()
             debug_print(f"populate_custom_results - {len(results)} custom results")
             if len(results) > 0:
                 debug_print(f"populate_custom_results - First result: {results[0]}")
@@ -2504,31 +3324,17 @@ class LauncherUI(QWidget):
                     item.setText(result['title'])
                     item.setData(Qt.ItemDataRole.UserRole, result)
                     
-                    # Custom icons
-                    icon = QIcon()
+                    # Custom icons, from the icon loader like the file results'
+                    icon_path = None
                     if result['type'] == 'calculation':
-                        # Calculator icon (use system icon)
-                        try:
-                            icon = icon_from_path("calc.exe", small=True)
-                        except:
-                            pass
+                        icon_path = "calc.exe"  # Calculator icon (use system icon)
                     elif result['type'] == 'web_search':
-                        # Browser icon
-                        try:
-                            icon = icon_from_path("C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe", small=True)
-                        except:
-                            try:
-                                icon = icon_from_path("msedge.exe", small=True)
-                            except:
-                                pass
+                        icon_path = self.browser_icon_path
                     elif result['type'] in ['system_command', 'volume']:
-                        # System icon
-                        try:
-                            icon = icon_from_path("control.exe", small=True)
-                        except:
-                            pass
+                        icon_path = "control.exe"
                     
-                    item.setIcon(icon)
+                    if icon_path:
+                        self.set_special_icon(item, icon_path, self.result_list.count())
                     self.result_list.addItem(item)
                     
                     if DEBUG and i < 3:
@@ -2575,122 +3381,17 @@ class LauncherUI(QWidget):
             # Old format: String (file path)
             path = data
             if path:
-                # Special handling for .lnk files
-                if path.lower().endswith('.lnk'):
-                    debug_print(f"launch_item - Processing .lnk file: {path}")
-                    try:
-                        # Resolve .lnk file to get target
-                        target, icon_path, icon_index = resolve_lnk(path)
-                        debug_print(f"launch_item - .lnk target: {target}")
-                        
-                        if target and os.path.exists(target):
-                            # Execute the target file
-                            debug_print(f"launch_item - Executing .lnk target: {target}")
-                            os.startfile(target)
-                            debug_print("launch_item - .lnk target executed successfully!")
-                            
-                            # Record usage
-                            filename = os.path.basename(target)
-                            self.smart_suggestions.record_usage(filename, 'apps')
-                            
-                            if not self.is_closing:
-                                self.hide()  # Close yerine hide kullan - arkaplanda kal
-                            return
-                        else:
-                            # Try to execute .lnk file directly with shell
-                            debug_print(f"launch_item - Trying to execute .lnk directly")
-                            subprocess.Popen(['cmd', '/c', 'start', '', path], shell=True)
-                            debug_print("launch_item - .lnk executed with shell!")
-                            
-                            if not self.is_closing:
-                                self.hide()  # Close yerine hide kullan - arkaplanda kal
-                            return
-                            
-                    except Exception as e:
-                        debug_print(f"launch_item - .lnk execution error: {e}")
-                        # Fall back to normal file execution
-                
-                # Fix Turkish character issues - comprehensive correction
-                corrected_path = path
-                # Kullanıcılar -> Users conversion
-                corrected_path = corrected_path.replace("C:\\Kullanıcılar", "C:\\Users")
-                # Masaüstü -> Desktop conversion
-                corrected_path = corrected_path.replace("\\Masaüstü\\", "\\Desktop\\")
-                # Belgeler -> Documents conversion  
-                corrected_path = corrected_path.replace("\\Belgeler\\", "\\Documents\\")
-                # İndirilenler -> Downloads conversion
-                corrected_path = corrected_path.replace("\\İndirilenler\\", "\\Downloads\\")
-                debug_print(f"launch_item - Corrected Path: {corrected_path}")
-                
-                # Try alternative paths too
-                alternative_paths = []
-                if "\\Masaüstü\\" in path:
-                    # Alternative paths for Desktop
-                    username = path.split("\\")[2]  # kittnom
-                    filename = path.split("\\")[-1]
-                    alternative_paths.extend([
-                        f"C:\\Users\\{username}\\Desktop\\{filename}",
-                        f"C:\\Users\\{username}\\OneDrive\\Desktop\\{filename}",
-                        f"C:\\Users\\{username}\\OneDrive\\Masaüstü\\{filename}"
-                    ])
-                
-                debug_print(f"launch_item - Alternative paths: {alternative_paths}")
-                
-                # Try all paths
-                all_paths = [corrected_path, path] + alternative_paths
-                
-                for i, test_path in enumerate(all_paths):
-                    debug_print(f"launch_item - Testing ({i+1}/{len(all_paths)}): {test_path}")
-                    if os.path.exists(test_path):
-                        try:
-                            debug_print(f"launch_item - FOUND! Executing: {test_path}")
-                            os.startfile(test_path)
-                            debug_print("launch_item - Successfully executed!")
-                            
-                            # Record usage
-                            filename = os.path.basename(test_path)
-                            self.smart_suggestions.record_usage(filename, 'apps')
-                            
-                            if not self.is_closing:
-                                self.hide()  # Close yerine hide kullan - arkaplanda kal
-                            return
-                        except Exception as e:
-                            debug_print(f"launch_item - Execution error: {e}")
-                            continue
-                    else:
-                        debug_print(f"launch_item - Does not exist: {test_path}")
-                
-                # Last resort: find file and determine real path
-                debug_print("launch_item - Last resort: file search...")
-                filename = os.path.basename(path)
-                username = path.split("\\")[2] if len(path.split("\\")) > 2 else "kittnom"
-                
-                # Check common locations
-                common_locations = [
-                    f"C:\\Users\\{username}\\Desktop",
-                    f"C:\\Users\\{username}\\OneDrive\\Desktop",
-                    f"C:\\Users\\{username}\\OneDrive\\Masaüstü",
-                    f"C:\\Users\\{username}\\Downloads",
-                    f"C:\\Users\\{username}\\OneDrive\\İndirilenler",
-                    f"C:\\Users\\{username}\\Documents",
-                    f"C:\\Users\\{username}\\OneDrive\\Belgeler"
-                ]
-                
-                for location in common_locations:
-                    search_path = os.path.join(location, filename)
-                    debug_print(f"launch_item - Searching location: {search_path}")
-                    if os.path.exists(search_path):
-                        try:
-                            debug_print(f"launch_item - FILE FOUND! Executing: {search_path}")
-                            os.startfile(search_path)
-                            debug_print("launch_item - Successfully executed!")
-                            if not self.is_closing:
-                                self.hide()  # Close yerine hide kullan - arkaplanda kal
-                            return
-                        except Exception as e:
-                            debug_print(f"launch_item - Execution error: {e}")
-                
-                debug_print(f"launch_item - File '{filename}' not found in any location!")
+                # Localized/stale known-folder spellings map to the real folder
+                path = KNOWN_FOLDERS.canonicalize(path)
+                debug_print(f"launch_item - Path: {path}")
+                try:
+                    # For a .lnk the shell applies the shortcut's arguments and working directory
+                    os.startfile(path)
+                    debug_print("launch_item - Successfully executed!")
+                    # Keyed by what was launched, which is what Ranker looks results up by
+                    self.smart_suggestions.record_usage(os.path.basename(path), 'apps', path)
+                except OSError as e:
+                    debug_print(f"launch_item - Execution error: {e}")
             else:
                 debug_print("launch_item - Path not found!")
                 
@@ -2934,11 +3635,7 @@ Modified: {info['modified']}
                 })
                 
                 # AI icon
-                try:
-                    ai_icon = icon_from_path("C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe", small=True)
-                except:
-                    ai_icon = QIcon()
-                item.setIcon(ai_icon)
+                self.set_special_icon(item, POWERSHELL_PATH, self.result_list.count())
                 
                 self.result_list.addItem(item)
                 
@@ -3024,17 +3721,19 @@ Modified: {info['modified']}
         self.is_closing = True
         debug_print("Application closing...")
         try:
-            # Safely stop worker
-            if self.current_worker and self.current_worker.isRunning():
-                debug_print("Stopping worker...")
-                try:
-                    self.current_worker.results_ready.disconnect()
-                except Exception:
-                    pass
-                self.current_worker.quit()
-                self.current_worker.wait(500)  # Wait 500ms
-                if self.current_worker.isRunning():
-                    self.current_worker.terminate()
+            # Cancel searches; they stop at their next check point
+            debug_print("Stopping search service...")
+            self.search_service.shutdown()
+            self.command_pipeline.shutdown()
+            self.icon_loader.shutdown()
+            self.idle_prefetcher.shutdown()
+            
+            # Stop index crawler and watcher
+            self.index_maintainer.stop()
+            if self.index_crawler and self.index_crawler.isRunning():
+                debug_print("Stopping index crawler...")
+                self.index_crawler.cancel()
+                self.index_crawler.wait(500)
             
             # Stop global hotkey
             if self.global_hotkey and self.global_hotkey.isRunning():
@@ -4940,7 +5639,11 @@ class OptionsWindow(QWidget):
             
             # Update debug mode
             global DEBUG
-            DEBUG = self.debug_mode.isChecked()
+            DEBUG = aoi_log.DEBUG = self.debug_mode.isChecked()
+            
+            # Resize or disable the icon cache
+            _ICON_CACHE.configure(int(self.settings.value("cache_size", 200)),
+                                  self.settings.value("enable_icon_cache", True, type=bool))
             
         except Exception as e:
             debug_print(f"Apply to launcher error: {e}")
@@ -4971,9 +5674,13 @@ class OptionsWindow(QWidget):
     def clear_icon_cache(self):
         """Clear icon cache"""
         try:
-            global _ICON_CACHE
+            stats = _ICON_CACHE.stats()
             _ICON_CACHE.clear()
-            QMessageBox.information(self, "Cache Cleared", "Icon cache cleared successfully!")
+            self.parent_launcher.icon_store.clear()
+            QMessageBox.information(
+                self, "Cache Cleared",
+                f"Icon cache cleared successfully!\n\n{stats['entries']} icons, "
+                f"{stats['hits']} hits, {stats['misses']} misses since start")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to clear icon cache: {e}")
     
@@ -0,0 +1,352 @@
+"""Application catalogs for Aoi Launcher.
+
+Installed applications are read once into in-memory catalogs and only
+re-read when their source changes, instead of being enumerated on every
+keystroke.  Registry access goes through a small reader interface so the
+catalog logic runs headless against an in-memory reader (see the tests);
+only WinRegistryReader needs Windows.  The Start Menu catalog takes its
+shortcut resolver as a callable for the same reason.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from aoi_index import CancelToken
+from aoi_log import debug_print
+from aoi_match import match_key
+
+
+class AppEntry(NamedTuple):
+    name: str  # what the user searches for
+    path: str  # what gets launched
+    install_location: str
+    source: str  # registry key or shortcut the entry came from
+
+
+# (hive, key path, kind).  kind selects how a subkey becomes an AppEntry.
+REGISTRY_LOCATIONS = (
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths", "app_paths"),
+    ("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths", "app_paths"),
+    ("HKLM", r"SOFTWARE\Classes\Applications", "applications"),
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall", "uninstall"),
+)
+
+
+class RegistryReader:
+    """Minimal read-only registry interface used by RegistryCatalog
+
+    Hives are named by string ("HKLM", "HKCU").  Every method raises
+    OSError when the key does not exist, like winreg does.
+    """
+
+    def last_write_time(self, hive: str, path: str) -> int:
+        """Last-write time of the key, in any monotonic unit"""
+        raise NotImplementedError
+
+    def subkeys(self, hive: str, path: str) -> List[str]:
+        raise NotImplementedError
+
+    def values(self, hive: str, path: str) -> Dict[str, object]:
+        """Values of the key; the default value is under ""."""
+        raise NotImplementedError
+
+
+class WinRegistryReader(RegistryReader):
+    """RegistryReader backed by winreg"""
+
+    def __init__(self):
+        import winreg
+        self.winreg = winreg
+        self.hives = {
+            "HKLM": winreg.HKEY_LOCAL_MACHINE,
+            "HKCU": winreg.HKEY_CURRENT_USER,
+        }
+
+    def _open(self, hive: str, path: str):
+        return self.winreg.OpenKey(self.hives[hive], path)
+
+    def last_write_time(self, hive: str, path: str) -> int:
+        with self._open(hive, path) as key:
+            return self.winreg.QueryInfoKey(key)[2]
+
+    def subkeys(self, hive: str, path: str) -> List[str]:
+        with self._open(hive, path) as key:
+            return [self.winreg.EnumKey(key, i) for i in range(self.winreg.QueryInfoKey(key)[0])]
+
+    def values(self, hive: str, path: str) -> Dict[str, object]:
+        with self._open(hive, path) as key:
+            result = {}
+            for i in range(self.winreg.QueryInfoKey(key)[1]):
+                name, data, _ = self.winreg.EnumValue(key, i)
+                result[name] = data
+            return result
+
+
+def _clean_exe(value) -> str:
+    """Executable path from a DisplayIcon/command style value ("C:\\x.exe",0)"""
+    if not isinstance(value, str):
+        return ""
+    value = value.strip()
+    if value.startswith('"'):
+        value = value[1:].split('"', 1)[0]
+    elif "," in value:
+        value = value.rsplit(",", 1)[0]
+    return os.path.expandvars(value.strip())
+
+
+def entries_from_key(kind: str, subkey: str, values: Dict[str, object], source: str) -> List[AppEntry]:
+    """AppEntries described by one subkey of a REGISTRY_LOCATIONS key"""
+    if kind == "uninstall":
+        name = values.get("DisplayName")
+        path = _clean_exe(values.get("DisplayIcon"))
+        location = values.get("InstallLocation") or ""
+        if not isinstance(name, str) or not name or not path.lower().endswith(".exe"):
+            return []
+        return [AppEntry(name, path, location if isinstance(location, str) else "", source)]
+    path = _clean_exe(values.get(""))
+    if not path:
+        return []
+    location = values.get("Path") or os.path.dirname(path)
+    return [AppEntry(subkey, path, location if isinstance(location, str) else "", source)]
+
+
+class RegistryCatalog:
+    """Snapshot of installed applications from the registry
+
+    refresh() compares the last-write time of every location key with the
+    one seen last time and re-enumerates only locations that changed;
+    within a changed location only subkeys whose own last-write time moved
+    are read again.  Searches never touch the registry.
+    """
+
+    REFRESH_INTERVAL = 5.0  # seconds between change checks from maybe_refresh
+
+    def __init__(self, reader: RegistryReader, locations=REGISTRY_LOCATIONS,
+                 exists: Callable[[str], bool] = os.path.exists):
+        self.reader = reader
+        self.locations = locations
+        self.exists = exists
+        self.lock = threading.Lock()
+        self.location_mtimes = {}  # (hive, path) -> last-write time
+        self.subkey_cache = {}  # (hive, path, subkey) -> (mtime, [AppEntry])
+        self.entries = []  # [AppEntry], deduplicated by path
+        self.keyed = []  # (match_key() of the name, AppEntry), swapped whole by refresh
+        self.checked_at = None  # time.monotonic() of the last refresh
+
+    def maybe_refresh(self, token: Optional[CancelToken] = None) -> bool:
+        """refresh() unless the last check was under REFRESH_INTERVAL ago
+
+        Returns at once while another thread is refreshing; searches keep
+        the current snapshot meanwhile.
+        """
+        if self.lock.locked():
+            return False
+        if self.checked_at is not None and time.monotonic() - self.checked_at < self.REFRESH_INTERVAL:
+            return False
+        return self.refresh(token)
+
+    def refresh(self, token: Optional[CancelToken] = None) -> bool:
+        """Re-read changed locations; returns True when the catalog changed"""
+        with self.lock:
+            self.checked_at = time.monotonic()
+            changed = False
+            for hive, path, kind in self.locations:
+                if token:
+                    token.check()
+                try:
+                    mtime = self.reader.last_write_time(hive, path)
+                except OSError:
+                    mtime = None
+                if self.location_mtimes.get((hive, path), -1) == mtime:
+                    continue
+                changed = True
+                self._read_location(hive, path, kind, mtime, token)
+            if changed:
+                self._rebuild_entries()
+            return changed
+
+    def _read_location(self, hive: str, path: str, kind: str, mtime, token):
+        stale = {k for k in self.subkey_cache if k[0] == hive and k[1] == path}
+        if mtime is not None:
+            try:
+                subkeys = self.reader.subkeys(hive, path)
+            except OSError:
+                subkeys = []
+            for subkey in subkeys:
+                if token:
+                    token.check()
+                cache_key = (hive, path, subkey)
+                stale.discard(cache_key)
+                full = path + "\\" + subkey
+                try:
+                    sub_mtime = self.reader.last_write_time(hive, full)
+                    cached = self.subkey_cache.get(cache_key)
+                    if cached is not None and cached[0] == sub_mtime:
+                        continue
+                    entries = entries_from_key(kind, subkey, self.reader.values(hive, full),
+                                               f"{hive}\\{full}")
+                    self.subkey_cache[cache_key] = (sub_mtime, entries)
+                except OSError:
+                    self.subkey_cache.pop(cache_key, None)
+        for cache_key in stale:
+            del self.subkey_cache[cache_key]
+        # Only recorded once fully read, so a cancelled pass is retried
+        self.location_mtimes[(hive, path)] = mtime
+
+    def _rebuild_entries(self):
+        entries = []
+        seen = set()
+        for _, cached in self.subkey_cache.values():
+            for entry in cached:
+                key = (entry.name.lower(), os.path.normcase(entry.path))
+                if key in seen or not self.exists(entry.path):
+                    continue
+                seen.add(key)
+                entries.append(entry)
+        self.entries = entries
+        self.keyed = [(match_key(e.name), e) for e in entries]
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        """(name, path) of entries whose name contains ``query``"""
+        query = match_key(query)
+        return [(e.name, e.path) for key, e in self.keyed if query in key]
+
+
+def start_menu_folders() -> List[str]:
+    """Per-user then all-users Start Menu Programs folders"""
+    folders = []
+    for var in ("APPDATA", "PROGRAMDATA"):
+        base = os.environ.get(var)
+        if base:
+            folders.append(os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"))
+    return folders
+
+
+class StartMenuCatalog:
+    """Applications from the Start Menu Programs folders
+
+    Every .lnk is resolved to its target once; the result is cached by the
+    shortcut's (mtime, size), in memory and optionally in a JSON file, so
+    a refresh only stats the shortcuts and resolves the ones that changed.
+    Shortcuts pointing at the same target collapse into one entry, the
+    first found winning (per-user folders come first).  Searches never
+    touch the disk; the owner calls ``refresh`` off the search thread when
+    ``directories`` change, and searches keep using the previous snapshot
+    until the new one is swapped in.
+    """
+
+    def __init__(self, folders: List[str], resolve: Callable[[str], Optional[str]],
+                 cache_path: Optional[str] = None):
+        self.folders = folders
+        self.resolve = resolve  # .lnk path -> target path, or None
+        self.cache_path = cache_path
+        self.lock = threading.Lock()
+        self.resolved = self._load_cache()  # lnk path -> [mtime, size, target]
+        self.entries = []  # [AppEntry]; path is the .lnk, install_location its target's folder
+        self.keyed = []  # (match_key() of the name, AppEntry), swapped whole by refresh
+        self.directories = []  # every folder walked by the last refresh
+
+    def _load_cache(self) -> Dict[str, list]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.resolved, f)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            debug_print(f"Start Menu cache save error: {e}")
+
+    def _shortcuts(self, token: Optional[CancelToken],
+                   directories: List[str]) -> List[Tuple[str, float, int]]:
+        """(path, mtime, size) of every .lnk under the folders, in folder order
+
+        Every folder read is appended to ``directories``.
+        """
+        found = []
+        for folder in self.folders:
+            stack = [folder]
+            while stack:
+                if token:
+                    token.check()
+                current = stack.pop()
+                try:
+                    with os.scandir(current) as it:
+                        children = sorted(it, key=lambda e: e.name.lower())
+                except OSError:
+                    continue
+                directories.append(current)
+                subdirs = []
+                for entry in children:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(".lnk"):
+                            st = entry.stat()
+                            found.append((entry.path, st.st_mtime, st.st_size))
+                    except OSError:
+                        continue
+                stack.extend(reversed(subdirs))
+        return found
+
+    def refresh(self, token: Optional[CancelToken] = None) -> bool:
+        """Rescan the folders; returns True when the catalog changed"""
+        with self.lock:
+            directories = []
+            shortcuts = self._shortcuts(token, directories)
+            resolved = {}
+            cache_dirty = len(shortcuts) != len(self.resolved)
+            for path, mtime, size in shortcuts:
+                if token:
+                    token.check()
+                cached = self.resolved.get(path)
+                if cached is not None and cached[0] == mtime and cached[1] == size:
+                    resolved[path] = cached
+                    continue
+                try:
+                    target = self.resolve(path) or ""
+                except Exception as e:
+                    debug_print(f"Start Menu resolve error for {path}: {e}")
+                    target = ""
+                resolved[path] = [mtime, size, target]
+                cache_dirty = True
+            cache_dirty = cache_dirty or resolved.keys() != self.resolved.keys()
+            self.resolved = resolved
+
+            entries = []
+            targets = set()
+            for path, mtime, size in shortcuts:
+                target = resolved[path][2]
+                # Unresolvable shortcuts (e.g. MSI advertised ones) are kept as themselves
+                dedupe = os.path.normcase(target or path)
+                if dedupe in targets:
+                    continue
+                targets.add(dedupe)
+                name = os.path.splitext(os.path.basename(path))[0]
+                entry = AppEntry(name, path, os.path.dirname(target) if target else "", path)
+                entries.append(entry)
+            changed = entries != self.entries
+            self.entries = entries
+            self.keyed = [(match_key(e.name), e) for e in entries]
+            self.directories = directories
+            if cache_dirty:
+                self._save_cache()
+            return changed
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        """(name, .lnk path) of entries whose name contains ``query``"""
+        query = match_key(query)
+        return [(e.name, e.path) for key, e in self.keyed if query in key]
@@ -0,0 +1,225 @@
+"""Special command providers for Aoi Launcher.
+
+Each command the launcher understands (calculator, generators, weather,
+currency, ...) is a provider: a callable taking the query and its lowered
+form and returning result dicts.  Fast providers run inline on the caller's
+thread; slow ones (network lookups) are dispatched from a small pool and
+their results are delivered later tagged with the generation of the query
+that asked for them, so the UI can drop answers to a query the user has
+already typed past.  A slow provider with a deadline is waited on for at
+most that long; after that its answer is dropped.  A Python thread cannot
+be killed, so a provider that hangs keeps its pool worker until it
+returns, and a call still queued when its deadline passes is cancelled.
+
+Providers declare triggers (a prefix keyword, an exact word, a character
+class or a regex guard), and a TriggerIndex picks only the providers that
+could apply to a query: a prefix trie walk bounded by the longest keyword,
+one dict lookup, and the few regex guards.  A plain query such as "chrome"
+touches no provider at all.  No Qt or Windows dependencies.
+"""
+
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+from aoi_log import debug_print
+
+ProviderFunc = Callable[[str, str], Optional[List[Dict]]]
+Deliver = Callable[[int, List[Dict]], None]
+
+
+class Trigger(NamedTuple):
+    kind: str  # 'prefix', 'exact', 'chars' or 'pattern'
+    value: Union[str, Pattern]
+
+
+def prefix(*keywords: str) -> Tuple[Trigger, ...]:
+    """Lowered query starts with one of ``keywords``"""
+    return tuple(Trigger('prefix', k.lower()) for k in keywords)
+
+
+def exact(*words: str) -> Tuple[Trigger, ...]:
+    """Lowered query is one of ``words``"""
+    return tuple(Trigger('exact', w.lower()) for w in words)
+
+
+def chars(characters: str) -> Tuple[Trigger, ...]:
+    """Query contains any of ``characters``"""
+    return tuple(Trigger('chars', c) for c in characters)
+
+
+def pattern(regex: str) -> Tuple[Trigger, ...]:
+    """``regex`` is found in the lowered query; keep these few, they run on every query"""
+    return (Trigger('pattern', re.compile(regex)),)
+
+
+class Provider(NamedTuple):
+    name: str
+    func: ProviderFunc  # (query, query_lower) -> result dicts or None
+    slow: bool = False  # runs off the caller's thread
+    deadline: float = 0.0  # seconds a slow provider is waited for before its answer is dropped
+    triggers: Tuple[Trigger, ...] = ()  # none: consulted for every query
+
+
+class TriggerIndex:
+    """Selects the providers whose triggers fire for a query, in registration order"""
+
+    _END = ''  # trie node key holding the providers whose keyword ends there
+
+    def __init__(self, providers: List[Provider]):
+        self.providers = list(providers)
+        self.trie = {}
+        self.exact = {}
+        self.chars = {}
+        self.patterns = []  # (compiled regex, provider position)
+        self.always = []
+        for position, provider in enumerate(self.providers):
+            if not provider.triggers:
+                self.always.append(position)
+            for trigger in provider.triggers:
+                if trigger.kind == 'prefix':
+                    node = self.trie
+                    for ch in trigger.value:
+                        node = node.setdefault(ch, {})
+                    node.setdefault(self._END, []).append(position)
+                elif trigger.kind == 'exact':
+                    self.exact.setdefault(trigger.value, []).append(position)
+                elif trigger.kind == 'chars':
+                    self.chars.setdefault(trigger.value, []).append(position)
+                elif trigger.kind == 'pattern':
+                    self.patterns.append((trigger.value, position))
+                else:
+                    raise ValueError(f"Unknown trigger kind: {trigger.kind}")
+        self.char_set = frozenset(self.chars)
+
+    def select(self, query: str, query_lower: str) -> List[Provider]:
+        hits = set(self.always)
+        node = self.trie
+        for ch in query_lower:
+            node = node.get(ch)
+            if node is None:
+                break
+            hits.update(node.get(self._END, ()))
+        hits.update(self.exact.get(query_lower, ()))
+        for ch in self.char_set.intersection(query):
+            hits.update(self.chars[ch])
+        for regex, position in self.patterns:
+            if position not in hits and regex.search(query_lower):
+                hits.add(position)
+        return [self.providers[position] for position in sorted(hits)]
+
+
+class CommandPipeline:
+    """Runs providers for one query at a time, latest query wins
+
+    ``run`` returns the fast providers' results immediately and hands the
+    slow providers to the pool; a waiter per slow call then calls
+    ``deliver(generation, results)`` when it finishes within its deadline
+    for a query that is still current.  ``fallback`` runs only when no
+    provider, fast or slow, had anything to show; if slow providers were
+    selected, that is decided after the last of them answers.  Only
+    providers whose triggers fire are called.
+    """
+
+    def __init__(self, providers: List[Provider], fallback: Optional[Provider] = None,
+                 max_workers: int = 4):
+        self.providers = list(providers)
+        self.index = TriggerIndex(self.providers)
+        self.fallback_index = TriggerIndex([fallback] if fallback else [])
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aoi-command")
+        # Waiters only block on futures of the pool above, so they never call a provider
+        self.waiters = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aoi-command-wait")
+        self.lock = threading.Lock()
+        self.generation = 0
+
+    def run(self, query: str, deliver: Deliver) -> List[Dict]:
+        """Fast results for ``query``; slow ones go to ``deliver`` later"""
+        query_lower = query.lower().strip()
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+        if not query_lower:
+            return []
+        results = []
+        slow = []
+        for provider in self.index.select(query, query_lower):
+            if provider.slow:
+                slow.append(provider)
+            else:
+                results.extend(self._call(provider, query, query_lower))
+        if not slow:
+            return results or self._run_fallback(query, query_lower)
+        # The fallback waits for the slow providers only when nothing fast matched
+        pending = _Pending(len(slow), answered=bool(results))
+        for provider in slow:
+            future = self.executor.submit(self._run_slow, generation, provider, query, query_lower)
+            self.waiters.submit(self._await, generation, provider, future, pending, query, query_lower,
+                                deliver)
+        return results
+
+    def is_current(self, generation: int) -> bool:
+        with self.lock:
+            return generation == self.generation
+
+    def cancel(self):
+        """Drop the answers of every slow provider still running"""
+        with self.lock:
+            self.generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.waiters.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _call(provider: Provider, query: str, query_lower: str) -> List[Dict]:
+        try:
+            return provider.func(query, query_lower) or []
+        except Exception as e:
+            # A broken command must not hide the others or the file search
+            debug_print(f"Command provider {provider.name} failed: {e}")
+            return []
+
+    def _run_fallback(self, query: str, query_lower: str) -> List[Dict]:
+        results = []
+        for provider in self.fallback_index.select(query, query_lower):
+            results.extend(self._call(provider, query, query_lower))
+        return results
+
+    def _run_slow(self, generation: int, provider: Provider, query: str, query_lower: str) -> List[Dict]:
+        # Queued behind lookups for older keystrokes; skip if already superseded
+        if not self.is_current(generation):
+            return []
+        return self._call(provider, query, query_lower)
+
+    def _await(self, generation: int, provider: Provider, future: Future, pending: '_Pending',
+               query: str, query_lower: str, deliver: Deliver):
+        """Deliver ``provider``'s answer if it comes within its deadline"""
+        try:
+            results = future.result(timeout=provider.deadline or None)
+        except TimeoutError:
+            future.cancel()
+            debug_print(f"Command provider {provider.name} missed its {provider.deadline}s deadline")
+            results = []
+        except Exception:
+            # Cancelled by shutdown
+            results = []
+        with self.lock:
+            pending.remaining -= 1
+            pending.answered = pending.answered or bool(results)
+            run_fallback = not pending.remaining and not pending.answered
+        if run_fallback and self.is_current(generation):
+            results = self._run_fallback(query, query_lower)
+        if results and self.is_current(generation):
+            deliver(generation, results)
+
+
+class _Pending:
+    """Slow providers of one query still to answer, and whether any showed something"""
+
+    __slots__ = ('remaining', 'answered')
+
+    def __init__(self, remaining: int, answered: bool):
+        self.remaining = remaining
+        self.answered = answered
@@ -0,0 +1,56 @@
+"""SQLite plumbing shared by the Aoi Launcher databases.
+
+FileIndex and IconStore both keep one WAL-mode connection per thread and a
+schema_version row in a meta table; a database written by another schema
+version has its tables dropped and recreated.  No Qt or Windows
+dependencies.
+"""
+
+import sqlite3
+import threading
+from typing import Tuple
+
+
+class SQLiteDatabase:
+    """Per-thread WAL connections to one database with a versioned schema
+
+    Subclasses set ``schema_version`` and ``tables`` (dropped when the
+    stored version differs), implement _create_tables(), and call
+    _init_schema() once their own attributes are set.  Writers hold
+    ``_write_lock`` so only one thread writes at a time.
+    """
+
+    schema_version = 0
+    tables: Tuple[str, ...] = ()
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None or int(row[0]) != self.schema_version:
+                for table in self.tables:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._create_tables(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(self.schema_version),),
+            )
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        """CREATE TABLE/INDEX IF NOT EXISTS statements, run inside _init_schema's transaction"""
+        raise NotImplementedError
@@ -0,0 +1,135 @@
+"""Persistent icon store for Aoi Launcher.
+
+Extracted icons are kept as PNG blobs in a SQLite database keyed by the
+normalized file path, small/large and the screen's device pixel ratio.
+Each row remembers the file's mtime and size when its icon was
+extracted, so an icon is only served while the file is unchanged.  A
+warm start then reads one blob per icon instead of going through the
+shell.  The caller encodes and decodes the images; this module has no Qt
+or Windows dependencies.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from aoi_db import SQLiteDatabase
+
+ICON_SCHEMA_VERSION = 2
+
+
+class IconStore(SQLiteDatabase):
+    """SQLite store of PNG icons, invalidated by file mtime and size
+
+    Each thread gets its own connection, like FileIndex.  Once there are
+    more than ``max_entries`` rows the least recently used ones are
+    pruned.  Hits are not written one by one: get() notes the time and
+    the notes go to the ``used`` column in one batch, every USED_BATCH hits
+    or when flush_used() is called.
+    """
+
+    PRUNE_EVERY = 100  # puts between prune checks
+    USED_BATCH = 64  # hits noted before their times are written
+
+    schema_version = ICON_SCHEMA_VERSION
+    tables = ("icons",)
+
+    def __init__(self, db_path: str, max_entries: int = 5000):
+        super().__init__(db_path)
+        self.max_entries = max_entries
+        self.puts = 0
+        self._used_lock = threading.Lock()
+        self._used: Dict[Tuple[str, int, float], float] = {}  # row key -> last hit time
+        self._init_schema()
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS icons (
+                path TEXT NOT NULL,
+                small INTEGER NOT NULL,
+                scale REAL NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                png BLOB NOT NULL,
+                stored REAL NOT NULL,
+                used REAL NOT NULL,
+                PRIMARY KEY (path, small, scale)
+            )
+            """
+        )
+
+    @staticmethod
+    def file_stamp(path: str) -> Optional[Tuple[str, float, int]]:
+        """(normalized path, mtime, size), or None if the file is gone"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return os.path.normcase(os.path.normpath(path)), st.st_mtime, st.st_size
+
+    def get(self, path: str, small: bool, scale: float) -> Optional[bytes]:
+        """PNG of the icon extracted from the current version of ``path``"""
+        stamp = self.file_stamp(path)
+        if stamp is None:
+            return None
+        key, mtime, size = stamp
+        row = self._conn().execute(
+            "SELECT mtime, size, png FROM icons WHERE path = ? AND small = ? AND scale = ?",
+            (key, int(small), scale),
+        ).fetchone()
+        if row is None or row[0] != mtime or row[1] != size:
+            return None
+        with self._used_lock:
+            self._used[(key, int(small), scale)] = time.time()
+            full = len(self._used) >= self.USED_BATCH
+        if full:
+            self.flush_used()
+        return row[2]
+
+    def flush_used(self):
+        """Write the hit times noted by get() since the last flush"""
+        with self._used_lock:
+            used, self._used = self._used, {}
+        if not used:
+            return
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.executemany(
+                "UPDATE icons SET used = ? WHERE path = ? AND small = ? AND scale = ?",
+                [(when, key, small, scale) for (key, small, scale), when in used.items()],
+            )
+
+    def put(self, path: str, small: bool, scale: float, png: bytes):
+        stamp = self.file_stamp(path)
+        if stamp is None or not png:
+            return
+        key, mtime, size = stamp
+        now = time.time()
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO icons (path, small, scale, mtime, size, png, stored, used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, int(small), scale, mtime, size, sqlite3.Binary(png), now, now),
+            )
+            self.puts += 1
+            prune = self.puts % self.PRUNE_EVERY == 0
+        if prune:
+            # Recent hits count before deciding what is least recently used
+            self.flush_used()
+            with self._write_lock, conn:
+                conn.execute(
+                    "DELETE FROM icons WHERE rowid NOT IN"
+                    " (SELECT rowid FROM icons ORDER BY used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self):
+        with self._used_lock:
+            self._used = {}
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.execute("DELETE FROM icons")
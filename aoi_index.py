@@ -0,0 +1,670 @@
+"""Persistent file index for Aoi Launcher.
+
+A background crawler writes launchable files found under the search roots
+into a SQLite database, and searches query that database instead of walking
+the filesystem on every keystroke.  This module has no Qt or Windows
+dependencies so it can be exercised headless.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import deque
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from aoi_db import SQLiteDatabase
+from aoi_log import debug_print
+from aoi_match import NameArena, fuzzy_pattern, match_key
+from aoi_rank import CHECK_EVERY, Ranker, TopK
+
+SCHEMA_VERSION = 4
+
+# Only executables, shortcuts and a few well known apps are worth indexing
+LAUNCHABLE_EXTENSIONS = ('.exe', '.lnk', '.msi', '.bat', '.cmd')
+LAUNCHABLE_PREFIXES = (
+    'chrome', 'firefox', 'edge', 'discord', 'steam', 'notepad',
+    'calc', 'paint', 'word', 'excel', 'powerpoint',
+)
+
+# (path, name, ext, size, mtime, dir)
+IndexEntry = Tuple[str, str, str, int, float, str]
+# (path, parent, depth, mtime) of a directory whose files are indexed
+IndexedDir = Tuple[str, str, int, float]
+
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_ENTRIES = 50000
+
+
+class SearchRoot(NamedTuple):
+    """A crawl root with its own depth limit and directory-entry budget"""
+    path: str
+    max_depth: int = DEFAULT_MAX_DEPTH
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+
+RootSpec = Union[SearchRoot, str]
+
+
+def as_search_root(root: RootSpec) -> SearchRoot:
+    return root if isinstance(root, SearchRoot) else SearchRoot(root)
+
+
+def default_search_roots(known_folders: Optional[Dict[str, str]] = None) -> List[SearchRoot]:
+    """Locations crawled into the index, in result priority order
+
+    ``known_folders`` maps "Desktop", "Downloads" and "Documents" to the
+    real folders (see aoi_shell.KnownFolderResolver), so redirected ones
+    are crawled once under their canonical path; without it the profile
+    and OneDrive spellings are both tried.
+    """
+    home = os.path.expanduser("~")
+    if known_folders:
+        user_folders = [known_folders[name] for name in ("Desktop", "Downloads", "Documents")
+                        if known_folders.get(name)]
+    else:
+        user_folders = [os.path.join(home, name) for name in ("Desktop", "Downloads", "Documents")]
+        user_folders += [os.path.join(home, "OneDrive", name) for name in ("Desktop", "Downloads", "Documents")]
+    return [SearchRoot(folder, 2, 20000) for folder in user_folders] + [
+        # Executables sit at Vendor\App\app.exe; deeper levels are runtimes and data
+        SearchRoot("C:\\Program Files", 2, 60000),
+        SearchRoot("C:\\Program Files (x86)", 2, 60000),
+        SearchRoot("C:\\Users\\Public\\Desktop", 1, 5000),
+    ]
+
+
+class Cancelled(Exception):
+    """Raised inside a crawl or search whose CancelToken was cancelled"""
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared between the UI and a worker
+
+    Workers call ``check()`` between directory entries (or registry keys), so
+    a superseded operation ends within milliseconds without being killed.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+
+def _check(token: Optional[CancelToken]):
+    if token is not None:
+        token.check()
+
+
+def is_launchable(name: str) -> bool:
+    """Whether a file name should be stored in the index"""
+    lower = name.lower()
+    return lower.endswith(LAUNCHABLE_EXTENSIONS) or lower.startswith(LAUNCHABLE_PREFIXES)
+
+
+def scan_directory(path: str, token: Optional[CancelToken] = None
+                   ) -> Tuple[List[IndexEntry], List[Tuple[str, float]], int]:
+    """List one directory
+
+    Returns launchable files, (path, mtime) of each subdirectory and the
+    number of directory entries examined.  On Windows the stat results come
+    with the directory listing, so no extra I/O is done per entry.
+    """
+    entries, subdirs = [], []
+    examined = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            _check(token)
+            examined += 1
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, entry.stat(follow_symlinks=False).st_mtime))
+                elif is_launchable(entry.name) and entry.is_file():
+                    st = entry.stat()
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    entries.append((entry.path, entry.name, ext, st.st_size, st.st_mtime, path))
+            except OSError:
+                continue
+    return entries, subdirs, examined
+
+
+def crawl_root(location: str, max_depth: int = DEFAULT_MAX_DEPTH,
+               max_entries: int = DEFAULT_MAX_ENTRIES,
+               token: Optional[CancelToken] = None) -> Tuple[List[IndexEntry], List[IndexedDir]]:
+    """Breadth-first crawl of one search root
+
+    Subdirectories below ``max_depth`` are never opened, and the crawl stops
+    reading new directories once ``max_entries`` directory entries have been
+    examined, so the shallow (most relevant) levels are always covered first.
+    """
+    entries, dirs = [], []
+    try:
+        root_mtime = os.stat(location).st_mtime
+    except OSError:
+        return entries, dirs
+
+    queue = deque([(location, "", 0, root_mtime)])
+    budget = max_entries
+    while queue and budget > 0:
+        path, parent, depth, mtime = queue.popleft()
+        try:
+            files, subdirs, examined = scan_directory(path, token)
+        except OSError:
+            continue
+        budget -= examined
+        dirs.append((path, parent, depth, mtime))
+        entries.extend(files)
+        if depth < max_depth:
+            for sub_path, sub_mtime in subdirs:
+                queue.append((sub_path, path, depth + 1, sub_mtime))
+    return entries, dirs
+
+
+# ---------------- SQLite index ----------------
+class FileIndex(SQLiteDatabase):
+    """SQLite backed index of launchable files
+
+    Each thread gets its own connection; WAL mode lets searches read while
+    the crawler is writing.
+    """
+
+    schema_version = SCHEMA_VERSION
+    tables = ("files", "dirs")
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        # Bumped on every write so in-memory views know when they are stale
+        self.version = 0
+        self.changed_at = 0.0  # time.monotonic() of the last write
+        self._init_schema()
+
+    def _changed(self):
+        self.changed_at = time.monotonic()
+        self.version += 1
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                match_key TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                dir TEXT NOT NULL,
+                root TEXT NOT NULL,
+                root_order INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS files_dir ON files(dir)")
+        conn.execute("CREATE INDEX IF NOT EXISTS files_root ON files(root)")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                parent TEXT NOT NULL,
+                root TEXT NOT NULL,
+                root_order INTEGER NOT NULL,
+                depth INTEGER NOT NULL,
+                max_depth INTEGER NOT NULL,
+                max_entries INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent)")
+        conn.execute("CREATE INDEX IF NOT EXISTS dirs_root ON dirs(root)")
+
+    def replace_root(self, root: str, root_order: int, max_depth: int, max_entries: int,
+                     entries: Iterable[IndexEntry], dirs: Iterable[IndexedDir]):
+        """Atomically swap all rows of a search root for a fresh crawl"""
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.execute("DELETE FROM files WHERE root = ?", (root,))
+            conn.execute("DELETE FROM dirs WHERE root = ?", (root,))
+            self._insert(conn, root, root_order, max_depth, max_entries, entries, dirs)
+            self._changed()
+
+    @staticmethod
+    def _insert(conn, root: str, root_order: int, max_depth: int, max_entries: int,
+                entries: Iterable[IndexEntry], dirs: Iterable[IndexedDir]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (path, name, match_key(name), ext, size, mtime, directory, root, root_order)
+                for path, name, ext, size, mtime, directory in entries
+            ],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (path, parent, root, root_order, depth, max_depth, max_entries, mtime)
+                for path, parent, depth, mtime in dirs
+            ],
+        )
+
+    @staticmethod
+    def _delete_subtree(conn, path: str) -> List[str]:
+        """Remove a directory and everything indexed below it"""
+        prefix = _escape_like(path.rstrip(os.sep) + os.sep) + "%"
+        removed = [
+            p for (p,) in conn.execute(
+                "SELECT path FROM dirs WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, prefix)
+            )
+        ]
+        conn.execute("DELETE FROM dirs WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, prefix))
+        conn.execute("DELETE FROM files WHERE dir = ? OR dir LIKE ? ESCAPE '\\'", (path, prefix))
+        return removed
+
+    def rescan_directory(self, path: str, token: Optional[CancelToken] = None
+                         ) -> Tuple[List[str], List[str]]:
+        """Re-list one indexed directory, returns (added_dirs, removed_dirs)
+
+        Only the directory itself is read again; subdirectories that appeared
+        are crawled within the root's depth limit and entry budget, and
+        vanished ones are dropped together with everything below them.
+        """
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT parent, root, root_order, depth, max_depth, max_entries FROM dirs WHERE path = ?",
+            (path,),
+        ).fetchone()
+        if row is None:
+            return [], []
+        parent, root, root_order, depth, max_depth, max_entries = row
+
+        if not os.path.isdir(path):
+            with self._write_lock, conn:
+                self._changed()
+                return [], self._delete_subtree(conn, path)
+
+        try:
+            entries, subdirs, _ = scan_directory(path, token)
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return [], []
+        dirs = [(path, parent, depth, mtime)]
+
+        added, gone = [], []
+        if depth < max_depth:
+            known = {p for (p,) in conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))}
+            current = {p for p, _ in subdirs}
+            gone = sorted(known - current)
+            for child in sorted(current - known):
+                child_entries, child_dirs = crawl_root(
+                    child, max_depth - depth - 1, max_entries, token
+                )
+                entries.extend(child_entries)
+                for child_path, child_parent, child_depth, child_mtime in child_dirs:
+                    dirs.append((child_path, child_parent or path, child_depth + depth + 1, child_mtime))
+                    added.append(child_path)
+
+        removed = []
+        with self._write_lock, conn:
+            for child in gone:
+                removed.extend(self._delete_subtree(conn, child))
+            conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+            self._insert(conn, root, root_order, max_depth, max_entries, entries, dirs)
+            self._changed()
+        return added, removed
+
+    def prune_roots(self, roots: List[str]):
+        """Drop rows belonging to roots that are no longer configured"""
+        roots = list(roots)
+        conn = self._conn()
+        placeholders = ",".join("?" * len(roots))
+        with self._write_lock, conn:
+            if roots:
+                removed = conn.execute(f"DELETE FROM files WHERE root NOT IN ({placeholders})", roots).rowcount
+                removed += conn.execute(f"DELETE FROM dirs WHERE root NOT IN ({placeholders})", roots).rowcount
+            else:
+                removed = conn.execute("DELETE FROM files").rowcount
+                removed += conn.execute("DELETE FROM dirs").rowcount
+            # Every refresh prunes; only a real removal invalidates the in-memory views
+            if removed:
+                self._changed()
+
+    def rebuild(self, roots: List[RootSpec], token: Optional[CancelToken] = None) -> int:
+        """Crawl every root and store the results, returns the entry count"""
+        roots = [as_search_root(r) for r in roots]
+        self.prune_roots(r.path for r in roots)
+        total = 0
+        for order, root in enumerate(roots):
+            entries, dirs = crawl_root(root.path, root.max_depth, root.max_entries, token)
+            self.replace_root(root.path, order, root.max_depth, root.max_entries, entries, dirs)
+            total += len(entries)
+        self.set_meta("last_crawl", str(time.time()))
+        return total
+
+    def refresh(self, roots: List[RootSpec], token: Optional[CancelToken] = None) -> int:
+        """Bring an existing index up to date without a full recrawl
+
+        Roots that were never crawled get a full crawl; for the others only
+        directories whose mtime changed since they were indexed are rescanned.
+        Returns the number of directories that were read again.
+        """
+        roots = [as_search_root(r) for r in roots]
+        self.prune_roots(r.path for r in roots)
+        conn = self._conn()
+        rescanned = 0
+        for order, root in enumerate(roots):
+            known = conn.execute(
+                "SELECT path, mtime FROM dirs WHERE root = ? AND max_depth = ? AND max_entries = ?"
+                " ORDER BY depth",
+                (root.path, root.max_depth, root.max_entries),
+            ).fetchall()
+            if not known:
+                entries, dirs = crawl_root(root.path, root.max_depth, root.max_entries, token)
+                self.replace_root(root.path, order, root.max_depth, root.max_entries, entries, dirs)
+                rescanned += len(dirs)
+                continue
+            for path, mtime in known:
+                _check(token)
+                try:
+                    changed = os.stat(path).st_mtime != mtime
+                except OSError:
+                    changed = True
+                if changed:
+                    self.rescan_directory(path, token)
+                    rescanned += 1
+        self.set_meta("last_refresh", str(time.time()))
+        return rescanned
+
+    def directories(self) -> List[str]:
+        """All indexed directories, shallowest first"""
+        return [p for (p,) in self._conn().execute("SELECT path FROM dirs ORDER BY depth, path")]
+
+    def search(self, query: str, limit: int = 25) -> List[Tuple[str, str]]:
+        """Substring search over indexed file names"""
+        return [(name, path) for _, name, path in self.candidates(query, limit)]
+
+    def candidates(self, query: str, limit: int) -> List[Tuple[str, str, str]]:
+        """(match_key, name, path) of substring matches in result order"""
+        pattern = "%" + _escape_like(match_key(query)) + "%"
+        return self._conn().execute(
+            "SELECT match_key, name, path FROM files WHERE match_key LIKE ? ESCAPE '\\' "
+            "ORDER BY root_order, path LIMIT ?",
+            (pattern, limit),
+        ).fetchall()
+
+    def fuzzy_candidates(self, query: str, limit: int) -> List[Tuple[str, str, str]]:
+        """(match_key, name, path) of names containing ``query`` as a subsequence"""
+        pattern = "%" + "%".join(_escape_like(ch) for ch in match_key(query)) + "%"
+        return self._conn().execute(
+            "SELECT match_key, name, path FROM files WHERE match_key LIKE ? ESCAPE '\\' "
+            "ORDER BY root_order, path LIMIT ?",
+            (pattern, limit),
+        ).fetchall()
+
+    def name_rows(self) -> List[Tuple[int, str, str]]:
+        """(rowid, match_key, name) of every file in result order"""
+        return self._conn().execute(
+            "SELECT rowid, match_key, name FROM files ORDER BY root_order, path"
+        ).fetchall()
+
+    def rows_by_rowid(self, rowids: List[int]) -> Dict[int, Tuple[str, str, str]]:
+        """rowid -> (match_key, name, path) for the given rows that still exist"""
+        conn = self._conn()
+        rows = {}
+        for i in range(0, len(rowids), 500):
+            chunk = rowids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for rowid, key, name, path in conn.execute(
+                "SELECT rowid, match_key, name, path FROM files WHERE rowid IN (%s)" % marks,
+                chunk,
+            ):
+                rows[rowid] = (key, name, path)
+        return rows
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        conn = self._conn()
+        with self._write_lock, conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+class CandidateSet:
+    """Full candidate set of the last query, for narrowing while typing"""
+
+    def __init__(self):
+        self.query = None
+        self.version = -1
+        self.source = None  # the arena the candidates index into, or None
+        self.items = []  # arena positions, or (match_key, name, path) rows
+        self.complete = False  # False when the set was truncated
+
+    def can_narrow(self, query: str, source, version: int) -> bool:
+        return (
+            self.complete
+            and self.query is not None
+            and self.source is source
+            and self.version == version
+            and self.query in query
+        )
+
+    def store(self, query: str, source, version: int, items: list, limit: int):
+        self.query = query
+        self.source = source
+        self.version = version
+        self.complete = len(items) <= limit
+        self.items = items[:limit]
+
+    def reset(self):
+        self.query = None
+        self.source = None
+        self.items = []
+        self.complete = False
+
+
+class IncrementalSearch:
+    """Ranked substring and fuzzy search that narrows candidates while typing
+
+    Every name containing "chrom" also contains "chro", so when a query
+    contains the previous one the full candidate set of the previous query
+    is filtered in memory instead of asking the index again.  Deleting
+    characters, changing the query otherwise, or any index write falls
+    back to a full lookup.  The same holds for subsequence matches, which
+    top up the results with fzf-style fuzzy matches ("gchr" finds
+    "Google Chrome.lnk") when there are too few substring hits.
+
+    Once an in-memory NameArena of the whole index has been built (in a
+    background thread, see ensure_arena) full lookups go through it
+    instead of a LIKE scan, and only the rows actually shown are fetched
+    from SQLite.  Apart from the arena swap this is not thread-safe; it is
+    owned by the search thread.
+
+    Any index write makes the arena stale (rowids can be reused, so it is
+    never patched) and searches fall back to the SQL path, the same LIKE
+    and subsequence queries used before the first build, until a new arena
+    is swapped in.  A rebuild reads the whole index (about 2.6 s for 200k
+    names), so it waits until no write has landed for ``arena_settle``
+    seconds: a rescan or a burst of change events costs one rebuild, not
+    one per write.
+    """
+
+    ARENA_SETTLE = 2.0  # quiet seconds before a stale arena is rebuilt
+
+    def __init__(self, file_index: FileIndex, max_candidates: int = 20000,
+                 max_fuzzy: int = 5000, arena_settle: float = ARENA_SETTLE):
+        self.file_index = file_index
+        self.max_candidates = max_candidates
+        self.max_fuzzy = max_fuzzy  # fuzzy candidates scored per query
+        self.arena_settle = arena_settle
+        self.substring = CandidateSet()
+        self.fuzzy = CandidateSet()
+        # (version, arena, rowids) swapped in as one tuple by the builder thread
+        self._arena = None
+        self._building = False
+        self._build_lock = threading.Lock()
+
+    def current_arena(self) -> Optional[Tuple[NameArena, array]]:
+        state = self._arena
+        if state is None or state[0] != self.file_index.version:
+            return None
+        return state[1], state[2]
+
+    def ensure_arena(self):
+        """Start a background arena build unless one is current or running"""
+        with self._build_lock:
+            if self._building or self.current_arena() is not None:
+                return
+            self._building = True
+        threading.Thread(target=self._build_arena, name="NameArenaBuilder", daemon=True).start()
+
+    def build_arena(self) -> bool:
+        """Build the arena now on the calling thread, e.g. to warm up before querying
+
+        Returns False when the index was written to meanwhile; the build
+        is then dropped and searches stay on the SQL path.
+        """
+        version = self.file_index.version
+        rows = self.file_index.name_rows()
+        arena = NameArena((key for _, key, _ in rows),
+                          (name for _, _, name in rows))
+        rowids = array('q', (rowid for rowid, _, _ in rows))
+        del rows
+        # Rowids can be reused after deletes, so a stale build is not kept
+        if self.file_index.version != version:
+            return False
+        self._arena = (version, arena, rowids)
+        return True
+
+    def _build_arena(self):
+        try:
+            while True:
+                # Wait out a burst of writes; the first build does not wait
+                quiet = time.monotonic() - self.file_index.changed_at
+                if self.file_index.version and quiet < self.arena_settle:
+                    time.sleep(self.arena_settle - quiet)
+                    continue
+                if self.build_arena():
+                    return
+        except Exception as e:
+            debug_print(f"Name arena build error: {e}")
+        finally:
+            with self._build_lock:
+                self._building = False
+
+    def search(self, query: str, limit: int = 25, ranker: Optional[Ranker] = None,
+               token: Optional[CancelToken] = None) -> List[Tuple[str, str, float]]:
+        """(name, path, score) of the ``limit`` best matches, best first
+
+        Every substring candidate is scored, not just the first ones found,
+        and fuzzy candidates join in when there are fewer substring hits
+        than ``limit``.  Only the winners are resolved to paths.  ``token``
+        is checked every CHECK_EVERY candidates, so a superseded short
+        query stops scoring its thousands of candidates.
+        """
+        query = match_key(query)
+        ranker = ranker or Ranker()
+        current = self.current_arena()
+        if current is None:
+            self.ensure_arena()
+            key_of, name_of = itemgetter(0), itemgetter(1)
+        else:
+            arena, rowids = current
+            key_of, name_of = arena.key, arena.name
+
+        top = TopK(limit)
+        substring = self._substring(query, current)
+        _check(token)
+        for i, item in enumerate(substring):
+            if not i % CHECK_EVERY:
+                _check(token)
+            top.push(ranker.score(query, name_of(item), text=key_of(item)), item)
+        if len(substring) < limit and len(query) >= 2:
+            fuzzy = self._fuzzy(query, current)
+            _check(token)
+            for i, item in enumerate(fuzzy):
+                if not i % CHECK_EVERY:
+                    _check(token)
+                key = key_of(item)
+                if query in key:
+                    continue  # already scored as a substring match
+                score = ranker.score(query, name_of(item), text=key)
+                if score is not None:
+                    top.push(score, item)
+
+        ranked = top.items()
+        if current is None:
+            return [(row[1], row[2], score) for score, row in ranked]
+        return self._fetch(ranked, arena, rowids)
+
+    def _substring(self, query: str, current) -> list:
+        """Substring candidates: arena positions, or SQL rows before the arena exists"""
+        version = self.file_index.version
+        cset = self.substring
+        source = current[0] if current else None
+        if cset.can_narrow(query, source, version):
+            if query != cset.query:
+                if source is None:
+                    cset.items = [c for c in cset.items if query in c[0]]
+                else:
+                    cset.items = source.filter(cset.items, query)
+                cset.query = query
+        elif source is None:
+            rows = self.file_index.candidates(query, self.max_candidates + 1)
+            cset.store(query, None, version, rows, self.max_candidates)
+        else:
+            positions = source.search(query, self.max_candidates + 1)
+            cset.store(query, source, version, positions, self.max_candidates)
+        return cset.items
+
+    def _fuzzy(self, query: str, current) -> list:
+        """Subsequence candidates, narrowed like the substring ones"""
+        version = self.file_index.version
+        cset = self.fuzzy
+        source = current[0] if current else None
+        if cset.can_narrow(query, source, version):
+            if query != cset.query:
+                if source is None:
+                    search = fuzzy_pattern(query).search
+                    cset.items = [c for c in cset.items if search(c[0])]
+                else:
+                    cset.items = source.fuzzy_filter(cset.items, query)
+                cset.query = query
+        elif source is None:
+            rows = self.file_index.fuzzy_candidates(query, self.max_fuzzy + 1)
+            cset.store(query, None, version, rows, self.max_fuzzy)
+        else:
+            positions = source.fuzzy_search(query, self.max_fuzzy + 1)
+            cset.store(query, source, version, positions, self.max_fuzzy)
+        return cset.items
+
+    def _fetch(self, ranked: List[Tuple[float, int]], arena: NameArena,
+               rowids: array) -> List[Tuple[str, str, float]]:
+        """(name, path, score) of ranked arena positions, skipping rows changed since"""
+        rows = self.file_index.rows_by_rowid([rowids[p] for _, p in ranked])
+        results = []
+        for score, position in ranked:
+            row = rows.get(rowids[position])
+            # Re-check in case a write landed after the arena was validated
+            if row is not None and row[0] == arena.key(position):
+                results.append((row[1], row[2], score))
+        return results
+
+    def reset(self):
+        self.substring.reset()
+        self.fuzzy.reset()
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
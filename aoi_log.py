@@ -0,0 +1,21 @@
+"""Debug output shared by the Aoi Launcher modules.
+
+AOI.py's Debug Mode setting switches ``DEBUG``; the headless modules log
+through the same helpers so their errors show up in the same place.
+"""
+
+DEBUG = True  # Enabled for crash analysis
+
+
+def log(*a):
+    if DEBUG:
+        print(*a)
+
+
+def debug_print(*a):
+    """Safe debug function"""
+    if DEBUG:
+        try:
+            print("[DEBUG]", *a)
+        except Exception:
+            pass
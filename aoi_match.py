@@ -0,0 +1,342 @@
+"""In-memory name matching for Aoi Launcher.
+
+Names are packed into one contiguous string instead of one Python object
+per entry, and every distinct trigram keeps a compact array of the entry
+positions containing it.  A substring query intersects the posting lists
+of its trigrams and verifies the few survivors against the packed buffer.
+
+Names and queries are compared through match_key(): casefolded, accent
+stripped and with Turkish dotted/dotless i folded together, computed once
+per name when it is indexed and once per query.
+
+Fuzzy matching follows fzf: a query matches when its characters appear in
+order, and the match is scored with bonuses for word boundaries, camelCase
+and digit transitions and consecutive runs, minus gap penalties.  No Qt or
+Windows dependencies.
+"""
+
+import re
+import unicodedata
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+SEPARATOR = "\x00"
+
+# Turkish i variants all match a plain "i": users type "indirilenler" for
+# "İndirilenler" and may or may not have a Turkish keyboard layout
+TURKISH_FOLDS = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+
+
+def match_key(text: str, turkish: bool = True) -> str:
+    """Normalized form used for matching: casefolded and accent-insensitive
+
+    "İndirilenler" -> "indirilenler", "Müzik" -> "muzik", "Straße" ->
+    "strasse".  With ``turkish`` False the dotless ı stays distinct.
+    """
+    if text.isascii():
+        return text.lower()
+    if turkish:
+        text = text.translate(TURKISH_FOLDS)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.casefold()
+
+
+# fzf's scoring constants
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = SCORE_MATCH // 2
+BONUS_NON_WORD = SCORE_MATCH // 2
+BONUS_CAMEL_123 = BONUS_BOUNDARY + SCORE_GAP_EXTENSION
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+BONUS_BOUNDARY_WHITE = BONUS_BOUNDARY + 2
+BONUS_BOUNDARY_DELIMITER = BONUS_BOUNDARY + 1
+
+# Character classes, ordered so everything above CHAR_NON_WORD is a word char
+CHAR_WHITE, CHAR_NON_WORD, CHAR_DELIMITER, CHAR_LOWER, CHAR_UPPER, CHAR_LETTER, CHAR_NUMBER = range(7)
+DELIMITERS = "/\\,:;|"
+
+
+def char_class(c: str) -> int:
+    if "a" <= c <= "z":
+        return CHAR_LOWER
+    if "A" <= c <= "Z":
+        return CHAR_UPPER
+    if "0" <= c <= "9":
+        return CHAR_NUMBER
+    if c.isspace():
+        return CHAR_WHITE
+    if c in DELIMITERS:
+        return CHAR_DELIMITER
+    if c.isalpha():
+        return CHAR_UPPER if c.isupper() else CHAR_LETTER
+    if c.isdigit():
+        return CHAR_NUMBER
+    return CHAR_NON_WORD
+
+
+def bonus_for(prev: int, cur: int) -> int:
+    if cur > CHAR_DELIMITER:
+        if prev == CHAR_WHITE:
+            return BONUS_BOUNDARY_WHITE
+        if prev == CHAR_DELIMITER:
+            return BONUS_BOUNDARY_DELIMITER
+        if prev == CHAR_NON_WORD:
+            return BONUS_BOUNDARY
+    if (prev == CHAR_LOWER and cur == CHAR_UPPER) or (prev != CHAR_NUMBER and cur == CHAR_NUMBER):
+        return BONUS_CAMEL_123
+    if cur == CHAR_NON_WORD or cur == CHAR_DELIMITER:
+        return BONUS_NON_WORD
+    if cur == CHAR_WHITE:
+        return BONUS_BOUNDARY_WHITE
+    return 0
+
+
+def fuzzy_score(query: str, name: str, text: Optional[str] = None) -> Optional[int]:
+    """fzf v1 score of ``query`` (a match key) against ``name``, or None
+
+    ``text`` is ``match_key(name)`` when the caller already has it.  The
+    first in-order occurrence of the query is found left to right and
+    then tightened right to left, so "gchr" in "Google Chrome.lnk" scores
+    the span "Google Chr", not a longer one.
+    """
+    if not query:
+        return 0
+    if text is None:
+        text = match_key(name)
+    if len(text) != len(name):
+        # Normalization changed the length; score without case information
+        name = text
+
+    # Forward pass: leftmost end of an in-order match
+    pos = -1
+    for ch in query:
+        pos = text.find(ch, pos + 1)
+        if pos == -1:
+            return None
+    end = pos + 1
+    # Backward pass: the latest start that still matches up to ``end``
+    for ch in reversed(query[:-1]):
+        pos = text.rfind(ch, 0, pos)
+    start = pos
+
+    score = 0
+    in_gap = False
+    consecutive = 0
+    first_bonus = 0
+    pidx = 0
+    qlen = len(query)
+    prev_class = char_class(name[start - 1]) if start > 0 else CHAR_WHITE
+    for idx in range(start, end):
+        cls = char_class(name[idx])
+        if pidx < qlen and text[idx] == query[pidx]:
+            score += SCORE_MATCH
+            bonus = bonus_for(prev_class, cls)
+            if consecutive == 0:
+                first_bonus = bonus
+            else:
+                if bonus >= BONUS_BOUNDARY and bonus > first_bonus:
+                    first_bonus = bonus
+                bonus = max(bonus, first_bonus, BONUS_CONSECUTIVE)
+            score += bonus * BONUS_FIRST_CHAR_MULTIPLIER if pidx == 0 else bonus
+            in_gap = False
+            consecutive += 1
+            pidx += 1
+        else:
+            score += SCORE_GAP_EXTENSION if in_gap else SCORE_GAP_START
+            in_gap = True
+            consecutive = 0
+            first_bonus = 0
+        prev_class = cls
+    return score
+
+
+def substring_score(query: str, name: str, text: Optional[str] = None) -> Optional[int]:
+    """fzf-compatible score of a contiguous match, without the per-char loop
+
+    ``text`` is ``match_key(name)`` when the caller already has it.
+    Bonuses of characters inside the run are approximated by the first
+    one, which is exact for the usual "word start" and "mid-word" cases.
+    """
+    if text is None:
+        text = match_key(name)
+    start = text.find(query)
+    if start == -1:
+        return None
+    if len(text) != len(name):
+        name = text
+    prev_class = char_class(name[start - 1]) if start > 0 else CHAR_WHITE
+    bonus = bonus_for(prev_class, char_class(name[start]))
+    return (SCORE_MATCH * len(query) + bonus * BONUS_FIRST_CHAR_MULTIPLIER
+            + (len(query) - 1) * max(bonus, BONUS_CONSECUTIVE))
+
+
+def fuzzy_pattern(query: str) -> "re.Pattern":
+    """Regex matching the query as a subsequence within one packed entry
+
+    Each gap is "anything but the separator or the next character", which
+    mirrors the greedy forward pass and leaves the engine nothing to
+    backtrack over.
+    """
+    parts = [re.escape(query[0])]
+    for ch in query[1:]:
+        ch = re.escape(ch)
+        parts.append("[^%s%s]*%s" % (SEPARATOR, ch, ch))
+    return re.compile("".join(parts))
+
+
+class NameArena:
+    """Packed name match keys with trigram posting lists
+
+    Entries are addressed by position (0..n-1) in the order they were
+    given, and every search returns positions in ascending order, so the
+    caller's ordering is preserved.
+    """
+
+    def __init__(self, keys: Iterable[str], names: Optional[Iterable[str]] = None):
+        self.buffer, self.offsets, parts = self._pack(keys)
+        # Original-case names, kept only for fuzzy scoring (camelCase bonuses)
+        self.names = self.name_offsets = None
+        if names is not None:
+            self.names, self.name_offsets, _ = self._pack(names)
+        self.postings = self._build_postings(parts)
+        # Bigrams present anywhere, so short queries that cannot match skip the scan
+        self.bigrams = {key[i:i + 2] for key in parts for i in range(len(key) - 1)}
+
+    @staticmethod
+    def _pack(keys: Iterable[str]) -> Tuple[str, array, List[str]]:
+        offsets = array('I')
+        parts = []
+        pos = 0
+        for key in keys:
+            key = key.replace(SEPARATOR, "")
+            offsets.append(pos)
+            parts.append(key)
+            pos += len(key) + 1
+        offsets.append(pos)  # sentinel: end of the last entry + 1
+        return SEPARATOR.join(parts) + SEPARATOR, offsets, parts
+
+    @staticmethod
+    def _build_postings(parts: List[str]) -> dict:
+        # Plain lists while building (appends are much cheaper), arrays to keep
+        lists = {}
+        get = lists.get
+        for position, key in enumerate(parts):
+            for trigram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                plist = get(trigram)
+                if plist is None:
+                    lists[trigram] = [position]
+                else:
+                    plist.append(position)
+        return {trigram: array('I', plist) for trigram, plist in lists.items()}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def key(self, position: int) -> str:
+        return self.buffer[self.offsets[position]:self.offsets[position + 1] - 1]
+
+    def name(self, position: int) -> str:
+        """Original-case name when one was given, else the key"""
+        if self.names is None:
+            return self.key(position)
+        return self.names[self.name_offsets[position]:self.name_offsets[position + 1] - 1]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the buffer, offsets and postings"""
+        size = len(self.buffer.encode("utf-8")) + self.offsets.itemsize * len(self.offsets)
+        if self.names is not None:
+            size += len(self.names.encode("utf-8")) + self.name_offsets.itemsize * len(self.name_offsets)
+        for plist in self.postings.values():
+            size += plist.itemsize * len(plist)
+        return size
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Positions of entries containing ``query`` (already a match key)"""
+        if not query or SEPARATOR in query:
+            return []
+        if len(query) < 3:
+            if len(query) == 2 and query not in self.bigrams:
+                return []
+            return self._scan(query, limit)
+
+        trigrams = {query[i:i + 3] for i in range(len(query) - 2)}
+        lists = []
+        for trigram in trigrams:
+            plist = self.postings.get(trigram)
+            if plist is None:
+                return []
+            lists.append(plist)
+        lists.sort(key=len)
+
+        if len(query) == 3:
+            # The posting list of the only trigram is the exact answer
+            found = lists[0]
+            return list(found if limit is None else found[:limit])
+
+        candidates = lists[0]
+        if len(lists) > 1 and len(lists[1]) <= 4096 and len(candidates) > 256:
+            # Pre-intersect only while building the second set stays cheap
+            second = set(lists[1])
+            candidates = [p for p in candidates if p in second]
+
+        results = []
+        find = self.buffer.find
+        offsets = self.offsets
+        for position in candidates:
+            if find(query, offsets[position], offsets[position + 1] - 1) != -1:
+                results.append(position)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def _scan(self, query: str, limit: Optional[int]) -> List[int]:
+        """Linear find() over the packed buffer for queries shorter than a trigram"""
+        results = []
+        find = self.buffer.find
+        offsets = self.offsets
+        pos = find(query)
+        while pos != -1:
+            position = bisect_right(offsets, pos) - 1
+            results.append(position)
+            if limit is not None and len(results) >= limit:
+                break
+            # Continue after this entry so it is reported once
+            pos = find(query, offsets[position + 1])
+        return results
+
+    def filter(self, positions: Sequence[int], query: str) -> List[int]:
+        """Keep the positions whose entry contains ``query``"""
+        find = self.buffer.find
+        offsets = self.offsets
+        return [p for p in positions if find(query, offsets[p], offsets[p + 1] - 1) != -1]
+
+    def fuzzy_search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Positions of entries containing ``query`` as a subsequence
+
+        The regex runs over the whole packed buffer in C and cannot cross
+        an entry separator, so only real subsequence matches reach Python.
+        """
+        if not query or SEPARATOR in query:
+            return []
+        results = []
+        search = fuzzy_pattern(query).search
+        offsets = self.offsets
+        match = search(self.buffer)
+        while match is not None:
+            position = bisect_right(offsets, match.start()) - 1
+            results.append(position)
+            if limit is not None and len(results) >= limit:
+                break
+            match = search(self.buffer, offsets[position + 1])
+        return results
+
+    def fuzzy_filter(self, positions: Sequence[int], query: str) -> List[int]:
+        """Keep the positions whose entry contains ``query`` as a subsequence"""
+        search = fuzzy_pattern(query).search
+        buffer = self.buffer
+        offsets = self.offsets
+        return [p for p in positions if search(buffer, offsets[p], offsets[p + 1] - 1)]
@@ -0,0 +1,303 @@
+"""Cached network lookups for Aoi Launcher.
+
+Weather and currency commands call web APIs.  ResponseCache keeps their
+decoded JSON responses keyed by the normalized request with a TTL
+per kind of lookup.  Expired entries are still served immediately while a
+background refresh fetches a new copy, and failures are remembered for a
+short while so an offline machine does not retry on every keystroke.  The
+cache persists to a JSON file so answers survive restarts.  Currency
+conversion needs one rate table (RateTable): every pair is computed from
+it through cross-rates, without a request per query.  CryptoPrices keeps
+the prices of every coin asked about recently in one cache entry and
+refreshes them all with one batched request.  No Qt or Windows dependencies.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from aoi_log import debug_print
+
+DEFAULT_TTLS = {
+    'weather': 10 * 60,
+    'currency': 60 * 60,
+    'crypto': 30,
+}
+NEGATIVE_TTL = 60  # seconds a failed lookup is not retried
+MAX_STALE = 7 * 24 * 60 * 60  # expired entries older than this are refetched before answering
+
+
+class FetchError(Exception):
+    """A lookup failed now or within the last NEGATIVE_TTL seconds"""
+
+
+class Cached(NamedTuple):
+    value: Any
+    fetched: float  # clock() time the value was fetched
+    stale: bool  # older than the TTL of its kind; served while a refresh runs
+
+    def fetched_label(self) -> str:
+        return datetime.fromtimestamp(self.fetched).strftime("%Y-%m-%d %H:%M")
+
+
+class ResponseCache:
+    """TTL cache of fetched responses with stale-while-revalidate
+
+    ``get(kind, key, fetch)`` returns the cached value for ``key`` if it is
+    younger than the TTL of ``kind``.  An older value (up to ``max_stale``)
+    is returned as is and ``fetch`` runs on a background thread to replace
+    it; ``lookup`` returns the same value as a Cached, which says whether
+    it is such a stale one and when it was fetched.  Without a usable value ``fetch`` runs on the caller's thread, or
+    not at all with ``wait=False``, which returns None instead.  A failing
+    ``fetch`` raises FetchError, and so does every ``get`` of that key for
+    ``negative_ttl`` seconds afterwards without calling it again.  Values
+    must be JSON serializable when ``path`` is given.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 negative_ttl: float = NEGATIVE_TTL, max_stale: float = MAX_STALE,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.negative_ttl = negative_ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self.lock = threading.Lock()
+        # "kind:key" -> {"value", "time", "error", "error_time"}
+        self.entries = self._load()
+        self.refreshing = set()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aoi-refresh")
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.path:
+            return
+        with self.lock:
+            data = json.dumps(self.entries)
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            debug_print(f"Response cache save error: {e}")
+
+    @staticmethod
+    def cache_key(kind: str, key: str) -> str:
+        return f"{kind}:{' '.join(key.lower().split())}"
+
+    def get(self, kind: str, key: str, fetch: Callable[[], Any], wait: bool = True,
+            max_stale: Optional[float] = None) -> Any:
+        """Cached or fetched value; ``max_stale`` overrides the cache-wide limit"""
+        cached = self.lookup(kind, key, fetch, wait, max_stale)
+        return cached.value if cached is not None else None
+
+    def lookup(self, kind: str, key: str, fetch: Callable[[], Any], wait: bool = True,
+               max_stale: Optional[float] = None) -> Optional[Cached]:
+        """Like get(), with the value's fetch time and staleness"""
+        ck = self.cache_key(kind, key)
+        now = self.clock()
+        with self.lock:
+            entry = dict(self.entries.get(ck) or {})
+        retry_blocked = self._retry_blocked(entry, now)
+        if entry.get("time") is not None:
+            age = now - entry["time"]
+            if age < self.ttls.get(kind, 0):
+                return Cached(entry["value"], entry["time"], False)
+            if age < (self.max_stale if max_stale is None else max_stale):
+                if not retry_blocked:
+                    self._refresh_later(ck, fetch)
+                return Cached(entry["value"], entry["time"], True)
+        if retry_blocked:
+            raise FetchError(entry["error"])
+        if not wait:
+            return None
+        return self._fetch(ck, fetch)
+
+    def refresh(self, kind: str, key: str, fetch: Callable[[], Any]) -> Cached:
+        """Fetch now on the caller's thread, whatever is cached
+
+        Still raises FetchError without calling ``fetch`` while a failure
+        of this key is remembered.
+        """
+        ck = self.cache_key(kind, key)
+        with self.lock:
+            entry = dict(self.entries.get(ck) or {})
+        if self._retry_blocked(entry, self.clock()):
+            raise FetchError(entry["error"])
+        return self._fetch(ck, fetch)
+
+    def _retry_blocked(self, entry: dict, now: float) -> bool:
+        return entry.get("error") is not None and now - entry.get("error_time", 0) < self.negative_ttl
+
+    def _fetch(self, ck: str, fetch: Callable[[], Any]) -> Cached:
+        try:
+            value = fetch()
+        except Exception as e:
+            with self.lock:
+                # A failed refresh keeps the old value; it is still better than nothing
+                entry = self.entries.setdefault(ck, {"value": None, "time": None})
+                entry["error"] = str(e) or type(e).__name__
+                entry["error_time"] = self.clock()
+            self._save()
+            raise FetchError(str(e) or type(e).__name__) from e
+        fetched = self.clock()
+        with self.lock:
+            self.entries[ck] = {"value": value, "time": fetched, "error": None}
+        self._save()
+        return Cached(value, fetched, False)
+
+    def _refresh_later(self, ck: str, fetch: Callable[[], Any]):
+        with self.lock:
+            if ck in self.refreshing:
+                return
+            self.refreshing.add(ck)
+
+        def refresh():
+            try:
+                self._fetch(ck, fetch)
+            except FetchError:
+                pass
+            finally:
+                with self.lock:
+                    self.refreshing.discard(ck)
+
+        self.executor.submit(refresh)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+        self._save()
+
+
+class RateTable:
+    """Exchange rates against one base currency, as served by exchangerate-api
+
+    Any pair converts through the base (cross-rates), so a single table
+    answers every conversion offline.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.base = data["base"].upper()
+        self.rates = data["rates"]  # currency -> units per one base unit
+        self.updated = data.get("time_last_updated")  # unix time of the rates
+
+    def __contains__(self, currency: str) -> bool:
+        currency = currency.upper()
+        return currency == self.base or currency in self.rates
+
+    def _rate(self, currency: str) -> float:
+        return 1.0 if currency == self.base else self.rates[currency]
+
+    def convert(self, amount: float, from_curr: str, to_curr: str) -> float:
+        """``amount`` of ``from_curr`` in ``to_curr``; KeyError for unknown currencies"""
+        return amount * self._rate(to_curr.upper()) / self._rate(from_curr.upper())
+
+    def updated_label(self) -> Optional[str]:
+        if not self.updated:
+            return None
+        return datetime.fromtimestamp(self.updated).strftime("%Y-%m-%d %H:%M")
+
+
+# Ticker -> CoinGecko coin id; anything else is tried as a coin id itself
+CRYPTO_IDS = {
+    'btc': 'bitcoin',
+    'eth': 'ethereum',
+    'usdt': 'tether',
+    'bnb': 'binancecoin',
+    'sol': 'solana',
+    'xrp': 'ripple',
+    'usdc': 'usd-coin',
+    'ada': 'cardano',
+    'doge': 'dogecoin',
+    'trx': 'tron',
+    'ton': 'the-open-network',
+    'dot': 'polkadot',
+    'matic': 'matic-network',
+    'ltc': 'litecoin',
+    'bch': 'bitcoin-cash',
+    'link': 'chainlink',
+    'avax': 'avalanche-2',
+    'xlm': 'stellar',
+    'atom': 'cosmos',
+    'xmr': 'monero',
+    'shib': 'shiba-inu',
+}
+CRYPTO_MAX_STALE = 60 * 60  # older prices are refetched before answering
+
+
+class CryptoPrices:
+    """USD prices of the coins users ask about, fetched in one batch
+
+    ``fetch(ids)`` returns CoinGecko's ``simple/price`` answer for a list
+    of coin ids.  The prices of every recently asked coin (up to
+    ``max_coins``) are one ResponseCache entry of kind 'crypto', so they
+    persist like other responses.  An expired answer is served (marked
+    stale) while a background refresh fetches all of them again in one
+    request.  A coin missing from the cached answer is fetched, together
+    with the others, before answering.  Coins CoinGecko does not know are
+    stored as None, so they are not asked about again until the next
+    refresh.  Network requests never run under ``lock``.
+    """
+
+    CACHE_KEY = 'simple/price'
+
+    def __init__(self, fetch: Callable[[List[str]], Dict[str, Dict[str, float]]],
+                 cache: ResponseCache, max_coins: int = 50, max_stale: float = CRYPTO_MAX_STALE):
+        self.fetch = fetch
+        self.cache = cache
+        self.max_coins = max_coins
+        self.max_stale = max_stale
+        self.lock = threading.Lock()  # guards ``wanted``
+        self.wanted = OrderedDict()  # coin ids asked about, most recent last
+
+    @staticmethod
+    def coin_id(symbol: str) -> str:
+        symbol = symbol.strip().lower()
+        return CRYPTO_IDS.get(symbol, symbol)
+
+    def _want(self, coin: str):
+        with self.lock:
+            self.wanted[coin] = True
+            self.wanted.move_to_end(coin)
+            while len(self.wanted) > self.max_coins:
+                self.wanted.popitem(last=False)
+
+    def _fetch_wanted(self) -> Dict[str, Optional[float]]:
+        with self.lock:
+            coins = list(self.wanted)
+        answer = self.fetch(coins)
+        return {coin: (answer.get(coin) or {}).get('usd') for coin in coins}
+
+    def quote(self, symbol: str) -> Cached:
+        """USD price of ``symbol`` (None if CoinGecko does not know it) as a Cached
+
+        Raises FetchError when it cannot be fetched and no price is cached.
+        """
+        coin = self.coin_id(symbol)
+        self._want(coin)
+        cached = self.cache.lookup('crypto', self.CACHE_KEY, self._fetch_wanted,
+                                   max_stale=self.max_stale)
+        with self.lock:
+            # After a restart, keep refreshing the coins of the persisted answer
+            for known in cached.value:
+                if known not in self.wanted and len(self.wanted) < self.max_coins:
+                    self.wanted[known] = True
+                    self.wanted.move_to_end(known, last=False)
+        if coin not in cached.value:
+            cached = self.cache.refresh('crypto', self.CACHE_KEY, self._fetch_wanted)
+        return Cached(cached.value.get(coin), cached.fetched, cached.stale)
@@ -0,0 +1,162 @@
+"""Result ranking for Aoi Launcher.
+
+Every candidate gets one score made of match quality (fzf points from
+aoi_match), frecency from the SmartSuggestions usage data, a file type
+weight and a source weight.  The best ``k`` are kept in a bounded heap, so
+which results survive depends on relevance only, not on the order the
+sources or directories produced them.  No Qt or Windows dependencies.
+"""
+
+import heapq
+import math
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from aoi_match import fuzzy_score, match_key, substring_score
+
+if TYPE_CHECKING:
+    from aoi_index import CancelToken  # aoi_index imports this module
+
+# Launchable types, most useful first
+EXTENSION_WEIGHTS = {
+    '.lnk': 6,
+    '.exe': 4,
+    '.bat': 0,
+    '.cmd': 0,
+    '.msi': -6,
+}
+SOURCE_WEIGHTS = {
+    'startmenu': 6,  # what the user sees in the Start Menu
+    'registry': 4,  # App Paths entries are installed applications
+    'index': 0,
+}
+EXACT_NAME_BONUS = 32  # "word" -> Word.lnk before WordPad.lnk
+FRECENCY_WEIGHT = 10
+FRECENCY_HALF_LIFE_DAYS = 14
+LENGTH_PENALTY = 0.1  # shorter names win otherwise equal matches
+CHECK_EVERY = 256  # candidates scored between cancellation checks
+
+
+class Ranker:
+    """Scores (query, name) pairs; build one per search from a usage snapshot
+
+    ``apps`` is SmartSuggestions' ``usage_data["apps"]``: launched file
+    names mapped to {"count": int, "last_used": ISO timestamp, "path":
+    launched path}.  The dict is read once here, so the search thread never
+    touches the live one.
+
+    Frecency is keyed by the launched path, so a Start Menu shortcut or a
+    registry entry is boosted by its own launches whatever name it is shown
+    under.  Results scored without a path (index names before their rows
+    are fetched) fall back to the launched file's name and its stem.
+    Records written before paths were kept only have their name.
+    """
+
+    def __init__(self, apps: Optional[Dict[str, Dict[str, Any]]] = None,
+                 now: Optional[datetime] = None):
+        now = now or datetime.now()
+        self.frecency = {}  # match key of the launched file name (and its stem)
+        self.frecency_by_path = {}  # path_key of the launched path
+        for name, data in (apps or {}).items():
+            try:
+                value = self.frecency_of(int(data.get("count", 0)), data.get("last_used"), now)
+            except (TypeError, ValueError, AttributeError):
+                continue
+            path = data.get("path")
+            if isinstance(path, str) and path:
+                key = self.path_key(path)
+                self.frecency_by_path[key] = max(self.frecency_by_path.get(key, 0.0), value)
+                name = os.path.basename(path)
+            key = match_key(name)
+            stem = os.path.splitext(key)[0]
+            for k in (key, stem):
+                self.frecency[k] = max(self.frecency.get(k, 0.0), value)
+
+    @staticmethod
+    def path_key(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path))
+
+    @staticmethod
+    def frecency_of(count: int, last_used: Optional[str], now: datetime) -> float:
+        """Launch count on a log scale, halved every FRECENCY_HALF_LIFE_DAYS"""
+        if count <= 0:
+            return 0.0
+        decay = 0.5
+        if last_used:
+            age_days = max(0.0, (now - datetime.fromisoformat(last_used)).total_seconds() / 86400)
+            decay = 0.5 ** (age_days / FRECENCY_HALF_LIFE_DAYS)
+        # Old favourites keep half their weight instead of fading out entirely
+        return FRECENCY_WEIGHT * math.log2(1 + count) * (0.5 + 0.5 * decay)
+
+    def score(self, query: str, name: str, source: str = 'index',
+              text: Optional[str] = None, path: Optional[str] = None) -> Optional[float]:
+        """Total score of ``name`` for the ``query`` match key, or None if it does not match
+
+        ``text`` is ``match_key(name)`` when the caller already has it;
+        ``path`` is what launching the result opens.
+        """
+        if text is None:
+            text = match_key(name)
+        quality = substring_score(query, name, text)
+        if quality is None:
+            quality = fuzzy_score(query, name, text)
+            if quality is None:
+                return None
+        dot = text.rfind('.')
+        stem, ext = (text[:dot], text[dot:]) if dot > 0 else (text, '')
+        score = quality + EXTENSION_WEIGHTS.get(ext, 0) + SOURCE_WEIGHTS.get(source, 0)
+        if stem == query:
+            score += EXACT_NAME_BONUS
+        if self.frecency:
+            frecency = None
+            if path:
+                frecency = self.frecency_by_path.get(self.path_key(path))
+            if frecency is None:
+                frecency = self.frecency.get(text)
+            if frecency is None:
+                frecency = self.frecency.get(stem, 0.0)
+            score += frecency
+        return score - LENGTH_PENALTY * len(name)
+
+
+class TopK:
+    """Bounded min-heap keeping the ``k`` highest scored items
+
+    Ties go to the item pushed first, so a source's own order still breaks
+    them.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(0, k)
+        self.heap = []  # (score, -sequence, item)
+        self.sequence = 0
+
+    def push(self, score: float, item: Any):
+        self.sequence += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (score, -self.sequence, item))
+        elif self.heap and score > self.heap[0][0]:
+            # Strictly greater: on a tie the earlier item already in the heap stays
+            heapq.heapreplace(self.heap, (score, -self.sequence, item))
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """(score, item), best first"""
+        return [(score, item) for score, _, item in sorted(self.heap, key=lambda e: e[:2], reverse=True)]
+
+
+def rank(query: str, results: List[Tuple[str, str]], k: int, ranker: Ranker,
+         source: str, token: Optional["CancelToken"] = None) -> List[Tuple[str, str, float]]:
+    """(name, path, score) of the ``k`` best (name, path) results of one source"""
+    query = match_key(query)
+    top = TopK(k)
+    for i, (name, path) in enumerate(results):
+        if token is not None and not i % CHECK_EVERY:
+            token.check()
+        score = ranker.score(query, name, source, path=path)
+        if score is not None:
+            top.push(score, (name, path))
+    return [(name, path, score) for score, (name, path) in top.items()]
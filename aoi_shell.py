@@ -0,0 +1,444 @@
+"""Windows shell helpers for Aoi Launcher that do not need Windows.
+
+parse_lnk() reads Shell Link (.lnk) files directly from the MS-SHLLINK
+binary format instead of asking WScript.Shell over COM, and resolve_link()
+caches the result by the shortcut's (path, mtime, size).
+
+KnownFolderResolver maps localized or stale spellings of the user's known
+folders ("C:\\Kullanıcılar\\x\\Masaüstü") onto the real, possibly
+OneDrive-redirected folders with string operations only.  The localized
+spellings are the display names the shell reports on this machine.  Path handling
+uses ntpath throughout so all of this runs off Windows too.
+"""
+
+import ntpath
+import os
+import struct
+import sys
+import threading
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from aoi_log import debug_print
+from aoi_match import match_key
+
+# Code page of non-Unicode strings; "mbcs" is the active ANSI code page
+ANSI_ENCODING = "mbcs" if sys.platform == "win32" else "cp1252"
+
+HEADER_SIZE = 0x4C
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x2
+
+# ExtraData block signatures
+ENVIRONMENT_VARIABLE_BLOCK = 0xA0000001
+DARWIN_BLOCK = 0xA0000006
+ICON_ENVIRONMENT_BLOCK = 0xA0000007
+
+
+class ShellLink(NamedTuple):
+    target: str  # "" when the link has no file system target (e.g. MSI advertised)
+    arguments: str
+    working_dir: str
+    icon_location: str
+    icon_index: int
+    description: str
+
+
+class LinkFormatError(ValueError):
+    """The file is not a Shell Link"""
+
+
+def _c_string(data: bytes, offset: int, unicode: bool = False) -> str:
+    """NUL-terminated string at ``offset``"""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le", "replace")
+    end = data.find(b"\0", offset)
+    if end == -1:
+        end = len(data)
+    return data[offset:end].decode(ANSI_ENCODING, "replace")
+
+
+def _link_info_path(data: bytes, start: int) -> str:
+    """Target path stored in a LinkInfo structure"""
+    header_size, flags, volume_offset, base_offset, network_offset, suffix_offset = \
+        struct.unpack_from("<6I", data, start + 4)
+    unicode = header_size >= 0x24
+    if unicode:
+        base_offset_u, suffix_offset_u = struct.unpack_from("<2I", data, start + 28)
+    suffix = (_c_string(data, start + suffix_offset_u, True) if unicode and suffix_offset_u
+              else _c_string(data, start + suffix_offset))
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        base = (_c_string(data, start + base_offset_u, True) if unicode and base_offset_u
+                else _c_string(data, start + base_offset))
+        return base + suffix
+    if flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX:
+        net = start + network_offset
+        net_name_offset, = struct.unpack_from("<I", data, net + 8)
+        if net_name_offset > 0x14:
+            net_name_offset_u, = struct.unpack_from("<I", data, net + 20)
+            net_name = _c_string(data, net + net_name_offset_u, True)
+        else:
+            net_name = _c_string(data, net + net_name_offset)
+        return net_name + "\\" + suffix if suffix else net_name
+    return ""
+
+
+def _id_list_path(data: bytes, start: int, end: int) -> str:
+    """Best-effort file system path from a LinkTargetIDList
+
+    Understands drive items ("C:\\") and file entry items, which is what
+    shortcuts to local files contain; anything else (control panel items,
+    shell namespaces) yields "".
+    """
+    parts = []
+    pos = start
+    while pos + 2 <= end:
+        size, = struct.unpack_from("<H", data, pos)
+        if size == 0:
+            break
+        item = data[pos:pos + size]
+        pos += size
+        if len(item) < 3:
+            continue
+        kind = item[2] & 0x70
+        if kind == 0x20 and len(item) > 3:
+            # Volume item: "C:\" as ANSI
+            parts = [_c_string(item, 3).rstrip("\\")]
+        elif kind == 0x30 and len(item) > 14:
+            # File entry: short name, then an extension block with the long name
+            short_name = _c_string(item, 14)
+            name_end = 14 + len(short_name.encode(ANSI_ENCODING, "replace")) + 1
+            if item[2] & 0x04:  # Unicode short name
+                short_name = _c_string(item, 14, True)
+                name_end = 14 + 2 * len(short_name) + 2
+            name_end += name_end % 2
+            parts.append(_long_name(item, name_end) or short_name)
+        elif kind != 0x10:
+            return ""
+    if not parts or not parts[0].endswith(":"):
+        return ""
+    return "\\".join(parts) if len(parts) > 1 else parts[0] + "\\"
+
+
+def _long_name(item: bytes, offset: int) -> str:
+    """Long name from a 0xBEEF0004 extension block, or ''"""
+    if offset + 8 > len(item):
+        return ""
+    _, version, signature = struct.unpack_from("<HHI", item, offset)
+    if signature != 0xBEEF0004:
+        return ""
+    name_offset = offset + 18
+    if version >= 7:
+        name_offset += 18
+    if version >= 3:
+        name_offset += 2
+    if version >= 9:
+        name_offset += 4
+    if version >= 8:
+        name_offset += 4
+    if name_offset >= len(item):
+        return ""
+    return _c_string(item, name_offset, True)
+
+
+def _expand(path: str) -> str:
+    # ntpath so %VAR% expands the same way off Windows
+    return ntpath.expandvars(path) if "%" in path else path
+
+
+def parse_lnk_bytes(data: bytes, link_path: str = "") -> ShellLink:
+    """Parse a Shell Link from its bytes; ``link_path`` resolves relative targets"""
+    try:
+        return _parse(data, link_path)
+    except struct.error as e:
+        raise LinkFormatError(f"truncated shell link: {e}") from None
+
+
+def _parse(data: bytes, link_path: str) -> ShellLink:
+    if len(data) < HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != HEADER_SIZE \
+            or data[4:20] != LINK_CLSID:
+        raise LinkFormatError("not a shell link")
+    flags, = struct.unpack_from("<I", data, 20)
+    icon_index, = struct.unpack_from("<i", data, 56)
+    pos = HEADER_SIZE
+
+    id_list_path = ""
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        id_list_size, = struct.unpack_from("<H", data, pos)
+        id_list_path = _id_list_path(data, pos + 2, pos + 2 + id_list_size)
+        pos += 2 + id_list_size
+
+    link_info_path = ""
+    if flags & HAS_LINK_INFO:
+        link_info_size, = struct.unpack_from("<I", data, pos)
+        link_info_path = _link_info_path(data, pos)
+        pos += link_info_size
+
+    strings = {}
+    unicode = bool(flags & IS_UNICODE)
+    for flag in (HAS_NAME, HAS_RELATIVE_PATH, HAS_WORKING_DIR, HAS_ARGUMENTS, HAS_ICON_LOCATION):
+        if not flags & flag:
+            continue
+        count, = struct.unpack_from("<H", data, pos)
+        pos += 2
+        if unicode:
+            strings[flag] = data[pos:pos + 2 * count].decode("utf-16-le", "replace")
+            pos += 2 * count
+        else:
+            strings[flag] = data[pos:pos + count].decode(ANSI_ENCODING, "replace")
+            pos += count
+
+    env_target = icon_env = ""
+    darwin = False
+    while pos + 8 <= len(data):
+        block_size, signature = struct.unpack_from("<II", data, pos)
+        if block_size < 8:
+            break
+        if signature in (ENVIRONMENT_VARIABLE_BLOCK, ICON_ENVIRONMENT_BLOCK) and block_size >= 0x314:
+            value = _c_string(data, pos + 8 + 260, True) or _c_string(data, pos + 8)
+            if signature == ENVIRONMENT_VARIABLE_BLOCK:
+                env_target = value
+            else:
+                icon_env = value
+        elif signature == DARWIN_BLOCK:
+            darwin = True
+        pos += block_size
+
+    target = link_info_path or _expand(env_target) or id_list_path
+    relative = strings.get(HAS_RELATIVE_PATH, "")
+    if not target and relative and link_path and not darwin:
+        target = ntpath.normpath(ntpath.join(ntpath.dirname(link_path), relative))
+    icon_location = _expand(icon_env or strings.get(HAS_ICON_LOCATION, ""))
+    return ShellLink(
+        target=target,
+        arguments=strings.get(HAS_ARGUMENTS, ""),
+        working_dir=_expand(strings.get(HAS_WORKING_DIR, "")),
+        icon_location=icon_location,
+        icon_index=icon_index,
+        description=strings.get(HAS_NAME, ""),
+    )
+
+
+def parse_lnk(path: str) -> ShellLink:
+    with open(path, "rb") as f:
+        return parse_lnk_bytes(f.read(), path)
+
+
+class LinkCache:
+    """parse_lnk results keyed by path, valid while (mtime, size) match"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Tuple[Tuple[float, int], ShellLink]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, path: str) -> ShellLink:
+        """Parsed link, re-read only when the file changed; raises OSError/LinkFormatError"""
+        st = os.stat(path)
+        stamp = (st.st_mtime, st.st_size)
+        key = os.path.normcase(os.path.abspath(path))
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        link = parse_lnk(path)
+        with self.lock:
+            self.entries[key] = (stamp, link)
+        return link
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_LINK_CACHE = LinkCache()
+
+
+def resolve_link(path: str) -> ShellLink:
+    """Cached parse_lnk; see LinkCache.resolve"""
+    return _LINK_CACHE.resolve(path)
+
+
+def resolve_shortcut(path: str, shell_resolve: Callable[[str], Optional[ShellLink]],
+                     cache: Optional[LinkCache] = None) -> Optional[ShellLink]:
+    """Parsed link, or ``shell_resolve(path)`` for a file the parser cannot read
+
+    ``shell_resolve`` asks the shell (WScript.Shell over COM), which copes
+    with whatever the parser rejects: truncated or corrupt files, or
+    structures it does not know.
+    """
+    try:
+        return (cache or _LINK_CACHE).resolve(path)
+    except (OSError, LinkFormatError) as e:
+        debug_print(f"resolve_lnk parse error: {e}")
+    return shell_resolve(path)
+
+
+# KNOWNFOLDERID values for SHGetKnownFolderPath
+KNOWN_FOLDER_IDS = {
+    "Desktop": "{B4BFCC3A-DB2C-424C-B029-7FE99A87C641}",
+    "Documents": "{FDD39AD0-238F-46AF-ADB4-6C85480369C7}",
+    "Downloads": "{374DE290-123F-4565-9164-39C4925E467B}",
+    "Pictures": "{33E28130-4E1E-4676-835A-98395C3BC3BB}",
+    "Music": "{4BD8D571-6D19-48D3-BE97-422220080E43}",
+    "Videos": "{18989B1D-99B5-455E-841C-AB7C74E4DDFC}",
+}
+
+
+def _key(path: str) -> str:
+    """Comparison key of a path: normalized, casefolded with Turkish i folds like match_key"""
+    return match_key(ntpath.normpath(path)).rstrip("\\")
+
+
+class KnownFolderResolver:
+    """Rewrites known-folder paths to the folders that really exist
+
+    ``folders`` maps canonical names ("Desktop") to the actual folder,
+    which may live under OneDrive.  ``aliases`` adds other spellings of a
+    folder and ``users_aliases`` of the profiles root; from_system() takes
+    them from the shell's display names.  A spelling under the profile or
+    under OneDrive is mapped to the actual folder only when that folder
+    exists and the spelling does not name a real directory of its own, so
+    a folder the user created is never rewritten.  That is decided once,
+    here; canonicalize() is then a prefix lookup with no disk access.
+    """
+
+    def __init__(self, home: str, folders: Dict[str, str], onedrive: Optional[str] = None,
+                 aliases: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 users_aliases: Iterable[str] = (),
+                 is_dir: Callable[[str], bool] = os.path.isdir):
+        aliases = aliases or {}
+        self.home = ntpath.normpath(home)
+        self.folders = {name: ntpath.normpath(path) for name, path in folders.items()}
+        bases = [self.home]
+        for base in (onedrive, ntpath.join(self.home, "OneDrive")):
+            if base and _key(base) not in {_key(b) for b in bases}:
+                bases.append(ntpath.normpath(base))
+        self.prefixes = {}  # normalised spelling -> actual folder
+        for name, actual in self.folders.items():
+            if not is_dir(actual):
+                continue
+            for spelling in (name,) + tuple(aliases.get(name, ())):
+                for base in bases:
+                    path = ntpath.join(base, spelling)
+                    if _key(path) != _key(actual) and not is_dir(path):
+                        self.prefixes.setdefault(_key(path), actual)
+        # "C:\\Kullanıcılar\\x" -> "C:\\Users\\x": the shell's spelling of the profiles root
+        users_root = ntpath.dirname(self.home)
+        drive = ntpath.splitdrive(users_root)[0]
+        self.users_root = users_root
+        self.users_keys = set()  # keys of "drive\\alias" spellings of the profiles root
+        if is_dir(users_root):
+            for alias in users_aliases:
+                spelling = drive + "\\" + alias
+                if _key(spelling) != _key(users_root) and not is_dir(spelling):
+                    self.users_keys.add(_key(spelling))
+
+    @classmethod
+    def from_system(cls) -> "KnownFolderResolver":
+        """Resolver for the current user, asking Windows for redirected folders"""
+        home = os.path.expanduser("~")
+        folders = {}
+        aliases = {}
+        for name in KNOWN_FOLDER_IDS:
+            folders[name] = known_folder_path(name) or ntpath.join(home, name)
+            display = shell_display_name(folders[name])
+            if display:
+                aliases[name] = (display,)
+        users_display = shell_display_name(ntpath.dirname(home))
+        return cls(home, folders, os.environ.get("OneDrive"), aliases,
+                   (users_display,) if users_display else ())
+
+    def folder(self, name: str) -> Optional[str]:
+        return self.folders.get(name)
+
+    def canonicalize(self, path: str) -> str:
+        """``path`` with a localized profiles root or known folder replaced by the real one"""
+        if not path:
+            return path
+        path = ntpath.normpath(path)
+        # Whole components are compared: folding "İ" or "ß" changes the length
+        drive, rest = ntpath.splitdrive(path)
+        top, sep, rest = rest.lstrip("\\").partition("\\")
+        if self.users_keys and _key(drive + "\\" + top) in self.users_keys:
+            path = self.users_root + sep + rest
+        # Longest matching prefix wins (OneDrive\\Desktop before Desktop)
+        head = path
+        while True:
+            actual = self.prefixes.get(_key(head))
+            if actual is not None:
+                return actual + path[len(head):]
+            parent = ntpath.dirname(head)
+            if parent == head:
+                return path
+            head = parent
+
+
+def known_folder_path(name: str) -> Optional[str]:
+    """Actual path of a known folder via SHGetKnownFolderPath, None off Windows"""
+    if sys.platform != "win32" or name not in KNOWN_FOLDER_IDS:
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class GUID(ctypes.Structure):
+            _fields_ = [("Data1", wintypes.DWORD), ("Data2", wintypes.WORD),
+                        ("Data3", wintypes.WORD), ("Data4", ctypes.c_ubyte * 8)]
+
+        guid = GUID()
+        ctypes.oledll.ole32.CLSIDFromString(KNOWN_FOLDER_IDS[name], ctypes.byref(guid))
+        buf = ctypes.c_wchar_p()
+        ctypes.windll.shell32.SHGetKnownFolderPath(ctypes.byref(guid), 0, None, ctypes.byref(buf))
+        try:
+            return buf.value
+        finally:
+            ctypes.windll.ole32.CoTaskMemFree(buf)
+    except Exception:
+        return None
+
+
+def shell_display_name(path: str) -> Optional[str]:
+    """Name Explorer shows for ``path`` ("Masaüstü" for Desktop), None off Windows"""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class SHFILEINFOW(ctypes.Structure):
+            _fields_ = [("hIcon", wintypes.HICON), ("iIcon", ctypes.c_int),
+                        ("dwAttributes", wintypes.DWORD),
+                        ("szDisplayName", wintypes.WCHAR * 260),
+                        ("szTypeName", wintypes.WCHAR * 80)]
+
+        SHGFI_DISPLAYNAME = 0x000000200
+        info = SHFILEINFOW()
+        if not ctypes.windll.shell32.SHGetFileInfoW(path, 0, ctypes.byref(info),
+                                                    ctypes.sizeof(info), SHGFI_DISPLAYNAME):
+            return None
+        name = info.szDisplayName
+        # Only a spelling that differs from the folder's own name is an alias
+        if not name or _key(name) == _key(ntpath.basename(ntpath.normpath(path))):
+            return None
+        return name
+    except Exception:
+        return None
@@ -0,0 +1,258 @@
+"""Synthetic filesystem benchmark for the Aoi Launcher search path.
+
+Generates Desktop-, Downloads- and Program Files-like trees under a
+temporary directory, then measures the crawl into the SQLite index, the
+in-memory name arena build, and ranked queries (typed one character at a
+time, like the launcher sees them, and cold).  Reports p50/p95/p99
+latency, throughput and peak memory.  Headless; no Qt or Windows needed.
+
+Generated names combine words from a built-in list, or from ``--words``
+(one per line) to match another name distribution.  ``--root`` indexes
+existing directories instead of generating anything, and ``--queries``
+replaces the built-in query set (one query per line), which a real tree
+usually needs.
+
+Memory is the process peak RSS after each phase rather than tracemalloc,
+which would slow the timed code down several times over.
+
+    python bench_search.py --files 200000
+    python bench_search.py --files 50000 --depth 4 --json results.json
+    python bench_search.py --words names.txt --files 100000
+    python bench_search.py --root "C:\\Program Files" --root D:\\Games --queries queries.txt
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from aoi_index import CancelToken, FileIndex, IncrementalSearch, SearchRoot
+from aoi_rank import Ranker
+
+WORDS = [
+    "google", "chrome", "setup", "install", "microsoft", "office", "word",
+    "excel", "steam", "discord", "update", "helper", "service", "launcher",
+    "player", "driver", "report", "notes", "photo", "music", "video",
+    "backup", "studio", "code", "visual", "adobe", "reader", "zoom",
+    "spotify", "telegram", "obs", "blender", "python", "node", "git",
+    # Localized names exercise match keys
+    "masaüstü", "belgeler", "müzik", "çalışma", "işlem", "ödev", "İndir",
+]
+VERSIONS = ["", "", "", " 2", " 3.1", " x64", " v2.0.1", " (1)", " - Copy"]
+
+# (root name, share of files, max depth, extension weights)
+LAYOUTS = {
+    "Desktop": (0.10, 2, {".lnk": 40, ".exe": 5, ".txt": 20, ".docx": 15, ".png": 20}),
+    "Downloads": (0.25, 3, {".exe": 25, ".msi": 10, ".zip": 30, ".pdf": 20, ".jpg": 15}),
+    "Program Files": (0.65, 5, {".exe": 10, ".dll": 60, ".json": 15, ".dat": 15}),
+}
+
+# Queries typed character by character; each prefix is one measured search
+TYPED_QUERIES = ["chrome", "discord", "visual studio", "steam", "müzik", "gchr", "setup x64", "notes"]
+COLD_QUERIES = ["c", "ex", "zoom", "offce", "blender", "update helper", "indir", "zzzz"]
+
+
+def read_lines(path: str) -> List[str]:
+    """Non-empty stripped lines of a UTF-8 text file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def random_name(rng: random.Random, ext: str, words: List[str] = WORDS) -> str:
+    words = rng.sample(words, min(len(words), rng.choice((1, 1, 2, 2, 3))))
+    name = " ".join(w.capitalize() if rng.random() < 0.5 else w for w in words)
+    return name + rng.choice(VERSIONS) + ext
+
+
+def generate_tree(base: str, files: int, depth: int, seed: int,
+                  words: List[str] = WORDS) -> Dict[str, int]:
+    """Create the synthetic roots under ``base``; returns files written per root"""
+    rng = random.Random(seed)
+    written = {}
+    for root_name, (share, root_depth, weights) in LAYOUTS.items():
+        root = os.path.join(base, root_name)
+        os.makedirs(root, exist_ok=True)
+        max_depth = min(depth, root_depth)
+        exts, ext_weights = zip(*weights.items())
+        dirs = [(root, 0)]
+        count = int(files * share)
+        for i in range(count):
+            # Mostly fill existing folders, sometimes open a new one a level deeper
+            parent, level = rng.choice(dirs)
+            if level < max_depth and rng.random() < 0.08:
+                sub = os.path.join(parent, random_name(rng, "", words).strip() + f" {i}")
+                os.makedirs(sub, exist_ok=True)
+                dirs.append((sub, level + 1))
+                parent = sub
+            ext = rng.choices(exts, ext_weights)[0]
+            path = os.path.join(parent, random_name(rng, ext, words))
+            with open(path, "wb"):
+                pass
+        written[root_name] = count
+    return written
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    total = sum(samples_ms)
+    return {
+        "count": len(samples_ms),
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+        "max_ms": max(samples_ms) if samples_ms else 0.0,
+        "queries_per_s": len(samples_ms) / (total / 1000) if total else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_queries(search: IncrementalSearch, ranker: Ranker, limit: int, rounds: int,
+                typed_queries: List[str] = TYPED_QUERIES,
+                cold_queries: List[str] = COLD_QUERIES) -> Dict[str, Dict]:
+    typed, cold = [], []
+    token = CancelToken()  # never cancelled; measures the cost of the checks
+    for _ in range(rounds):
+        for query in typed_queries:
+            search.reset()
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                search.search(query[:end], limit, ranker, token)
+                typed.append((time.perf_counter() - start) * 1000)
+        for query in cold_queries:
+            search.reset()
+            start = time.perf_counter()
+            search.search(query, limit, ranker, token)
+            cold.append((time.perf_counter() - start) * 1000)
+    return {"typed": summarize(typed), "cold": summarize(cold)}
+
+
+def run(args) -> Dict:
+    # With --root the index lives in a scratch directory and nothing is generated
+    base = args.dir if args.dir and not args.root else tempfile.mkdtemp(prefix="aoi_bench_")
+    report = {"files": args.files, "depth": args.depth, "seed": args.seed}
+    typed_queries, cold_queries = TYPED_QUERIES, COLD_QUERIES
+    if args.queries:
+        typed_queries = cold_queries = read_lines(args.queries)
+    try:
+        if args.root:
+            report["roots"] = args.root
+            report["generate_s"] = 0.0
+            root_paths = args.root
+        else:
+            words = read_lines(args.words) if args.words else WORDS
+            start = time.perf_counter()
+            report["generated"] = generate_tree(base, args.files, args.depth, args.seed, words)
+            report["generate_s"] = time.perf_counter() - start
+            root_paths = [os.path.join(base, name) for name in LAYOUTS]
+
+        index = FileIndex(os.path.join(base, "bench_index.db"))
+        roots = [SearchRoot(path, args.depth, args.budget) for path in root_paths]
+        start = time.perf_counter()
+        indexed = index.rebuild(roots)
+        crawl_s = time.perf_counter() - start
+        if args.root:
+            # Only launchable files are indexed, so that is all a real tree reports
+            report["files"] = indexed
+        report["crawl"] = {
+            "seconds": crawl_s,
+            "indexed_files": indexed,
+            "files_per_s": report["files"] / crawl_s if crawl_s else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+        search = IncrementalSearch(index)
+        ranker = Ranker()
+        # SQL path: what the launcher serves before the arena is ready
+        report["queries_sql"] = run_queries(search, ranker, args.limit, 1, typed_queries, cold_queries)
+
+        start = time.perf_counter()
+        search.build_arena()
+        arena_s = time.perf_counter() - start
+        arena = search.current_arena()
+        report["arena"] = {
+            "seconds": arena_s,
+            "entries": len(arena[0]) if arena else 0,
+            "bytes_per_entry": arena[0].nbytes() / max(1, len(arena[0])) if arena else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+        report["queries_arena"] = run_queries(search, ranker, args.limit, args.rounds,
+                                              typed_queries, cold_queries)
+        report["peak_rss_mb"] = peak_rss_mb()
+    finally:
+        if not args.keep and (args.root or not args.dir):
+            shutil.rmtree(base, ignore_errors=True)
+        else:
+            report["tree"] = base
+    return report
+
+
+def print_report(report: Dict):
+    if "roots" in report:
+        print(f"Real tree:      {', '.join(report['roots'])}, depth {report['depth']}")
+    else:
+        print(f"Synthetic tree: {report['files']} files, depth {report['depth']}, "
+              f"generated in {report['generate_s']:.1f}s")
+    crawl = report["crawl"]
+    print(f"Crawl + index:  {crawl['seconds']:.2f}s, {crawl['indexed_files']} launchable indexed, "
+          f"{crawl['files_per_s']:.0f} files/s, peak RSS {crawl['peak_rss_mb']:.1f} MB")
+    arena = report["arena"]
+    print(f"Arena build:    {arena['seconds']:.2f}s, {arena['entries']} entries, "
+          f"{arena['bytes_per_entry']:.0f} B/entry, peak RSS {arena['peak_rss_mb']:.1f} MB")
+    print(f"{'queries':<16}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'q/s':>10}")
+    for path in ("queries_sql", "queries_arena"):
+        for kind in ("typed", "cold"):
+            s = report[path][kind]
+            label = f"{path[8:]}/{kind}"
+            print(f"{label:<16}{s['count']:>6}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}"
+                  f"{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}{s['queries_per_s']:>10.0f}")
+    print(f"Peak RSS:       {report['peak_rss_mb']:.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000, help="files to generate (default 50000)")
+    parser.add_argument("--depth", type=int, default=3, help="maximum tree and crawl depth (default 3)")
+    parser.add_argument("--budget", type=int, default=1000000, help="directory entries crawled per root")
+    parser.add_argument("--limit", type=int, default=50, help="results per query (max_results)")
+    parser.add_argument("--rounds", type=int, default=3, help="repetitions of the arena query set")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dir", help="generate into this directory and keep it")
+    parser.add_argument("--words", help="word list (one per line) generated names are made of")
+    parser.add_argument("--root", action="append",
+                        help="index this existing directory instead of generating a tree (repeatable)")
+    parser.add_argument("--queries", help="queries to measure (one per line) instead of the built-in set")
+    parser.add_argument("--keep", action="store_true", help="keep the generated temporary tree")
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
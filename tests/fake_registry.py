@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional
+
+from aoi_catalog import RegistryReader
+
+
+class FakeRegistryReader(RegistryReader):
+    """In-memory registry for the RegistryCatalog tests
+
+    Keys are created with set_key(); like the real registry, creating or
+    deleting a subkey bumps the parent's last-write time.
+    """
+
+    def __init__(self):
+        self.keys = {}  # (hive, lower path) -> {"path", "values", "mtime"}
+        self.clock = 0
+
+    def _tick(self) -> int:
+        self.clock += 1
+        return self.clock
+
+    def _parent(self, hive: str, path: str):
+        parent = path.rpartition("\\")[0]
+        return self.keys.get((hive, parent.lower())) if parent else None
+
+    def set_key(self, hive: str, path: str, values: Optional[Dict[str, object]] = None):
+        key = (hive, path.lower())
+        created = key not in self.keys
+        self.keys[key] = {"path": path, "values": dict(values or {}), "mtime": self._tick()}
+        parent = self._parent(hive, path)
+        if created and parent is not None:
+            parent["mtime"] = self._tick()
+
+    def delete_key(self, hive: str, path: str):
+        prefix = path.lower() + "\\"
+        for key in [k for k in self.keys if k[0] == hive and (k[1] == path.lower() or k[1].startswith(prefix))]:
+            del self.keys[key]
+        parent = self._parent(hive, path)
+        if parent is not None:
+            parent["mtime"] = self._tick()
+
+    def _get(self, hive: str, path: str) -> dict:
+        try:
+            return self.keys[(hive, path.lower())]
+        except KeyError:
+            raise FileNotFoundError(f"{hive}\\{path}") from None
+
+    def last_write_time(self, hive: str, path: str) -> int:
+        return self._get(hive, path)["mtime"]
+
+    def subkeys(self, hive: str, path: str) -> List[str]:
+        self._get(hive, path)
+        prefix = path.lower() + "\\"
+        return [
+            entry["path"][len(prefix):]
+            for (h, p), entry in self.keys.items()
+            if h == hive and p.startswith(prefix) and "\\" not in p[len(prefix):]
+        ]
+
+    def values(self, hive: str, path: str) -> Dict[str, object]:
+        return dict(self._get(hive, path)["values"])
@@ -0,0 +1,119 @@
+"""Writes the .lnk fixtures in tests/fixtures/lnk.
+
+The files are built field by field from the MS-SHLLINK specification, so
+each one exercises a single way a shortcut can store its target.  They are
+checked in; rerun this only to change them.
+"""
+
+import os
+import struct
+
+HERE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lnk")
+
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+MY_COMPUTER_CLSID = bytes.fromhex("e04fd020ea3a6910a2d808002b30309d")
+HAS_LINK_TARGET_ID_LIST = 0x001
+HAS_LINK_INFO = 0x002
+HAS_NAME = 0x004
+HAS_RELATIVE_PATH = 0x008
+HAS_WORKING_DIR = 0x010
+HAS_ARGUMENTS = 0x020
+HAS_ICON_LOCATION = 0x040
+IS_UNICODE = 0x080
+HAS_EXP_STRING = 0x200
+
+
+def header(flags: int, icon_index: int = 0) -> bytes:
+    return (struct.pack("<I", 0x4C) + LINK_CLSID + struct.pack("<II", flags, 0x20)
+            + bytes(24) + struct.pack("<IiIHHII", 0, icon_index, 1, 0, 0, 0, 0))
+
+
+def string(value: str) -> bytes:
+    """StringData in a Unicode link: character count, then UTF-16LE"""
+    return struct.pack("<H", len(value)) + value.encode("utf-16-le")
+
+
+def link_info(base_path: str, unicode: bool = False) -> bytes:
+    volume = struct.pack("<IIII", 0x11, 3, 0x1234ABCD, 0x10) + b"\0"
+    header_size = 0x24 if unicode else 0x1C
+    volume_offset = header_size
+    base_offset = volume_offset + len(volume)
+    ansi_base = base_path.encode("cp1252", "replace") + b"\0"
+    suffix_offset = base_offset + len(ansi_base)
+    body = volume + ansi_base + b"\0"
+    fields = [header_size, 0x1, volume_offset, base_offset, 0, suffix_offset]
+    if unicode:
+        base_offset_u = header_size + len(body)
+        unicode_base = base_path.encode("utf-16-le") + b"\0\0"
+        fields += [base_offset_u, base_offset_u + len(unicode_base)]
+        body += unicode_base + b"\0\0"
+    size = 4 + 4 * len(fields) + len(body)
+    return struct.pack("<I", size) + struct.pack("<%dI" % len(fields), *fields) + body
+
+
+def environment_block(target: str) -> bytes:
+    ansi = target.encode("cp1252").ljust(260, b"\0")
+    wide = target.encode("utf-16-le").ljust(520, b"\0")
+    return struct.pack("<II", 0x314, 0xA0000001) + ansi + wide
+
+
+def id_list(*items: bytes) -> bytes:
+    """LinkTargetIDList: each ItemID carries its own size, a zero size ends it"""
+    body = b"".join(struct.pack("<H", 2 + len(item)) + item for item in items) + bytes(2)
+    return struct.pack("<H", len(body)) + body
+
+
+def root_item() -> bytes:
+    return bytes([0x1F, 0x50]) + MY_COMPUTER_CLSID
+
+
+def volume_item(drive: str) -> bytes:
+    return bytes([0x2F]) + drive.encode("ascii").ljust(22, b"\0")
+
+
+def file_entry_item(short_name: str, long_name: str = "", directory: bool = False) -> bytes:
+    """File entry shell item; ``long_name`` goes in a version 9 0xBEEF0004 block"""
+    attributes = 0x10 if directory else 0x20
+    item = bytes([0x31 if directory else 0x32, 0]) + bytes(8) + struct.pack("<H", attributes)
+    item += short_name.encode("ascii") + b"\0"
+    if len(item) % 2:
+        item += b"\0"
+    if long_name:
+        name = long_name.encode("utf-16-le") + b"\0\0"
+        extension = (struct.pack("<HI", 9, 0xBEEF0004) + bytes(8) + struct.pack("<H", 0x2E)
+                     + bytes(18) + struct.pack("<H", 0) + bytes(8) + name + struct.pack("<H", 14))
+        item += struct.pack("<H", 2 + len(extension)) + extension
+    return item
+
+
+TERMINAL_BLOCK = bytes(4)
+
+
+def fixtures():
+    local = (header(HAS_LINK_INFO | HAS_WORKING_DIR | HAS_ARGUMENTS | HAS_ICON_LOCATION | IS_UNICODE, 3)
+             + link_info(r"C:\Program Files\Editor\editor.exe")
+             + string(r"C:\Program Files\Editor") + string("--new-window")
+             + string(r"C:\Windows\System32\shell32.dll") + TERMINAL_BLOCK)
+    yield "local_linkinfo.lnk", local
+    yield "relative.lnk", (header(HAS_RELATIVE_PATH | HAS_WORKING_DIR | IS_UNICODE)
+                           + string(r"..\Tools\tool.exe") + string(r"C:\Tools") + TERMINAL_BLOCK)
+    yield "environment.lnk", (header(HAS_EXP_STRING | IS_UNICODE)
+                              + environment_block(r"%ProgramFiles%\Env App\envapp.exe") + TERMINAL_BLOCK)
+    yield "unicode.lnk", (header(HAS_LINK_INFO | HAS_NAME | IS_UNICODE)
+                          + link_info(r"C:\Kullanıcılar\ayşe\Masaüstü\Uygulama.exe", unicode=True)
+                          + string("Açıklama ✓") + TERMINAL_BLOCK)
+    yield "id_list.lnk", (header(HAS_LINK_TARGET_ID_LIST | IS_UNICODE)
+                          + id_list(root_item(), volume_item("C:\\"),
+                                    file_entry_item("PROGRA~1", "Program Files", directory=True),
+                                    file_entry_item("LONGNA~1", "Long Name App", directory=True),
+                                    file_entry_item("APP.EXE"))
+                          + TERMINAL_BLOCK)
+    yield "truncated.lnk", local[:len(local) // 2]
+    yield "corrupt.lnk", local[:4] + bytes(16) + local[20:]
+
+
+if __name__ == "__main__":
+    for name, data in fixtures():
+        with open(os.path.join(HERE, name), "wb") as f:
+            f.write(data)
+        print(name, len(data), "bytes")
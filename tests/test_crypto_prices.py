@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from aoi_net import CryptoPrices, FetchError, ResponseCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CoinGecko:
+    """Stub of the simple/price endpoint recording each batch asked for"""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.batches = []
+        self.error = None
+        self.done = threading.Event()
+
+    def __call__(self, ids):
+        self.batches.append(sorted(ids))
+        try:
+            if self.error is not None:
+                raise self.error
+            return {coin: {"usd": self.prices[coin]} for coin in ids if coin in self.prices}
+        finally:
+            self.done.set()
+
+
+def make_prices(clock, api, path=None):
+    cache = ResponseCache(path, negative_ttl=30, clock=clock)
+    return CryptoPrices(api, cache, max_stale=3600)
+
+
+def test_prices_are_batched_and_served_from_the_cache():
+    clock = Clock()
+    api = CoinGecko({"bitcoin": 100.0, "ethereum": 10.0})
+    prices = make_prices(clock, api)
+    assert prices.quote("BTC").value == 100.0
+    assert prices.quote("eth").value == 10.0
+    # A new coin is fetched together with the ones asked about before
+    assert api.batches == [["bitcoin"], ["bitcoin", "ethereum"]]
+
+    assert prices.quote("btc").value == 100.0
+    assert prices.quote("unknowncoin").value is None
+    assert prices.quote("unknowncoin").value is None
+    assert len(api.batches) == 3
+
+
+def test_expired_prices_are_served_stale_while_refreshing():
+    clock = Clock()
+    api = CoinGecko({"bitcoin": 100.0})
+    prices = make_prices(clock, api)
+    prices.quote("btc")
+    clock.now += 31
+    api.prices["bitcoin"] = 200.0
+    api.done.clear()
+
+    quote = prices.quote("btc")
+    assert quote.value == 100.0 and quote.stale
+    assert api.done.wait(5)
+    prices.cache.executor.shutdown(wait=True)
+    quote = prices.quote("btc")
+    assert quote.value == 200.0 and not quote.stale
+
+
+def test_prices_persist_across_restarts(tmp_path):
+    path = str(tmp_path / "responses.json")
+    clock = Clock()
+    make_prices(clock, CoinGecko({"bitcoin": 100.0, "ethereum": 10.0}), path).quote("eth")
+
+    api = CoinGecko({})
+    assert make_prices(clock, api, path).quote("eth").value == 10.0
+    assert api.batches == []
+
+
+def test_failures_raise_and_are_not_retried_at_once():
+    clock = Clock()
+    api = CoinGecko({})
+    api.error = OSError("offline")
+    prices = make_prices(clock, api)
+    with pytest.raises(FetchError):
+        prices.quote("btc")
+    with pytest.raises(FetchError):
+        prices.quote("btc")
+    assert len(api.batches) == 1
+
+
+def test_fetches_run_outside_the_lock():
+    clock = Clock()
+    prices = None
+
+    def api(ids):
+        assert not prices.lock.locked()
+        return {coin: {"usd": 1.0} for coin in ids}
+
+    prices = make_prices(clock, api)
+    assert prices.quote("btc").value == 1.0
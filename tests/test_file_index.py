@@ -0,0 +1,53 @@
+import os
+
+from aoi_index import FileIndex, SearchRoot
+
+
+def make_tree(base, names):
+    for name in names:
+        path = base / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+
+
+def test_rescan_crawls_new_folders_within_the_root_budget(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    index = FileIndex(str(tmp_path / "index.db"))
+    index.rebuild([SearchRoot(str(root), max_depth=3, max_entries=2)])
+
+    make_tree(root, ["new/a.exe", "new/b.exe", "new/deeper/c.exe"])
+    added, removed = index.rescan_directory(str(root))
+
+    # Reading "new" spends the budget, so "deeper" is left for later
+    assert added == [str(root / "new")]
+    assert removed == []
+    assert str(root / "new" / "deeper") not in index.directories()
+
+
+def test_rescan_crawls_new_folders_fully_with_room_in_the_budget(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    index = FileIndex(str(tmp_path / "index.db"))
+    index.rebuild([SearchRoot(str(root), max_depth=3)])
+
+    make_tree(root, ["new/a.exe", "new/b.exe", "new/deeper/c.exe"])
+    added, _ = index.rescan_directory(str(root))
+
+    assert added == [str(root / "new"), str(root / "new" / "deeper")]
+
+
+def test_prune_roots_changes_the_version_only_when_it_removes_rows(tmp_path):
+    kept, dropped = tmp_path / "kept", tmp_path / "dropped"
+    make_tree(tmp_path, ["kept/a.exe", "dropped/b.exe"])
+    index = FileIndex(str(tmp_path / "index.db"))
+    index.rebuild([str(kept), str(dropped)])
+    version = index.version
+
+    index.prune_roots([str(kept), str(dropped)])
+    assert index.version == version
+
+    index.prune_roots([str(kept)])
+    assert index.version == version + 1
+    assert index.directories() == [str(kept)]
+    assert os.path.isdir(dropped)
@@ -0,0 +1,60 @@
+import os
+
+from aoi_icons import IconStore
+
+
+def make_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"app{i}.exe"
+        path.write_bytes(b"x" * (i + 1))
+        paths.append(str(path))
+    return paths
+
+
+def test_icon_is_served_until_the_file_changes(tmp_path):
+    store = IconStore(str(tmp_path / "icons.db"))
+    path = make_files(tmp_path, 1)[0]
+    store.put(path, True, 1.0, b"png")
+    assert store.get(path, True, 1.0) == b"png"
+    assert store.get(path, False, 1.0) is None
+
+    with open(path, "ab") as f:
+        f.write(b"more")
+    assert store.get(path, True, 1.0) is None
+
+
+def test_prune_keeps_recently_used_icons(tmp_path, monkeypatch):
+    monkeypatch.setattr(IconStore, "PRUNE_EVERY", 4)
+    store = IconStore(str(tmp_path / "icons.db"), max_entries=2)
+    paths = make_files(tmp_path, 4)
+    clock = iter(range(100))
+    monkeypatch.setattr("aoi_icons.time.time", lambda: next(clock))
+
+    for path in paths[:3]:
+        store.put(path, True, 1.0, b"png")
+    # The oldest stored icon is the most recently used one
+    assert store.get(paths[0], True, 1.0) == b"png"
+    store.put(paths[3], True, 1.0, b"png")  # fourth put prunes to two rows
+
+    kept = [path for path in paths if store.get(path, True, 1.0)]
+    assert kept == [paths[0], paths[3]]
+
+
+def test_hits_are_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(IconStore, "USED_BATCH", 3)
+    db = str(tmp_path / "icons.db")
+    store = IconStore(db)
+    path = make_files(tmp_path, 1)[0]
+    store.put(path, True, 1.0, b"png")
+    key = os.path.normcase(os.path.normpath(path))
+
+    def used():
+        return store._conn().execute("SELECT used FROM icons WHERE path = ?", (key,)).fetchone()[0]
+
+    stored = used()
+    monkeypatch.setattr("aoi_icons.time.time", lambda: stored + 60)
+    store.get(path, True, 1.0)
+    assert used() == stored  # noted, not written yet
+    store.flush_used()
+    assert used() == stored + 60
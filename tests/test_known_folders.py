@@ -0,0 +1,70 @@
+from aoi_shell import KnownFolderResolver, _key
+
+HOME = r"C:\Users\ayse"
+FOLDERS = {
+    "Desktop": r"C:\Users\ayse\OneDrive\Desktop",
+    "Documents": r"C:\Users\ayse\Documents",
+    "Downloads": r"C:\Users\ayse\Downloads",
+}
+ALIASES = {"Desktop": ("Masaüstü",), "Downloads": ("İndirilenler",)}
+
+
+def disk(*dirs):
+    """is_dir over a fixed set of real directories"""
+    keys = {_key(d) for d in dirs}
+    return lambda path: _key(path) in keys
+
+
+REAL = disk(r"C:\Users", HOME, r"C:\Users\ayse\OneDrive", *FOLDERS.values())
+
+
+def make_resolver(is_dir=REAL, aliases=ALIASES, users_aliases=("Kullanıcılar",)):
+    return KnownFolderResolver(HOME, FOLDERS, r"C:\Users\ayse\OneDrive", aliases, users_aliases, is_dir)
+
+
+def test_localized_users_root():
+    resolver = make_resolver()
+    assert resolver.canonicalize(r"C:\Kullanıcılar\ayse\Documents\cv.docx") == r"C:\Users\ayse\Documents\cv.docx"
+    assert resolver.canonicalize("C:\\Kullanıcılar") == r"C:\Users"
+
+
+def test_onedrive_redirected_desktop():
+    resolver = make_resolver()
+    assert resolver.canonicalize(r"C:\Users\ayse\Desktop\app.lnk") == r"C:\Users\ayse\OneDrive\Desktop\app.lnk"
+    assert resolver.canonicalize(r"C:\Users\ayse\OneDrive\Desktop\app.lnk") \
+        == r"C:\Users\ayse\OneDrive\Desktop\app.lnk"
+
+
+def test_display_name_aliases():
+    resolver = make_resolver()
+    assert resolver.canonicalize(r"C:\Users\ayse\Masaüstü\a.txt") == r"C:\Users\ayse\OneDrive\Desktop\a.txt"
+    assert resolver.canonicalize(r"C:\Users\ayse\OneDrive\Masaüstü\a.txt") \
+        == r"C:\Users\ayse\OneDrive\Desktop\a.txt"
+    assert resolver.canonicalize(r"C:\Users\ayse\İndirilenler\x.exe") == r"C:\Users\ayse\Downloads\x.exe"
+
+
+def test_uppercase_and_turkish_cased_input():
+    resolver = make_resolver()
+    assert resolver.canonicalize("C:\\KULLANICILAR\\ayse\\İndirilenler\\x.exe") == r"C:\Users\ayse\Downloads\x.exe"
+    assert resolver.canonicalize("C:\\Kullanıcılar\\AYŞE\\INDIRILENLER\\x.exe") == r"C:\Users\ayse\Downloads\x.exe"
+    assert resolver.canonicalize("c:/users/ayse/MASAÜSTÜ/a.txt") == r"C:\Users\ayse\OneDrive\Desktop\a.txt"
+
+
+def test_real_directories_are_never_rewritten():
+    # A local Desktop and a folder really named like an alias stay as they are
+    is_dir = disk(r"C:\Users", HOME, r"C:\Users\ayse\Desktop", r"C:\Users\ayse\İndirilenler",
+                  *FOLDERS.values())
+    resolver = make_resolver(is_dir)
+    assert resolver.canonicalize(r"C:\Users\ayse\Desktop\a.txt") == r"C:\Users\ayse\Desktop\a.txt"
+    assert resolver.canonicalize(r"C:\Users\ayse\İndirilenler\x.exe") == r"C:\Users\ayse\İndirilenler\x.exe"
+
+
+def test_missing_targets_are_not_aliased():
+    resolver = make_resolver(disk(r"C:\Users", HOME))
+    assert resolver.canonicalize(r"C:\Users\ayse\Masaüstü\a.txt") == r"C:\Users\ayse\Masaüstü\a.txt"
+
+
+def test_unrelated_paths_are_unchanged():
+    resolver = make_resolver()
+    for path in (r"D:\Games\game.exe", r"C:\Program Files\app.exe", r"C:\Users\other\Desktop\a.txt"):
+        assert resolver.canonicalize(path) == path
@@ -0,0 +1,110 @@
+from aoi_catalog import AppEntry, RegistryCatalog, entries_from_key
+
+from fake_registry import FakeRegistryReader
+
+UNINSTALL = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+APP_PATHS = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"
+LOCATIONS = (
+    ("HKLM", APP_PATHS, "app_paths"),
+    ("HKLM", UNINSTALL, "uninstall"),
+)
+
+
+class CountingReader(FakeRegistryReader):
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    def values(self, hive, path):
+        self.reads.append(path)
+        return super().values(hive, path)
+
+
+def make_catalog():
+    reader = CountingReader()
+    reader.set_key("HKLM", APP_PATHS)
+    reader.set_key("HKLM", UNINSTALL)
+    return reader, RegistryCatalog(reader, LOCATIONS, exists=lambda path: True)
+
+
+def test_uninstall_key_parsing():
+    values = {
+        "DisplayName": "Editor",
+        "DisplayIcon": r'"C:\Program Files\Editor\editor.exe",0',
+        "InstallLocation": r"C:\Program Files\Editor",
+    }
+    assert entries_from_key("uninstall", "{GUID}", values, "src") == [
+        AppEntry("Editor", r"C:\Program Files\Editor\editor.exe", r"C:\Program Files\Editor", "src")]
+    assert entries_from_key("uninstall", "x", {"DisplayName": "Editor",
+                                               "DisplayIcon": r"C:\Editor\editor.exe,3"}, "src")[0].path \
+        == r"C:\Editor\editor.exe"
+
+
+def test_uninstall_keys_without_a_launchable_icon_are_skipped():
+    assert entries_from_key("uninstall", "x", {"DisplayIcon": r"C:\a.exe"}, "src") == []
+    assert entries_from_key("uninstall", "x", {"DisplayName": "Runtime",
+                                               "DisplayIcon": r"C:\runtime.ico"}, "src") == []
+    assert entries_from_key("uninstall", "x", {"DisplayName": "Runtime", "DisplayIcon": 5}, "src") == []
+
+
+def test_app_paths_key_parsing():
+    entries = entries_from_key("app_paths", "tool.exe", {"": r'"C:\Tools\tool.exe"', "Path": r"C:\Tools"}, "src")
+    assert entries == [AppEntry("tool.exe", r"C:\Tools\tool.exe", r"C:\Tools", "src")]
+    assert entries_from_key("app_paths", "empty.exe", {}, "src") == []
+
+
+def test_refresh_reads_only_changed_locations():
+    reader, catalog = make_catalog()
+    reader.set_key("HKLM", UNINSTALL + r"\Editor", {"DisplayName": "Editor",
+                                                    "DisplayIcon": r"C:\Editor\editor.exe"})
+    reader.set_key("HKLM", APP_PATHS + r"\tool.exe", {"": r"C:\Tools\tool.exe"})
+
+    assert catalog.refresh() is True
+    assert catalog.search("edit") == [("Editor", r"C:\Editor\editor.exe")]
+    assert catalog.search("tool") == [("tool.exe", r"C:\Tools\tool.exe")]
+
+    reader.reads.clear()
+    assert catalog.refresh() is False
+    assert reader.reads == []
+
+
+def test_refresh_picks_up_added_and_removed_subkeys():
+    reader, catalog = make_catalog()
+    reader.set_key("HKLM", UNINSTALL + r"\Editor", {"DisplayName": "Editor",
+                                                    "DisplayIcon": r"C:\Editor\editor.exe"})
+    catalog.refresh()
+
+    reader.reads.clear()
+    reader.set_key("HKLM", UNINSTALL + r"\Viewer", {"DisplayName": "Viewer",
+                                                    "DisplayIcon": r"C:\Viewer\viewer.exe"})
+    assert catalog.refresh() is True
+    # Only the new subkey is read; the unchanged one comes from the cache
+    assert reader.reads == [UNINSTALL + r"\Viewer"]
+    assert [name for name, _ in catalog.search("e")] == ["Editor", "Viewer"]
+
+    reader.delete_key("HKLM", UNINSTALL + r"\Editor")
+    assert catalog.refresh() is True
+    assert catalog.search("editor") == []
+
+
+def test_missing_location_empties_its_entries():
+    reader, catalog = make_catalog()
+    reader.set_key("HKLM", APP_PATHS + r"\tool.exe", {"": r"C:\Tools\tool.exe"})
+    catalog.refresh()
+
+    reader.delete_key("HKLM", APP_PATHS)
+    assert catalog.refresh() is True
+    assert catalog.search("tool") == []
+
+
+def test_entries_are_deduplicated_and_must_exist():
+    reader = FakeRegistryReader()
+    reader.set_key("HKLM", APP_PATHS)
+    reader.set_key("HKLM", UNINSTALL)
+    reader.set_key("HKLM", APP_PATHS + r"\tool.exe", {"": r"C:\Tools\tool.exe"})
+    reader.set_key("HKLM", APP_PATHS + r"\TOOL.EXE.bak", {"": r"C:\Tools\gone.exe"})
+    reader.set_key("HKLM", UNINSTALL + r"\a", {"DisplayName": "Tool", "DisplayIcon": r"C:\Tools\tool.exe"})
+    reader.set_key("HKLM", UNINSTALL + r"\b", {"DisplayName": "tool", "DisplayIcon": r"C:\Tools\tool.exe"})
+    catalog = RegistryCatalog(reader, LOCATIONS, exists=lambda path: not path.endswith("gone.exe"))
+    catalog.refresh()
+    assert sorted(e.name for e in catalog.entries) == ["Tool", "tool.exe"]
@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+
+from aoi_net import FetchError, ResponseCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Fetcher:
+    """Stub fetch returning the next value, or raising once told to fail"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+        self.error = None
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        try:
+            if self.error is not None:
+                raise self.error
+            return self.values.pop(0)
+        finally:
+            self.done.set()
+
+
+def make_cache(clock, path=None, **kwargs):
+    return ResponseCache(path, ttls={'weather': 60}, negative_ttl=30, max_stale=600, clock=clock, **kwargs)
+
+
+def wait_for_refresh(cache, fetch):
+    assert fetch.done.wait(5)
+    cache.executor.shutdown(wait=True)
+
+
+def test_fresh_values_are_served_without_fetching():
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher({"temp": 1})
+    assert cache.get('weather', 'Ankara', fetch) == {"temp": 1}
+    clock.now += 59
+    cached = cache.lookup('weather', ' ankara ', fetch)
+    assert cached.value == {"temp": 1} and not cached.stale
+    assert fetch.calls == 1
+
+
+def test_expired_values_are_served_stale_while_refreshing():
+    clock = Clock()
+    cache = make_cache(clock)
+    cache.get('weather', 'Ankara', Fetcher({"temp": 1}))
+    clock.now += 61
+
+    refresh = Fetcher({"temp": 2})
+    cached = cache.lookup('weather', 'Ankara', refresh)
+    assert cached.value == {"temp": 1}
+    assert cached.stale and cached.fetched == 1000.0
+    wait_for_refresh(cache, refresh)
+
+    cached = cache.lookup('weather', 'Ankara', Fetcher())
+    assert cached.value == {"temp": 2} and not cached.stale
+
+
+def test_values_older_than_max_stale_are_fetched_before_answering():
+    clock = Clock()
+    cache = make_cache(clock)
+    cache.get('weather', 'Ankara', Fetcher({"temp": 1}))
+    clock.now += 601
+    assert cache.get('weather', 'Ankara', Fetcher(), wait=False) is None
+    fetch = Fetcher({"temp": 3})
+    assert cache.get('weather', 'Ankara', fetch) == {"temp": 3}
+    assert fetch.calls == 1
+
+
+def test_failures_are_not_retried_within_the_negative_ttl():
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher({"temp": 1})
+    fetch.error = OSError("offline")
+    with pytest.raises(FetchError):
+        cache.get('weather', 'Ankara', fetch)
+    clock.now += 29
+    with pytest.raises(FetchError):
+        cache.get('weather', 'Ankara', fetch)
+    assert fetch.calls == 1
+
+    clock.now += 2
+    fetch.error = None
+    assert cache.get('weather', 'Ankara', fetch) == {"temp": 1}
+
+
+def test_a_failed_refresh_keeps_serving_the_old_value():
+    clock = Clock()
+    cache = make_cache(clock)
+    cache.get('weather', 'Ankara', Fetcher({"temp": 1}))
+    clock.now += 61
+    failing = Fetcher()
+    failing.error = OSError("offline")
+    assert cache.lookup('weather', 'Ankara', failing).value == {"temp": 1}
+    wait_for_refresh(cache, failing)
+    cached = cache.lookup('weather', 'Ankara', failing)
+    assert cached.value == {"temp": 1} and cached.stale
+    assert failing.calls == 1  # the failure blocks another background retry
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "responses.json")
+    clock = Clock()
+    make_cache(clock, path).get('weather', 'Ankara', Fetcher({"temp": 1}))
+
+    fetch = Fetcher()
+    cached = make_cache(clock, path).lookup('weather', 'Ankara', fetch)
+    assert cached.value == {"temp": 1} and not cached.stale
+    assert fetch.calls == 0
+
+
+def test_a_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "responses.json"
+    path.write_text("{not json", encoding="utf-8")
+    cache = make_cache(Clock(), str(path))
+    assert cache.get('weather', 'Ankara', Fetcher({"temp": 1})) == {"temp": 1}
@@ -0,0 +1,111 @@
+import os
+import shutil
+
+import pytest
+
+from aoi_shell import LinkCache, LinkFormatError, ShellLink, parse_lnk, parse_lnk_bytes, resolve_shortcut
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "lnk")
+
+
+def fixture(name: str) -> str:
+    return os.path.join(FIXTURES, name)
+
+
+def read(name: str) -> bytes:
+    with open(fixture(name), "rb") as f:
+        return f.read()
+
+
+def test_link_info_local_path():
+    link = parse_lnk(fixture("local_linkinfo.lnk"))
+    assert link.target == r"C:\Program Files\Editor\editor.exe"
+    assert link.arguments == "--new-window"
+    assert link.working_dir == r"C:\Program Files\Editor"
+    assert link.icon_location == r"C:\Windows\System32\shell32.dll"
+    assert link.icon_index == 3
+
+
+def test_relative_path_resolves_against_the_link_folder():
+    link = parse_lnk_bytes(read("relative.lnk"), r"C:\Links\relative.lnk")
+    assert link.target == r"C:\Tools\tool.exe"
+    assert link.working_dir == r"C:\Tools"
+
+
+def test_relative_path_without_link_path_has_no_target():
+    assert parse_lnk_bytes(read("relative.lnk")).target == ""
+
+
+def test_environment_block_target_is_expanded(monkeypatch):
+    monkeypatch.setenv("ProgramFiles", r"C:\Program Files")
+    link = parse_lnk(fixture("environment.lnk"))
+    assert link.target == r"C:\Program Files\Env App\envapp.exe"
+
+
+def test_unicode_strings():
+    link = parse_lnk(fixture("unicode.lnk"))
+    assert link.target == r"C:\Kullanıcılar\ayşe\Masaüstü\Uygulama.exe"
+    assert link.description == "Açıklama ✓"
+
+
+def test_id_list_only_target():
+    # Long names from the 0xBEEF0004 blocks; the last item has only its short name
+    link = parse_lnk(fixture("id_list.lnk"))
+    assert link.target == r"C:\Program Files\Long Name App\APP.EXE"
+
+
+@pytest.mark.parametrize("name", ["truncated.lnk", "corrupt.lnk"])
+def test_damaged_files_are_rejected(name):
+    with pytest.raises(LinkFormatError):
+        parse_lnk(fixture(name))
+
+
+@pytest.mark.parametrize("name", ["truncated.lnk", "corrupt.lnk", "missing.lnk"])
+def test_unreadable_links_fall_back_to_the_shell(name):
+    from_shell = ShellLink(r"C:\App\app.exe", "", "", "", 0, "")
+    asked = []
+
+    def shell_resolve(path):
+        asked.append(path)
+        return from_shell
+
+    path = fixture(name)
+    assert resolve_shortcut(path, shell_resolve, LinkCache()) is from_shell
+    assert asked == [path]
+
+
+def test_parsed_links_do_not_ask_the_shell():
+    def shell_resolve(path):
+        raise AssertionError("shell asked for a parseable link")
+
+    link = resolve_shortcut(fixture("local_linkinfo.lnk"), shell_resolve, LinkCache())
+    assert link.target == r"C:\Program Files\Editor\editor.exe"
+
+
+def test_link_cache_rereads_a_changed_file(tmp_path):
+    path = str(tmp_path / "app.lnk")
+    shutil.copyfile(fixture("local_linkinfo.lnk"), path)
+    cache = LinkCache()
+
+    first = cache.resolve(path)
+    assert cache.resolve(path) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    shutil.copyfile(fixture("unicode.lnk"), path)
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+    assert cache.resolve(path).target == r"C:\Kullanıcılar\ayşe\Masaüstü\Uygulama.exe"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_link_cache_stamp_includes_mtime(tmp_path):
+    path = str(tmp_path / "app.lnk")
+    shutil.copyfile(fixture("local_linkinfo.lnk"), path)
+    cache = LinkCache()
+    cache.resolve(path)
+
+    # Same size, new mtime: still re-read
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    cache.resolve(path)
+    assert cache.misses == 2